@@ -37,6 +37,29 @@ CRONJOBS = [
     ('* * * * *', 'reservations.cron.check_reservation_status'),
 ]
 
+# 장례 시작 전 담당 직원 알림 시점(초). 0이면 사전 알림을 보내지 않습니다.
+RESERVATION_REMINDER_LEAD = int(os.getenv('RESERVATION_REMINDER_LEAD', 60 * 60))
+# 예약 시간대(30분)별 최대 예약 수. 이미 만들어진 시간대는 ReservationSlot.capacity를 직접 수정합니다.
+RESERVATION_SLOT_CAPACITY = int(os.getenv('RESERVATION_SLOT_CAPACITY', 3))
+# 예약 입력 중 추모실/시간 선점 유지 시간(분, 최대 30)
+RESERVATION_HOLD_MINUTES = int(os.getenv('RESERVATION_HOLD_MINUTES', 10))
+# 추모실을 지정하지 않은 예약 가능 시간 조회의 운영 시간 (마지막 값은 마지막 예약 시작 시각)
+RESERVATION_OPERATING_HOURS = os.getenv('RESERVATION_OPERATING_HOURS', '09:00-22:30')
+# 앱 로드 시(ReservationsConfig.ready) 스케줄러 자동 시작 여부. (기본 false)
+# 켜더라도 runserver 외의 관리 명령(migrate, shell, run_scheduler 등)에서는 시작하지 않습니다.
+# 운영에서는 false로 두고 `python manage.py run_scheduler` 프로세스를 따로 실행합니다.
+SCHEDULER_AUTOSTART = os.getenv('SCHEDULER_AUTOSTART', 'false').lower() in ('1', 'true', 'yes')
+# 예약 상태 전환 스케줄러가 다음 전환 시각을 기다리는 최대 시간(초)
+RESERVATION_SCHEDULER_MAX_IDLE = int(os.getenv('RESERVATION_SCHEDULER_MAX_IDLE', 30 * 60))
+# 스케줄러 리더의 작업 저장소: 'django'(DB에 작업/실행 이력 저장) 또는 'memory'(DB 폴링/이력 없음)
+SCHEDULER_JOBSTORE = os.getenv('SCHEDULER_JOBSTORE', 'django')
+# 스케줄러 작업 실행 이력(DjangoJobExecution) 보관 일수. 지난 이력은 일별 집계로 합쳐집니다.
+SCHEDULER_JOB_HISTORY_DAYS = int(os.getenv('SCHEDULER_JOB_HISTORY_DAYS', 7))
+# 스케줄러 작업이 예정 시각보다 이 시간(초) 이상 늦게 시작하면 경고 로그를 남깁니다.
+SCHEDULER_LAG_WARNING = int(os.getenv('SCHEDULER_LAG_WARNING', 60))
+# 스케줄러 리더 임대 만료 시간(초). 리더가 멈추면 이 시간 안에 다른 프로세스가 넘겨받습니다.
+SCHEDULER_LEASE_TTL = int(os.getenv('SCHEDULER_LEASE_TTL', 30))
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -73,6 +96,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'funeral.middleware.FuneralLoggingMiddleware',  # 장례 서비스 로깅 미들웨어 추가
+    'reservations.middleware.DecryptCacheMiddleware',  # 요청 단위 복호화 캐시
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -103,6 +127,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # 스케줄러 스레드와 작업 스레드가 동시에 쓰기 트랜잭션을 열 때 'database is locked'로
+            # 바로 실패하지 않도록 트랜잭션 시작 시 쓰기 잠금을 잡고, 잠금이 풀릴 때까지 기다립니다.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -301,3 +331,9 @@ ENCRYPTION_KEY = os.getenv('ENCRYPTION_KEY').encode()
 if not ENCRYPTION_KEY:
     raise ValueError('ENCRYPTION_KEY must be set in .env file')
 
+# 암호화 필드 암호 백엔드 ('aes-gcm' 또는 'fernet'). 기존 값은 백엔드와 관계없이 읽을 수 있습니다.
+ENCRYPTED_FIELD_CIPHER = os.getenv('ENCRYPTED_FIELD_CIPHER', 'aes-gcm')
+
+# 요청 단위 복호화 캐시 최대 항목 수
+DECRYPT_CACHE_SIZE = int(os.getenv('DECRYPT_CACHE_SIZE', 1024))
+
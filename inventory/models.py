@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from utils.field_tracker import FieldTrackerMixin
 
 
 class Category(models.Model):
@@ -37,7 +38,7 @@ class Supplier(models.Model):
         return self.name
 
 
-class InventoryItem(models.Model):
+class InventoryItem(FieldTrackerMixin, models.Model):
     category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='items')
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT, related_name='items')
     name = models.CharField(_('품목명'), max_length=100)
@@ -94,7 +95,7 @@ class StockMovement(models.Model):
         return f"{self.get_movement_type_display()} - {self.item.name} ({self.quantity})"
 
 
-class PurchaseOrder(models.Model):
+class PurchaseOrder(FieldTrackerMixin, models.Model):
     ORDER_STATUS = [
         ('draft', '임시저장'),
         ('pending', '승인대기'),
@@ -126,6 +126,21 @@ class InventoryItemTests(APITestCase):
         self.item.refresh_from_db()
         self.assertEqual(self.item.current_stock, 150)  # 100 + 50
 
+    def test_save_updates_changed_fields_only(self):
+        """불러온 품목을 저장하면 변경된 필드만 UPDATE 하는지 테스트"""
+        item = InventoryItem.objects.get(id=self.item.id)
+        self.assertEqual(item.get_changed_fields(), [])
+        item.current_stock = 90
+        self.assertTrue(item.has_changed('current_stock'))
+        self.assertEqual(item.get_dirty_fields(), ['current_stock', 'updated_at'])
+
+        # 다른 곳에서 바뀐 필드는 덮어쓰지 않습니다.
+        InventoryItem.objects.filter(id=item.id).update(name='다른 이름')
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual((item.current_stock, item.name), (90, '다른 이름'))
+        self.assertEqual(item.get_changed_fields(), [])
+
 
 class PurchaseOrderTests(APITestCase):
     def setUp(self):
@@ -5,3 +5,6 @@ class MemorialRoomsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "memorial_rooms"
     verbose_name = "추모실 관리"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memorial_rooms", "0003_memorialroom_current_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="memorialroom",
+            name="closed_weekdays",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="0(월)~6(일) 목록. 예: [0]",
+                verbose_name="휴무 요일",
+            ),
+        ),
+        migrations.AddField(
+            model_name="memorialroom",
+            name="slot_minutes",
+            field=models.PositiveSmallIntegerField(
+                choices=[
+                    (30, "30분"),
+                    (60, "1시간"),
+                    (90, "1시간 30분"),
+                    (120, "2시간"),
+                ],
+                default=30,
+                verbose_name="예약 단위(분)",
+            ),
+        ),
+    ]
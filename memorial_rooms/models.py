@@ -9,9 +9,22 @@ class MemorialRoom(models.Model):
         ('reserved', '예약중'),
     ]
 
+    SLOT_MINUTES_CHOICES = [
+        (30, '30분'),
+        (60, '1시간'),
+        (90, '1시간 30분'),
+        (120, '2시간'),
+    ]
+
     name = models.CharField(_('추모실명'), max_length=100)
     capacity = models.IntegerField(_('수용인원'), blank=True, null=True)
     operating_hours = models.CharField(_('이용시간'), max_length=100, help_text='예: 09:00-18:00')
+    closed_weekdays = models.JSONField(
+        _('휴무 요일'), default=list, blank=True, help_text='0(월)~6(일) 목록. 예: [0]'
+    )
+    slot_minutes = models.PositiveSmallIntegerField(
+        _('예약 단위(분)'), choices=SLOT_MINUTES_CHOICES, default=30
+    )
     notes = models.TextField(_('특이사항'), blank=True)
     is_active = models.BooleanField(_('사용가능여부'), default=True)
     current_status = models.CharField(
@@ -30,3 +43,8 @@ class MemorialRoom(models.Model):
 
     def __str__(self):
         return f"{self.name}"
+
+    def get_schedule(self):
+        """해석된 운영 일정 (memorial_rooms.schedules 참고)"""
+        from .schedules import get_room_schedule
+        return get_room_schedule(self)
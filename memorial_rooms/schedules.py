@@ -0,0 +1,125 @@
+"""
+추모실 운영 일정
+
+MemorialRoom의 이용시간 문자열("HH:MM-HH:MM"), 휴무 요일, 예약 단위를 한 번 해석해
+OperatingSchedule로 만들어 두고 추모실별로 캐시합니다. 예약 가능 시간/달력 조회는 요청마다
+문자열을 다시 해석하지 않고 미리 계산된 시간대 목록을 사용합니다.
+
+캐시는 추모실 저장/삭제 시 시그널로 비우고(memorial_rooms.signals), 다른 프로세스에서 수정된 경우에 대비해
+updated_at이 달라지면 다시 만듭니다.
+
+추모실을 지정하지 않은 조회는 settings.RESERVATION_OPERATING_HOURS(기본 09:00-22:30)를 사용합니다.
+"""
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPERATING_HOURS = '09:00-22:30'
+DEFAULT_SLOT_MINUTES = 30
+
+
+def parse_time(value: str) -> time:
+    hours, minutes = value.strip().split(':')
+    return time(int(hours), int(minutes))
+
+
+def parse_operating_hours(value: str) -> Tuple[time, time]:
+    """'HH:MM-HH:MM'을 (시작, 마지막 예약 시작 시각)으로 해석합니다. 형식이 잘못되면 ValueError"""
+    start, end = value.split('-')
+    opens, closes = parse_time(start), parse_time(end)
+    if closes < opens:
+        raise ValueError(f"종료 시간이 시작 시간보다 빠릅니다: {value}")
+    return opens, closes
+
+
+class OperatingSchedule:
+    """
+    해석된 운영 일정
+    예약 시간대는 opens부터 slot_minutes 간격으로 closes까지(포함) 시작합니다.
+    """
+
+    def __init__(self, opens: time, closes: time, closed_weekdays: Iterable[int] = (),
+                 slot_minutes: int = DEFAULT_SLOT_MINUTES):
+        self.opens = opens
+        self.closes = closes
+        self.closed_weekdays = frozenset(closed_weekdays)
+        self.slot_minutes = slot_minutes
+
+        first = opens.hour * 60 + opens.minute
+        last = closes.hour * 60 + closes.minute
+        # 자정부터의 분 단위 시작 시각
+        self.slot_offsets = tuple(range(first, last + 1, slot_minutes))
+        self.slot_times = tuple(time(minute // 60, minute % 60) for minute in self.slot_offsets)
+        self.labels = tuple(f'{value:%H:%M}' for value in self.slot_times)
+
+    @classmethod
+    def parse(cls, operating_hours: str, closed_weekdays: Iterable[int] = (),
+              slot_minutes: int = DEFAULT_SLOT_MINUTES) -> 'OperatingSchedule':
+        opens, closes = parse_operating_hours(operating_hours)
+        return cls(opens, closes, closed_weekdays, slot_minutes or DEFAULT_SLOT_MINUTES)
+
+    def is_open(self, day: date) -> bool:
+        return day.weekday() not in self.closed_weekdays
+
+    def slots(self, day: date, tz) -> list:
+        """day의 예약 시간대 시작 시각 목록 (휴무일이면 빈 목록)"""
+        if not self.is_open(day):
+            return []
+        midnight = tz.localize(datetime.combine(day, time.min))
+        return [midnight + timedelta(minutes=minute) for minute in self.slot_offsets]
+
+    def __repr__(self):
+        return (
+            f"OperatingSchedule({self.opens:%H:%M}-{self.closes:%H:%M}, "
+            f"closed={sorted(self.closed_weekdays)}, slot={self.slot_minutes}m)"
+        )
+
+
+_default_schedule = None
+_room_schedules = {}
+_lock = threading.Lock()
+
+
+def get_default_schedule() -> OperatingSchedule:
+    global _default_schedule
+    if _default_schedule is None:
+        _default_schedule = OperatingSchedule.parse(
+            getattr(settings, 'RESERVATION_OPERATING_HOURS', DEFAULT_OPERATING_HOURS)
+        )
+    return _default_schedule
+
+
+def get_room_schedule(room) -> OperatingSchedule:
+    """추모실의 운영 일정 (캐시)"""
+    with _lock:
+        cached = _room_schedules.get(room.id)
+    if cached is not None and cached[0] == room.updated_at:
+        return cached[1]
+
+    try:
+        schedule = OperatingSchedule.parse(room.operating_hours, room.closed_weekdays or (), room.slot_minutes)
+    except (ValueError, TypeError, AttributeError):
+        # 검증이 추가되기 전에 저장된 잘못된 값은 기본 운영 시간으로 대신합니다.
+        logger.warning(f"Invalid operating hours for memorial room {room.id}: {room.operating_hours!r}")
+        default = get_default_schedule()
+        schedule = OperatingSchedule(default.opens, default.closes, room.closed_weekdays or (), default.slot_minutes)
+
+    with _lock:
+        _room_schedules[room.id] = (room.updated_at, schedule)
+    return schedule
+
+
+def invalidate_room_schedule(room_id=None) -> None:
+    """추모실 운영 일정 캐시를 비웁니다. (room_id가 없으면 전체)"""
+    global _default_schedule
+    with _lock:
+        if room_id is None:
+            _room_schedules.clear()
+            _default_schedule = None
+        else:
+            _room_schedules.pop(room_id, None)
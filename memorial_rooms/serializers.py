@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import MemorialRoom
+from .schedules import parse_operating_hours
 
 
 class OperatingHoursSerializer(serializers.Serializer):
@@ -25,7 +26,7 @@ class MemorialRoomSerializer(serializers.ModelSerializer):
         model = MemorialRoom
         fields = [
             'id', 'name', 'capacity', 'notes',
-            'operating_hours', 'is_active', 'current_status',
+            'operating_hours', 'closed_weekdays', 'slot_minutes', 'is_active', 'current_status',
             'current_status_display', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'current_status']
@@ -33,6 +34,8 @@ class MemorialRoomSerializer(serializers.ModelSerializer):
             'capacity': {'required': False},
             'notes': {'required': False},
             'is_active': {'required': False},
+            'closed_weekdays': {'required': False},
+            'slot_minutes': {'required': False},
             'operating_hours': {
                 'required': True,
                 'help_text': '예: 09:00-18:00'
@@ -41,18 +44,20 @@ class MemorialRoomSerializer(serializers.ModelSerializer):
 
     def validate_operating_hours(self, value):
         try:
-            start_time, end_time = value.split('-')
-            # HH:MM 형식 검증
-            for time_str in [start_time, end_time]:
-                hours, minutes = time_str.split(':')
-                if not (0 <= int(hours) <= 23 and 0 <= int(minutes) <= 59):
-                    raise ValueError
+            parse_operating_hours(value)
         except (ValueError, IndexError):
             raise serializers.ValidationError(
                 "운영 시간은 'HH:MM-HH:MM' 형식이어야 합니다. (예: 09:00-18:00)"
             )
         return value
 
+    def validate_closed_weekdays(self, value):
+        if not isinstance(value, list) or not all(
+            isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in value
+        ):
+            raise serializers.ValidationError("휴무 요일은 0(월)~6(일) 숫자 목록이어야 합니다. (예: [0, 6])")
+        return sorted(set(value))
+
     def create(self, validated_data):
         operating_hours = validated_data.pop('operating_hours')
         memorial_room = MemorialRoom.objects.create(
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MemorialRoom
+from .schedules import invalidate_room_schedule
+
+
+@receiver(post_save, sender=MemorialRoom)
+@receiver(post_delete, sender=MemorialRoom)
+def clear_room_schedule(sender, instance, **kwargs):
+    """추모실이 저장/삭제되면 운영 일정 캐시를 비웁니다."""
+    invalidate_room_schedule(instance.id)
@@ -1,39 +1,49 @@
+import os
+import sys
+
 from django.apps import AppConfig
 from django.conf import settings
 
+# 스케줄러를 자동 시작하는 관리 명령 (migrate, shell, run_scheduler 등 그 밖의 명령은 시작하지 않음)
+AUTOSTART_COMMANDS = ('runserver',)
+MANAGEMENT_SCRIPTS = ('manage.py', 'django-admin', 'django-admin.py', '__main__.py')
+
+
+def get_management_command(argv=None):
+    """manage.py/django-admin으로 실행된 경우 관리 명령 이름을, 아니면(gunicorn 등) None을 반환합니다."""
+    argv = sys.argv if argv is None else argv
+    if not argv or os.path.basename(argv[0]) not in MANAGEMENT_SCRIPTS:
+        return None
+    return argv[1] if len(argv) > 1 else ''
+
+
+def should_autostart_scheduler(argv=None) -> bool:
+    # 운영에서는 웹 프로세스가 스케줄러를 띄우지 않고 run_scheduler 명령으로 따로 실행합니다.
+    if not settings.SCHEDULER_AUTOSTART:
+        return False
+
+    # 관리 명령은 개발 서버만 시작합니다. (run_scheduler가 별도 스케줄러를 하나 더 띄우지 않도록)
+    command = get_management_command(argv)
+    if command is not None and command not in AUTOSTART_COMMANDS:
+        return False
+
+    if settings.DEBUG:
+        # 개발 서버에서 두 번 실행되는 것을 방지
+        if os.environ.get('RUN_MAIN', None) != 'true':
+            return False
+    return True
+
 
 class ReservationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reservations"
-    
+
     def ready(self):
-        if settings.DEBUG:
-            # 개발 서버에서 두 번 실행되는 것을 방지
-            import os
-            if os.environ.get('RUN_MAIN', None) != 'true':
-                return
-                
-        # APScheduler 설정
-        from django_apscheduler.jobstores import DjangoJobStore
-        from apscheduler.schedulers.background import BackgroundScheduler
-        from django.utils import timezone
-        from datetime import datetime
-        
-        scheduler = BackgroundScheduler(timezone=settings.TIME_ZONE)
-        scheduler.add_jobstore(DjangoJobStore(), "default")
-        
-        # 예약 상태 체크 작업 등록
-        from .cron import check_reservation_status
-        scheduler.add_job(
-            check_reservation_status,
-            'interval',
-            minutes=1,
-            name='check_reservation_status',
-            jobstore='default',
-            id='check_reservation_status',
-            replace_existing=True,
-            next_run_time=datetime.now(tz=timezone.get_current_timezone())
-        )
-        
-        scheduler.start()
-    
\ No newline at end of file
+        from . import signals  # noqa: F401
+
+        if not should_autostart_scheduler():
+            return
+
+        # APScheduler 설정 (다음 상태 전환 시각에 맞춰 실행, reservations/scheduler.py 참고)
+        from .scheduler import start_scheduler
+        start_scheduler()
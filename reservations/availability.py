@@ -0,0 +1,286 @@
+"""
+추모실 예약 가능 여부 계산
+
+추모실별로 활성 예약(대기/확정/진행중)의 사용 구간 [예약 시간, 예약 시간 + 기본 진행 시간)을
+시작 시각 순으로 정렬해 두고 bisect로 조회합니다.
+- 겹치는 예약 찾기: O(log n + 겹치는 예약 수)
+- 다음 빈 시간 찾기: 겹치는 구간을 합친 사용 구간에서 O(log n + 건너뛴 구간 수)
+
+필요한 기간의 예약을 범위 쿼리 한 번으로 불러옵니다. (RoomAvailability.load)
+블록 처리된 예약(is_blocked)은 block_end_time까지 사용 중으로 봅니다.
+만료되지 않은 예약 선점(SlotHold)도 예약과 같은 구간을 사용 중으로 봅니다. (reservations.holds 참고)
+
+build_calendar는 여러 날짜 × 추모실 × 30분 시간대의 예약 가능 여부를 예약·선점 범위 쿼리와
+시간대 장부(ReservationSlot) 조회 한 번으로 계산합니다.
+
+예약 생성/수정/일정 변경은 check_room_available로 저장 직전에 확인합니다. 같은 추모실에 동시에
+예약하는 경우를 막기 위해 트랜잭션 안에서 추모실 행을 잠근 뒤(lock_room) 확인합니다.
+"""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Q
+from django.utils import timezone
+from memorial_rooms.models import MemorialRoom
+from memorial_rooms.schedules import get_default_schedule
+
+from .models import Reservation, ReservationSlot, SlotHold
+from .slots import KST, SLOT_MINUTES
+
+ACTIVE_STATUSES = [
+    Reservation.STATUS_PENDING,
+    Reservation.STATUS_CONFIRMED,
+    Reservation.STATUS_IN_PROGRESS,
+]
+
+# 예약 선점은 reservation_id 없이 hold_id로 표시합니다.
+Booking = namedtuple('Booking', ['reservation_id', 'start', 'end', 'hold_id'], defaults=[None])
+
+
+class RoomUnavailable(ValueError):
+    """요청한 시간에 추모실에 겹치는 예약이 있는 경우"""
+
+    def __init__(self, room_id: int, conflicts: List[Booking]):
+        self.room_id = room_id
+        self.conflicts = conflicts
+        reserved = [str(b.reservation_id) for b in conflicts if b.hold_id is None]
+        if reserved:
+            message = f"해당 시간에 추모실에 이미 예약이 있습니다. (예약 {', '.join(reserved)})"
+        else:
+            message = "해당 시간은 다른 직원이 예약을 입력 중입니다. 잠시 후 다시 시도해주세요."
+        super().__init__(message)
+
+
+class RoomSchedule:
+    """추모실 하나의 예약 구간 (시작 시각 순 정렬)"""
+
+    def __init__(self, bookings: Iterable[Booking]):
+        self.bookings = sorted(bookings, key=lambda booking: (booking.start, booking.end))
+        self.starts = [booking.start for booking in self.bookings]
+        # i번째까지의 예약 중 가장 늦은 종료 시각 (기존 데이터에 서로 겹치는 예약이 있어도 동작)
+        self.max_ends = list(accumulate((booking.end for booking in self.bookings), max))
+
+        # 겹치거나 맞닿은 구간을 합친 사용 구간
+        merged = []
+        for booking in self.bookings:
+            if merged and booking.start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], booking.end)
+            else:
+                merged.append([booking.start, booking.end])
+        self.busy_starts = [start for start, _ in merged]
+        self.busy_ends = [end for _, end in merged]
+
+    def conflicts(self, start: datetime, end: datetime, exclude_id: int = None) -> List[Booking]:
+        """[start, end)와 겹치는 예약 목록 (시작 시각 순)"""
+        result = []
+        i = bisect_left(self.starts, end) - 1
+        while i >= 0 and self.max_ends[i] > start:
+            booking = self.bookings[i]
+            if booking.end > start and (exclude_id is None or booking.reservation_id != exclude_id):
+                result.append(booking)
+            i -= 1
+        result.reverse()
+        return result
+
+    def next_free_slot(self, after: datetime, duration: timedelta) -> datetime:
+        """after 이후 duration 동안 비어 있는 가장 이른 시작 시각"""
+        candidate = after
+        i = bisect_right(self.busy_ends, candidate)
+        while i < len(self.busy_starts) and self.busy_starts[i] < candidate + duration:
+            candidate = max(candidate, self.busy_ends[i])
+            i += 1
+        return candidate
+
+
+class RoomAvailability:
+    """여러 추모실의 RoomSchedule 모음"""
+
+    def __init__(self, bookings_by_room: Dict[int, List[Booking]], duration: timedelta = None):
+        self.duration = duration or Reservation.DEFAULT_DURATION
+        self.schedules = {room_id: RoomSchedule(bookings) for room_id, bookings in bookings_by_room.items()}
+
+    @classmethod
+    def load(cls, start: datetime, end: datetime, room_ids: Iterable[int] = None,
+             exclude_id: int = None, exclude_hold=None) -> 'RoomAvailability':
+        """
+        [start, end) 기간과 겹칠 수 있는 활성 예약을 범위 쿼리 한 번으로 불러옵니다.
+        만료되지 않은 예약 선점도 함께 불러옵니다. (exclude_hold: 제외할 선점 토큰)
+        """
+        duration = Reservation.DEFAULT_DURATION
+        if room_ids is not None:
+            room_ids = list(room_ids)
+        queryset = Reservation.objects.filter(
+            Q(scheduled_at__gt=start - duration) | Q(is_blocked=True, block_end_time__gt=start),
+            memorial_room__isnull=False,
+            status__in=ACTIVE_STATUSES,
+            scheduled_at__lt=end,
+        )
+        if room_ids is not None:
+            queryset = queryset.filter(memorial_room_id__in=room_ids)
+        if exclude_id is not None:
+            queryset = queryset.exclude(id=exclude_id)
+
+        bookings_by_room = {room_id: [] for room_id in room_ids or []}
+        rows = queryset.order_by().values_list(
+            'id', 'memorial_room_id', 'scheduled_at', 'is_blocked', 'block_end_time'
+        )
+        for reservation_id, room_id, scheduled_at, is_blocked, block_end_time in rows:
+            booking_end = scheduled_at + duration
+            if is_blocked and block_end_time:
+                booking_end = max(booking_end, block_end_time)
+            bookings_by_room.setdefault(room_id, []).append(Booking(reservation_id, scheduled_at, booking_end))
+
+        holds = SlotHold.objects.filter(
+            scheduled_at__gt=start - duration, scheduled_at__lt=end, expires_at__gt=timezone.now()
+        )
+        if room_ids is not None:
+            holds = holds.filter(memorial_room_id__in=room_ids)
+        if exclude_hold is not None:
+            holds = holds.exclude(token=exclude_hold)
+        for hold_id, room_id, scheduled_at in holds.order_by().values_list('id', 'memorial_room_id', 'scheduled_at'):
+            bookings_by_room.setdefault(room_id, []).append(
+                Booking(None, scheduled_at, scheduled_at + duration, hold_id)
+            )
+        return cls(bookings_by_room, duration)
+
+    def schedule(self, room_id: int) -> RoomSchedule:
+        return self.schedules.get(room_id) or RoomSchedule([])
+
+    def conflicts(self, room_id: int, start: datetime, end: datetime = None,
+                  exclude_id: int = None) -> List[Booking]:
+        return self.schedule(room_id).conflicts(start, end or start + self.duration, exclude_id)
+
+    def is_available(self, room_id: int, start: datetime, end: datetime = None, exclude_id: int = None) -> bool:
+        return not self.conflicts(room_id, start, end, exclude_id)
+
+    def next_free_slot(self, room_id: int, after: datetime, duration: timedelta = None) -> datetime:
+        return self.schedule(room_id).next_free_slot(after, duration or self.duration)
+
+
+def lock_room(room_id: int) -> MemorialRoom:
+    """같은 추모실에 대한 동시 예약을 직렬화하기 위해 추모실 행을 잠급니다. (트랜잭션 안에서 호출)"""
+    return MemorialRoom.objects.select_for_update().get(id=room_id)
+
+
+def check_room_available(room_id: Optional[int], start: Optional[datetime], exclude_id: int = None,
+                         duration: timedelta = None, exclude_hold=None) -> None:
+    """
+    추모실이 start부터 duration 동안 비어 있지 않으면(예약 또는 다른 선점) RoomUnavailable을 발생시킵니다.
+    exclude_hold로 자신의 선점 토큰을 주면 해당 선점은 무시합니다.
+    """
+    if not room_id or not start:
+        return
+    end = start + (duration or Reservation.DEFAULT_DURATION)
+    availability = RoomAvailability.load(
+        start, end, room_ids=[room_id], exclude_id=exclude_id, exclude_hold=exclude_hold
+    )
+    conflicts = availability.conflicts(room_id, start, end)
+    if conflicts:
+        raise RoomUnavailable(room_id, conflicts)
+
+
+def build_calendar(start_date: date, end_date: date, rooms: Iterable[MemorialRoom],
+                   now: datetime = None) -> dict:
+    """
+    start_date부터 end_date까지(포함) 날짜별 시간대 예약 수와 추모실 × 날짜 × 시간대 예약 가능 여부
+
+    시간대는 추모실별 운영 일정(MemorialRoom.get_schedule)을 따르며, 응답의 times는 포함된 추모실
+    시간대의 합집합입니다. 추모실의 운영 시간 밖이거나 휴무일인 칸은 예약 불가입니다.
+
+    전체 기간을 30분 단위 칸으로 나눈 bytearray에 표시합니다.
+    - 정원이 찬 시간대(ReservationSlot)
+    - 추모실별 사용 중인 칸: 예약마다 [예약 시간 - 기본 진행 시간, 종료 시각)에 시작하는 칸을 한 번의 슬라이스 대입으로 표시
+    """
+    now = timezone.localtime(now or timezone.now(), KST)
+    rooms = list(rooms)
+    schedules = {room.id: room.get_schedule() for room in rooms}
+    offsets = sorted(
+        set().union(*(schedule.slot_offsets for schedule in schedules.values()))
+        if rooms else get_default_schedule().slot_offsets
+    )
+    interval = timedelta(minutes=SLOT_MINUTES)
+    per_day = timedelta(days=1) // interval
+    days = (end_date - start_date).days + 1
+    size = days * per_day
+    origin = KST.localize(datetime.combine(start_date, time.min))
+    duration = Reservation.DEFAULT_DURATION
+
+    def index(moment: datetime) -> int:
+        return (moment - origin) // interval
+
+    # 정원이 찬 시간대
+    bookings = [0] * size
+    full = bytearray(size)
+    ledger = ReservationSlot.objects.filter(date__range=(start_date, end_date)).values_list(
+        'date', 'time', 'booked', 'capacity'
+    )
+    for slot_date, slot_time, booked, capacity in ledger:
+        i = (slot_date - start_date).days * per_day + (slot_time.hour * 60 + slot_time.minute) // SLOT_MINUTES
+        bookings[i] = booked
+        full[i] = booked >= capacity
+
+    # 추모실별 사용 중인 칸 (마지막 시간대와 겹치는 다음 날 새벽 예약까지 한 번에 조회)
+    availability = RoomAvailability.load(
+        origin, origin + timedelta(days=days) + duration, room_ids=list(schedules)
+    )
+    busy_by_room = {}
+    for room_id in schedules:
+        busy = bytearray(size)
+        for booking in availability.schedule(room_id).bookings:
+            lo = max(index(booking.start - duration) + 1, 0)
+            hi = min(-((origin - booking.end) // interval), size)
+            if hi > lo:
+                busy[lo:hi] = b'\x01' * (hi - lo)
+        busy_by_room[room_id] = busy
+
+    room_offsets = {room_id: frozenset(schedule.slot_offsets) for room_id, schedule in schedules.items()}
+    day_rows = []
+    room_rows = {room_id: [] for room_id in schedules}
+    for day in range(days):
+        current = start_date + timedelta(days=day)
+        # 현재 시간과 같거나 이전의 시간은 예약 불가
+        if current < now.date():
+            cutoff = 24 * 60
+        elif current == now.date():
+            cutoff = now.hour * 60 + now.minute
+        else:
+            cutoff = -1
+        cells = [day * per_day + offset // SLOT_MINUTES for offset in offsets]
+        is_open = [offset > cutoff and not full[i] for offset, i in zip(offsets, cells)]
+        day_rows.append({
+            'date': current,
+            'current_bookings': [bookings[i] for i in cells],
+            'is_available': is_open,
+        })
+        for room_id, schedule in schedules.items():
+            if not schedule.is_open(current):
+                room_rows[room_id].append([False] * len(offsets))
+                continue
+            busy, allowed = busy_by_room[room_id], room_offsets[room_id]
+            room_rows[room_id].append([
+                flag and offset in allowed and not busy[i]
+                for flag, offset, i in zip(is_open, offsets, cells)
+            ])
+
+    times = [f'{offset // 60:02d}:{offset % 60:02d}' for offset in offsets]
+    return {
+        'start': start_date,
+        'end': end_date,
+        'operating_hours': {'start': times[0], 'end': times[-1]} if times else None,
+        'times': times,
+        'days': day_rows,
+        'rooms': [
+            {
+                'id': room.id,
+                'name': room.name,
+                'operating_hours': room.operating_hours,
+                'closed_weekdays': sorted(schedules[room.id].closed_weekdays),
+                'slot_minutes': schedules[room.id].slot_minutes,
+                'is_available': room_rows[room.id],
+            }
+            for room in rooms
+        ],
+    }
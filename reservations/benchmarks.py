@@ -0,0 +1,123 @@
+"""
+암호화 필드 벤치마크
+
+- benchmark_fields: 필드 종류/저장 방식/평문 크기별 암호화·복호화 처리량
+- benchmark_reservation_pages: 예약 목록 페이지(ReservationListSerializer) 전체 로드 시간과
+  그중 암호화 처리가 차지하는 비중
+
+테스트 데이터는 트랜잭션 안에서 만들고 끝나면 롤백하므로 운영 데이터에 남지 않습니다.
+실행: python manage.py benchmark_encryption
+"""
+import time
+import uuid
+from typing import Iterable, List
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .decrypt_cache import decrypt_cache
+from .fields import generate_data_key, wrap_data_key
+from .models import Customer, Pet, Reservation
+from .serializers import ReservationListSerializer
+
+# (이름, 모델, 필드명, 봉투 암호화 여부)
+FIELD_CASES = [
+    ('EncryptedCharField', Customer, 'name', False),
+    ('EncryptedCharField', Customer, 'name', True),
+    ('EncryptedTextField', Customer, 'address', False),
+    ('EncryptedTextField', Customer, 'address', True),
+    ('EncryptedEmailField', Customer, 'email', True),
+    ('DeterministicEncryptedCharField', Pet, 'species', False),
+]
+
+
+def benchmark_fields(iterations: int = 2000, sizes: Iterable[int] = (16, 64, 256, 1024)) -> List[dict]:
+    """필드별 암호화/복호화 처리량을 측정합니다. (데이터베이스를 사용하지 않음)"""
+    results = []
+    for name, model, field_name, envelope in FIELD_CASES:
+        field = model._meta.get_field(field_name)
+        instance = model(data_key=wrap_data_key(generate_data_key()))
+        data_key = field.data_key_field.get_data_key(instance) if envelope else None
+        for size in sizes:
+            plaintext = '가' * (size // 3) if field_name != 'email' else f"{'a' * max(size - 12, 1)}@example.com"
+
+            started = time.perf_counter()
+            stored = [field.encrypt(plaintext, data_key) for _ in range(iterations)]
+            encrypt_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for value in stored:
+                field.decrypt_uncached(value, instance)
+            decrypt_elapsed = time.perf_counter() - started
+
+            results.append({
+                'field': name,
+                'mode': 'envelope' if envelope else 'master',
+                'size': len(plaintext.encode()),
+                'stored_size': len(stored[0]),
+                'encrypt_per_sec': iterations / encrypt_elapsed,
+                'decrypt_per_sec': iterations / decrypt_elapsed,
+                'encrypt_us': encrypt_elapsed / iterations * 1_000_000,
+                'decrypt_us': decrypt_elapsed / iterations * 1_000_000,
+            })
+    return results
+
+
+def _create_fixture(count: int) -> None:
+    """예약 count건을 만듭니다. (고객 1명당 반려동물 1마리, 예약 2건)"""
+    user = get_user_model().objects.create_user(
+        email=f'benchmark-{uuid.uuid4().hex}@example.com',
+        name='벤치마크',
+        phone='010-0000-0000',
+    )
+    reservations = []
+    for i in range((count + 1) // 2):
+        customer = Customer.objects.create(
+            name=f'고객{i}',
+            phone=f'010-{i // 10000:04d}-{i % 10000:04d}',
+            email=f'customer{i}@example.com',
+            address='서울특별시 강남구 테헤란로 123',
+        )
+        pet = Pet.objects.create(customer=customer, name=f'반려동물{i}', species='개', breed='푸들')
+        reservations.extend(
+            Reservation(customer=customer, pet=pet, created_by=user) for _ in range(2)
+        )
+    Reservation.objects.bulk_create(reservations[:count], batch_size=500)
+
+
+def benchmark_reservation_pages(page_sizes: Iterable[int] = (20, 100, 1000), repeat: int = 3) -> List[dict]:
+    """
+    예약 목록 페이지를 조회/직렬화하는 시간과 암호화 처리 통계를 측정합니다.
+    요청과 같은 조건이 되도록 요청 단위 복호화 캐시를 연 상태에서 측정합니다.
+    """
+    page_sizes = list(page_sizes)
+    results = []
+    with transaction.atomic():
+        _create_fixture(max(page_sizes))
+        queryset = Reservation.objects.select_related(
+            'customer', 'pet', 'package', 'memorial_room',
+            'assigned_staff', 'created_by'
+        ).prefetch_related('additional_options').order_by('-id')
+
+        for size in page_sizes:
+            best = None
+            for _ in range(repeat):
+                with decrypt_cache() as cache:
+                    started = time.perf_counter()
+                    ReservationListSerializer(list(queryset[:size]), many=True).data
+                    elapsed = time.perf_counter() - started
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, cache)
+
+            elapsed, cache = best
+            results.append({
+                'rows': size,
+                'total_ms': elapsed * 1000,
+                'per_row_ms': elapsed * 1000 / size,
+                'decrypts': cache.decrypts,
+                'cache_hits': cache.hits,
+                'crypto_ms': cache.crypto_time * 1000,
+                'crypto_share': cache.crypto_time / elapsed * 100 if elapsed else 0,
+            })
+        transaction.set_rollback(True)
+    return results
@@ -0,0 +1,88 @@
+"""
+암호화 필드용 암호 백엔드
+
+모든 백엔드는 Fernet 형식의 키(urlsafe-base64 32바이트)를 받아 같은 키 체계
+(ENCRYPTION_KEY, 행별 데이터 키)를 그대로 사용합니다. 저장 값 앞의 접두사로
+백엔드를 구분하므로 여러 형식이 섞여 있어도 읽을 수 있습니다.
+
+- fernet: AES-128-CBC + HMAC-SHA256. 버전/타임스탬프/IV/HMAC/패딩이 붙어 토큰이 큽니다.
+- aes-gcm: AES-256-GCM (AES-NI 하드웨어 가속). 12바이트 nonce + 16바이트 태그만 붙습니다.
+
+새 값은 settings.ENCRYPTED_FIELD_CIPHER(기본 'aes-gcm') 백엔드로 암호화합니다.
+"""
+import base64
+import os
+from functools import lru_cache
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from django.conf import settings
+
+DEFAULT_CIPHER = 'aes-gcm'
+
+
+class FernetCipher:
+    name = 'fernet'
+    prefix = 'f1:'
+    envelope_prefix = 'e1:'
+
+    def __init__(self, key: bytes):
+        self._fernet = Fernet(key)
+
+    def encrypt(self, data: bytes) -> str:
+        return self._fernet.encrypt(data).decode()
+
+    def decrypt(self, token: str) -> bytes:
+        return self._fernet.decrypt(token.encode())
+
+
+class AESGCMCipher:
+    name = 'aes-gcm'
+    prefix = 'g1:'
+    envelope_prefix = 'e2:'
+    nonce_size = 12
+
+    def __init__(self, key: bytes):
+        # 같은 키를 Fernet과 함께 쓰지 않도록 AES-GCM용 키를 따로 파생합니다.
+        self._aead = AESGCM(HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'cielopet:aes-gcm',
+        ).derive(base64.urlsafe_b64decode(key)))
+
+    def encrypt(self, data: bytes) -> str:
+        nonce = os.urandom(self.nonce_size)
+        return base64.urlsafe_b64encode(nonce + self._aead.encrypt(nonce, data, None)).decode()
+
+    def decrypt(self, token: str) -> bytes:
+        raw = base64.urlsafe_b64decode(token)
+        return self._aead.decrypt(raw[:self.nonce_size], raw[self.nonce_size:], None)
+
+
+CIPHERS = {cipher.name: cipher for cipher in (FernetCipher, AESGCMCipher)}
+
+# 저장 값 접두사 → (백엔드, 봉투 암호화 여부)
+PREFIXES = {
+    **{cipher.prefix: (cipher, False) for cipher in CIPHERS.values()},
+    **{cipher.envelope_prefix: (cipher, True) for cipher in CIPHERS.values()},
+}
+
+
+def get_cipher_name() -> str:
+    """새 값을 암호화할 백엔드 이름"""
+    name = getattr(settings, 'ENCRYPTED_FIELD_CIPHER', DEFAULT_CIPHER)
+    if name not in CIPHERS:
+        raise ValueError(f'지원하지 않는 암호 백엔드입니다: {name}')
+    return name
+
+
+@lru_cache(maxsize=8)
+def get_cipher(name: str, key: bytes):
+    """
+    마스터 키의 백엔드 인스턴스 (캐시)
+    행별 데이터 키는 평문 키가 프로세스 전역 캐시에 남지 않도록 CIPHERS[name](key)로 매번 만듭니다.
+    """
+    return CIPHERS[name](key)
@@ -1,111 +1,275 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Min, Q
 from django.utils import timezone
 from datetime import timedelta
 from .models import Reservation, ReservationHistory
 from memorial_rooms.models import MemorialRoom
+from .decrypt_cache import with_decrypt_cache
+from .holds import expire_holds
+from utils.telegram import send_telegram_message, format_reservation_reminder_message
 import logging
 
 logger = logging.getLogger(__name__)
 
+# SKIP LOCKED로 한 번에 잠그고 처리하는 예약 수
+BATCH_SIZE = 500
+# 사전 알림 전송 실패 시 재시도 간격 (실패할 때마다 두 배, 최대 REMINDER_RETRY_MAX)
+REMINDER_RETRY_BASE = timedelta(minutes=1)
+REMINDER_RETRY_MAX = timedelta(minutes=15)
+
+@with_decrypt_cache('check_reservation_status')
 def check_reservation_status():
     """
     1분마다 실행되는 예약 상태 체크 함수
     1. 예약 시간으로부터 2시간이 지난 예약을 완료로 변경
     2. 예약 시간이 된 예약을 진행중으로 변경
     3. 추모실 상태 업데이트
+    4. 1시간 안에 시작하는 예약의 사전 알림 발송
+    5. 만료된 예약 선점 삭제
+
+    예약을 한 건씩 저장하지 않고 상태별 UPDATE 한 번과 이력 bulk_create 한 번으로 처리하므로
+    밀린 예약 수와 관계없이 쿼리 수가 일정합니다.
+
+    처리 건수를 dict로 반환하며, 스케줄러 작업 지표(reservations.metrics)에 누적됩니다.
+    오류는 로그를 남긴 뒤 다시 발생시켜 작업 오류로 집계되게 합니다.
     """
     now = timezone.now()
     logger.info(f"Starting reservation status check at {now}")
-    
+
     try:
         # 1. 예약 시간으로부터 2시간이 지난 예약을 완료로 변경
-        in_progress_reservations = Reservation.objects.filter(
-            status='in_progress',
-            scheduled_at__lte=now - timedelta(hours=2)  # 예약 시간으로부터 2시간이 지난 예약
+        completed_ids = transition_reservations(
+            from_status=Reservation.STATUS_IN_PROGRESS,
+            to_status=Reservation.STATUS_COMPLETED,
+            scheduled_before=now - Reservation.DEFAULT_DURATION,
+            notes='예약 시간으로부터 2시간 경과로 자동 완료 처리',
+            now=now
         )
-        
-        completed_count = 0
-        for reservation in in_progress_reservations:
-            logger.info(
-                f"Completing reservation {reservation.id} "
-                f"(scheduled at: {reservation.scheduled_at}, current time: {now})"
-            )
-            
-            # 상태 변경 및 이력 생성
-            previous_status = reservation.status
-            reservation.status = 'completed'
-            reservation.save()
-            
-            ReservationHistory.objects.create(
-                reservation=reservation,
-                from_status=previous_status,
-                to_status='completed',
-                notes='예약 시간으로부터 2시간 경과로 자동 완료 처리',
-                changed_by=None  # 시스템 자동 변경
-            )
-            completed_count += 1
-        
-        logger.info(f"Completed {completed_count} reservations")
-        
+        logger.info(f"Completed {len(completed_ids)} reservations")
+        process_completed_inventory(completed_ids)
+
         # 2. 예약 시간이 된 확정 상태의 예약을 진행중으로 변경
-        confirmed_reservations = Reservation.objects.filter(
-            status='confirmed',
-            scheduled_at__lte=now  # 예약 시간이 현재 시간보다 이전인 모든 예약
+        started_ids = transition_reservations(
+            from_status=Reservation.STATUS_CONFIRMED,
+            to_status=Reservation.STATUS_IN_PROGRESS,
+            scheduled_before=now,
+            notes='예약 시간 도래로 자동으로 진행중 상태로 변경',
+            now=now
         )
-        
-        started_count = 0
-        for reservation in confirmed_reservations:
-            logger.info(
-                f"Starting reservation {reservation.id} "
-                f"(scheduled at: {reservation.scheduled_at}, current time: {now})"
-            )
-            
-            # 상태 변경 및 이력 생성
-            previous_status = reservation.status
-            reservation.status = 'in_progress'
-            reservation.save()
-            
-            ReservationHistory.objects.create(
-                reservation=reservation,
-                from_status=previous_status,
-                to_status='in_progress',
-                notes='예약 시간 도래로 자동으로 진행중 상태로 변경',
-                changed_by=None  # 시스템 자동 변경
-            )
-            started_count += 1
-        
-        logger.info(f"Started {started_count} reservations")
-        
+        logger.info(f"Started {len(started_ids)} reservations")
+
         # 3. 추모실 상태 업데이트
-        updated_rooms = 0
-        for room in MemorialRoom.objects.all():
-            # 현재 진행중인 예약 확인
-            current_reservation = Reservation.objects.filter(
-                memorial_room=room,
-                status__in=['confirmed', 'in_progress'],
-                scheduled_at__lte=now + timedelta(hours=2)  # 2시간 이내 예정된 예약 포함
-            ).order_by('scheduled_at').first()
-            
-            old_status = room.current_status
-            if current_reservation:
-                # 예약 시간이 아직 안된 경우
-                if current_reservation.scheduled_at > now:
-                    room.current_status = 'reserved'
-                # 예약 시간이 된 경우
-                else:
-                    room.current_status = 'in_use'
-            else:
-                room.current_status = 'available'
-            
-            if old_status != room.current_status:
-                logger.info(
-                    f"Updating memorial room {room.id} status from {old_status} to {room.current_status}"
-                )
-                room.save()
-                updated_rooms += 1
-        
+        updated_rooms = update_memorial_room_statuses(now)
         logger.info(f"Updated {updated_rooms} memorial rooms")
+
+        # 4. 장례 시작 전 사전 알림
+        reminded = dispatch_reminders(now)
+        logger.info(f"Sent reminders for {reminded} reservations")
+
+        # 5. 만료된 예약 선점 일괄 삭제
+        expired_holds = expire_holds(now)
+        logger.info(f"Expired {expired_holds} slot holds")
         logger.info("Reservation status check completed successfully")
-        
+
     except Exception as e:
         logger.error(f"Error during reservation status check: {str(e)}", exc_info=True)
-        print(f'[ERROR] {timezone.now()} Error during reservation status check: {str(e)}') 
\ No newline at end of file
+        raise
+
+    return {
+        'completed': len(completed_ids),
+        'started': len(started_ids),
+        'rooms': updated_rooms,
+        'reminders': reminded,
+        'holds': expired_holds,
+    }
+
+
+def transition_reservations(from_status, to_status, scheduled_before, notes, now=None) -> list:
+    """
+    from_status 상태이고 예약 시간이 scheduled_before 이전인 예약을 to_status로 일괄 변경하고
+    변경 이력을 남깁니다. 변경된 예약 ID 목록을 반환합니다.
+
+    여러 노드가 같은 DB에서 동시에 실행할 수 있습니다.
+    - SKIP LOCKED를 지원하는 DB(MySQL 8, PostgreSQL): 다른 노드가 잠근 행은 건너뛰고 BATCH_SIZE씩
+      가져가 처리하므로 노드끼리 서로 기다리지 않고 밀린 예약을 나눠 처리합니다.
+    - 그 밖의 DB(SQLite): 행 잠금이 없으므로 먼저 UPDATE로 쓰기 잠금을 잡은 뒤 이번 실행이
+      변경한 행만 다시 조회합니다. 다른 노드는 쓰기 잠금이 풀릴 때까지 기다린 뒤 남은 행만 변경합니다.
+    어느 쪽이든 같은 예약의 상태 변경 이력이 중복으로 남지 않습니다.
+    """
+    now = now or timezone.now()
+    due = Reservation.objects.filter(status=from_status, scheduled_at__lte=scheduled_before)
+    if connection.features.has_select_for_update_skip_locked:
+        return claim_in_batches(due, from_status, to_status, notes, now)
+
+    with transaction.atomic():
+        # 조건부 UPDATE가 먼저 실행되므로 이미 다른 노드가 변경한 예약은 제외됩니다.
+        updated = due.update(status=to_status, updated_at=now)
+        if not updated:
+            return []
+        reservation_ids = list(
+            Reservation.objects.filter(
+                status=to_status, scheduled_at__lte=scheduled_before, updated_at=now
+            ).values_list('id', flat=True)
+        )
+        _create_histories(reservation_ids, from_status, to_status, notes)
+    return reservation_ids
+
+
+def claim_in_batches(due, from_status, to_status, notes, now, batch_size=None) -> list:
+    """due 예약을 잠기지 않은 행부터 batch_size씩 잠그고 변경합니다. 변경된 예약 ID 목록을 반환합니다."""
+    batch_size = batch_size or BATCH_SIZE
+    claimed = []
+    while True:
+        with transaction.atomic():
+            reservation_ids = list(
+                due.select_for_update(skip_locked=True)
+                .order_by('scheduled_at', 'id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not reservation_ids:
+                break
+            # UPDATE ... WHERE id IN (...) AND status = from_status AND scheduled_at <= scheduled_before
+            due.filter(id__in=reservation_ids).update(status=to_status, updated_at=now)
+            _create_histories(reservation_ids, from_status, to_status, notes)
+        claimed.extend(reservation_ids)
+        if len(reservation_ids) < batch_size:
+            break
+    return claimed
+
+
+def _create_histories(reservation_ids, from_status, to_status, notes) -> None:
+    for reservation_id in reservation_ids:
+        logger.info(f"Changing reservation {reservation_id} status from {from_status} to {to_status}")
+    ReservationHistory.objects.bulk_create([
+        ReservationHistory(
+            reservation_id=reservation_id,
+            from_status=from_status,
+            to_status=to_status,
+            notes=notes,
+            changed_by=None  # 시스템 자동 변경
+        )
+        for reservation_id in reservation_ids
+    ])
+
+
+def process_completed_inventory(reservation_ids) -> None:
+    """완료 처리된 예약 중 사용 재고가 있는 예약만 재고 차감을 처리합니다."""
+    if not reservation_ids:
+        return
+    reservations = Reservation.objects.filter(
+        id__in=reservation_ids,
+        inventory_items_used__isnull=False
+    ).distinct()
+    for reservation in reservations:
+        try:
+            with transaction.atomic():
+                reservation.process_inventory_usage()
+        except Exception as e:
+            logger.error(f"Error processing inventory for reservation {reservation.id}: {str(e)}", exc_info=True)
+
+
+def update_memorial_room_statuses(now=None) -> int:
+    """
+    추모실별 가장 가까운 예약(확정/진행중, 2시간 이내)을 한 번의 집계 쿼리로 구해
+    추모실 상태를 갱신합니다. 변경된 추모실 수를 반환합니다.
+    """
+    now = now or timezone.now()
+    first_scheduled = dict(
+        Reservation.objects.filter(
+            memorial_room__isnull=False,
+            status__in=[Reservation.STATUS_CONFIRMED, Reservation.STATUS_IN_PROGRESS],
+            scheduled_at__lte=now + Reservation.DEFAULT_DURATION  # 2시간 이내 예정된 예약 포함
+        ).order_by().values('memorial_room').annotate(
+            first_scheduled_at=Min('scheduled_at')
+        ).values_list('memorial_room', 'first_scheduled_at')
+    )
+
+    changed = {}
+    for room_id, old_status in MemorialRoom.objects.values_list('id', 'current_status'):
+        scheduled_at = first_scheduled.get(room_id)
+        if scheduled_at is None:
+            new_status = 'available'
+        # 예약 시간이 아직 안된 경우
+        elif scheduled_at > now:
+            new_status = 'reserved'
+        # 예약 시간이 된 경우
+        else:
+            new_status = 'in_use'
+
+        if old_status != new_status:
+            logger.info(f"Updating memorial room {room_id} status from {old_status} to {new_status}")
+            changed.setdefault(new_status, []).append(room_id)
+
+    for new_status, room_ids in changed.items():
+        MemorialRoom.objects.filter(id__in=room_ids).update(current_status=new_status, updated_at=now)
+    return sum(len(room_ids) for room_ids in changed.values())
+
+
+def get_reminder_lead() -> timedelta:
+    """장례 시작 몇 분 전에 사전 알림을 보낼지 (0이면 알림 끔)"""
+    return timedelta(seconds=getattr(settings, 'RESERVATION_REMINDER_LEAD', 60 * 60))
+
+
+def get_reminder_retry_delay(attempts: int) -> timedelta:
+    """attempts번째 전송 실패 후 다시 보내기까지 기다리는 시간"""
+    return min(REMINDER_RETRY_BASE * 2 ** max(attempts - 1, 0), REMINDER_RETRY_MAX)
+
+
+def dispatch_reminders(now=None, notifier=None) -> int:
+    """
+    알림 구간(지금 ~ 지금 + 알림 시점)에 들어온 확정 예약의 사전 알림을 한 번에 보냅니다.
+    알림을 보낸 예약 수를 반환합니다.
+
+    ['status', 'scheduled_at'] 인덱스 범위 조회 대상을 조건부 UPDATE로 먼저 발송 처리(reminder_sent_at)
+    하므로 재시작하거나 여러 노드에서 실행해도 같은 예약에 두 번 보내지 않습니다.
+    메시지는 한 건으로 묶어 notifier(기본: 텔레그램)에 넘기고, 전송에 실패하면 발송 표시를 되돌리고
+    실패 횟수에 따라 늘어나는 간격 뒤(reminder_retry_at)에 다시 보냅니다.
+    """
+    lead = get_reminder_lead()
+    if not lead:
+        return 0
+    now = now or timezone.now()
+    notifier = notifier or send_telegram_message
+
+    with transaction.atomic():
+        updated = Reservation.objects.filter(
+            Q(reminder_retry_at__isnull=True) | Q(reminder_retry_at__lte=now),
+            status=Reservation.STATUS_CONFIRMED,
+            scheduled_at__gt=now,
+            scheduled_at__lte=now + lead,
+            reminder_sent_at__isnull=True
+        ).update(reminder_sent_at=now)
+        if not updated:
+            return 0
+        reservations = list(
+            Reservation.objects.filter(
+                status=Reservation.STATUS_CONFIRMED,
+                scheduled_at__gt=now,
+                scheduled_at__lte=now + lead,
+                reminder_sent_at=now
+            ).select_related('pet', 'memorial_room', 'assigned_staff').order_by('scheduled_at')
+        )
+
+    reservation_ids = [reservation.id for reservation in reservations]
+    try:
+        sent = notifier(format_reservation_reminder_message(reservations))
+    except Exception as e:
+        logger.error(f"Error sending reservation reminders: {str(e)}", exc_info=True)
+        sent = False
+    if not sent:
+        attempts = {}
+        for reservation in reservations:
+            attempts.setdefault(reservation.reminder_attempts + 1, []).append(reservation.id)
+        for attempt, ids in attempts.items():
+            Reservation.objects.filter(id__in=ids, reminder_sent_at=now).update(
+                reminder_sent_at=None,
+                reminder_attempts=F('reminder_attempts') + 1,
+                reminder_retry_at=now + get_reminder_retry_delay(attempt)
+            )
+        retry_at = now + get_reminder_retry_delay(min(attempts))
+        logger.warning(f"Failed to send reminders for reservations {reservation_ids}, will retry at {retry_at}")
+        return 0
+
+    logger.info(f"Sent reminders for reservations {reservation_ids}")
+    return len(reservation_ids)
@@ -0,0 +1,112 @@
+"""
+요청 단위 복호화 캐시
+
+한 요청 안에서 같은 암호문(같은 고객/반려동물 행)이 여러 번 조회되면
+매번 Fernet 복호화를 반복하게 됩니다. (예약 목록의 같은 고객, 대시보드의 추모실별 예약 등)
+DecryptCacheMiddleware가 요청마다 크기가 제한된 LRU 캐시를 열고,
+EncryptedField.decrypt가 암호문 → 평문 결과를 캐시합니다.
+캐시는 요청이 끝나면 버려지므로 평문이 요청 밖으로 남지 않습니다.
+
+같은 객체에 요청 단위 암호화/복호화 횟수와 누적 소요 시간도 기록해
+암호화가 응답 시간에서 차지하는 비중을 확인할 수 있게 합니다.
+"""
+import functools
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger('reservations')
+
+DEFAULT_MAXSIZE = 1024
+
+_current_cache: ContextVar[Optional['DecryptCache']] = ContextVar('decrypt_cache', default=None)
+
+
+class DecryptCache:
+    """크기가 제한된 암호문 → 평문 LRU 캐시"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.decrypts = 0
+        self.encrypts = 0
+        self.crypto_time = 0.0
+        self._values = OrderedDict()
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        value = self._values.get(ciphertext)
+        if value is None:
+            self.misses += 1
+            return None
+        self._values.move_to_end(ciphertext)
+        self.hits += 1
+        return value
+
+    def set(self, ciphertext: str, plaintext: str) -> None:
+        self._values[ciphertext] = plaintext
+        self._values.move_to_end(ciphertext)
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+
+    def record(self, operation: str, elapsed: float) -> None:
+        """실제로 수행한 암호화/복호화 1회와 소요 시간(초)을 기록합니다."""
+        if operation == 'encrypt':
+            self.encrypts += 1
+        else:
+            self.decrypts += 1
+        self.crypto_time += elapsed
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._values)}
+
+    def crypto_stats(self) -> dict:
+        return {
+            'decrypts': self.decrypts,
+            'encrypts': self.encrypts,
+            'crypto_ms': round(self.crypto_time * 1000, 3),
+        }
+
+    def summary(self) -> str:
+        stats = {**self.stats(), **self.crypto_stats()}
+        return (
+            f"복호화 {stats['decrypts']}회, 암호화 {stats['encrypts']}회, "
+            f"암호화 처리 {stats['crypto_ms']}ms, 캐시 적중 {stats['hits']}회"
+        )
+
+
+def get_decrypt_cache() -> Optional[DecryptCache]:
+    """현재 요청의 복호화 캐시 (캐시가 열려 있지 않으면 None)"""
+    return _current_cache.get()
+
+
+@contextmanager
+def decrypt_cache(maxsize: int = None):
+    """블록 안에서 복호화 결과를 캐시합니다. (요청 밖의 배치 작업에서도 사용 가능)"""
+    if maxsize is None:
+        maxsize = getattr(settings, 'DECRYPT_CACHE_SIZE', DEFAULT_MAXSIZE)
+    cache = DecryptCache(maxsize)
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
+
+
+def with_decrypt_cache(label: str):
+    """요청 밖의 작업(cron 등)에서 복호화 캐시를 열고 끝날 때 통계를 로그로 남기는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with decrypt_cache() as cache:
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    if cache.decrypts or cache.encrypts:
+                        logger.info(f'{label}: {cache.summary()}')
+        return wrapper
+    return decorator
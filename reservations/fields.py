@@ -1,38 +1,494 @@
+from django.core import checks
 from django.db import models
+from django.db.models import ExpressionWrapper, F, Lookup
+from django.db.models.query_utils import DeferredAttribute
 from django.conf import settings
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from functools import lru_cache
 import base64
+import binascii
+import hashlib
+import hmac
+import re
+import time
+
+from .ciphers import AESGCMCipher, CIPHERS, DEFAULT_CIPHER, FernetCipher, PREFIXES, get_cipher, get_cipher_name
+from .decrypt_cache import get_decrypt_cache
+
+
+def get_encryption_key() -> bytes:
+    """settings.ENCRYPTION_KEY를 반환합니다. 키가 없으면 새로 생성합니다."""
+    if not hasattr(settings, 'ENCRYPTION_KEY'):
+        key = Fernet.generate_key()
+        setattr(settings, 'ENCRYPTION_KEY', key)
+    key = settings.ENCRYPTION_KEY
+    return key.encode() if isinstance(key, str) else key
+
+
+@lru_cache(maxsize=8)
+def get_fernet(key: bytes) -> Fernet:
+    return Fernet(key)
+
+
+@lru_cache(maxsize=None)
+def _derive_key(master_key: bytes, purpose: bytes, length: int) -> bytes:
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=None,
+        info=b'cielopet:' + purpose,
+    ).derive(base64.urlsafe_b64decode(master_key))
+
+
+def derive_key(purpose: bytes, length: int = 32, master_key: bytes = None) -> bytes:
+    """마스터 암호화 키로부터 용도별 하위 키를 파생합니다."""
+    return _derive_key(master_key or get_encryption_key(), purpose, length)
+
+
+def get_blind_index_key(master_key: bytes = None) -> bytes:
+    """
+    블라인드 인덱스용 HMAC 키
+    settings.BLIND_INDEX_KEY가 있으면 사용하고, 없으면 ENCRYPTION_KEY에서 파생합니다.
+    """
+    key = getattr(settings, 'BLIND_INDEX_KEY', None)
+    if key:
+        return key.encode() if isinstance(key, str) else key
+    return derive_key(b'blind-index', master_key=master_key)
+
+
+def normalize_text(value: str) -> str:
+    return value.strip()
+
+
+def normalize_phone(value: str) -> str:
+    """전화번호에서 숫자만 남깁니다. (010-1234-5678 → 01012345678)"""
+    return re.sub(r'\D', '', value)
+
+
+def normalize_email(value: str) -> str:
+    return value.strip().lower()
+
+
+# 암호화 필드 저장 형식
+# - 접두사 없음: base64(Fernet 토큰) - 기존 형식. Fernet 토큰이 이미 urlsafe-base64이므로
+#   이중 인코딩되어 약 33% 더 크고 읽을 때마다 base64 디코딩이 한 번 더 필요합니다.
+# - 'f1:' + Fernet 토큰 - 압축 형식
+# - 'g1:' + base64(nonce + AES-GCM 암호문) - AES-GCM 형식 (기본값, ciphers.py 참고)
+# 읽기는 모든 형식을 지원합니다. 모든 서버가 압축 형식을 읽을 수 있게 되기 전까지는
+# settings.ENCRYPTED_FIELD_FORMAT = 'legacy'로 기존 형식 쓰기를 유지할 수 있습니다.
+# 기존 데이터 변환: python manage.py compact_encrypted_data
+# - 'e1:'(Fernet) / 'e2:'(AES-GCM) - 봉투 암호화 형식. 행별 데이터 키(DataKeyField)로 암호화합니다.
+# - 'd1:' + base64(AES-SIV 암호문) - 결정적 암호화 형식 (DeterministicEncryptedCharField)
+FERNET_PREFIX = FernetCipher.prefix
+AES_GCM_PREFIX = AESGCMCipher.prefix
+ENVELOPE_PREFIXES = tuple(cipher.envelope_prefix for cipher in CIPHERS.values())
+DETERMINISTIC_PREFIX = 'd1:'
+STORED_PREFIXES = (*PREFIXES, DETERMINISTIC_PREFIX)
+
+# 봉투 암호화(envelope encryption)
+# 모델에 DataKeyField가 있으면 행마다 데이터 키(DEK)를 생성해 암호화 필드를 암호화하고,
+# DEK는 마스터 키(ENCRYPTION_KEY)로 감싸(wrap) 'k1:' + Fernet 토큰 형식으로 함께 저장합니다.
+# 마스터 키를 교체할 때는 암호화 필드를 다시 쓰지 않고 DEK 컬럼만 다시 감싸면 됩니다.
+DATA_KEY_PREFIX = 'k1:'
+
+
+def generate_data_key() -> bytes:
+    return Fernet.generate_key()
+
+
+def wrap_data_key(data_key: bytes, master_key: bytes = None) -> str:
+    """데이터 키를 마스터 키로 감싸 저장 형식 문자열로 반환합니다."""
+    fernet = get_fernet(master_key or get_encryption_key())
+    return DATA_KEY_PREFIX + fernet.encrypt(data_key).decode()
+
+
+def unwrap_data_key(wrapped: str, master_key: bytes = None) -> bytes:
+    """감싼 데이터 키를 마스터 키로 풉니다. 실패하면 InvalidToken 예외가 발생합니다."""
+    fernet = get_fernet(master_key or get_encryption_key())
+    return fernet.decrypt(wrapped[len(DATA_KEY_PREFIX):].encode())
+
+
+@lru_cache(maxsize=1024)
+def get_data_key(wrapped: str, master_key: bytes) -> bytes:
+    """감싼 데이터 키를 풉니다. (행마다 키를 다시 풀지 않도록 캐시)"""
+    return unwrap_data_key(wrapped, master_key)
+
+
+def is_envelope_value(value: str) -> bool:
+    return value.startswith(ENVELOPE_PREFIXES)
+
+
+def compact_stored_value(value: str) -> str:
+    """기존 형식의 저장 값을 복호화 없이 압축 형식으로 변환합니다."""
+    if value.startswith(STORED_PREFIXES):
+        return value
+    try:
+        return FERNET_PREFIX + base64.b64decode(value, validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return value
+
+
+def encrypt_value(value: str, key: bytes = None, envelope: bool = False, cipher: str = None) -> str:
+    """
+    평문을 암호화해 저장 형식 문자열로 반환합니다.
+    key가 없으면 ENCRYPTION_KEY, cipher가 없으면 settings.ENCRYPTED_FIELD_CIPHER를 사용합니다.
+    봉투 암호화 값은 key에 데이터 키를 넘깁니다.
+    """
+    name = cipher or get_cipher_name()
+    # 데이터 키의 백엔드는 캐시하지 않습니다. (생성 비용이 작음)
+    backend = CIPHERS[name](key) if envelope else get_cipher(name, key or get_encryption_key())
+    prefix = backend.envelope_prefix if envelope else backend.prefix
+    return prefix + backend.encrypt(value.encode())
+
+
+def encrypt_legacy_value(value: str, key: bytes = None) -> str:
+    """기존 형식(base64(Fernet 토큰))으로 암호화합니다."""
+    return base64.b64encode(get_fernet(key or get_encryption_key()).encrypt(value.encode())).decode()
+
+
+def decrypt_value(value: str, key: bytes = None) -> str:
+    """
+    저장 형식 문자열을 복호화합니다. 실패하면 InvalidToken 등의 예외가 발생합니다.
+    봉투 암호화 값은 key에 데이터 키를 넘겨야 합니다.
+    """
+    key = key or get_encryption_key()
+    prefix = value[:len(FERNET_PREFIX)]
+    if prefix in PREFIXES:
+        cipher, envelope = PREFIXES[prefix]
+        backend = cipher(key) if envelope else get_cipher(cipher.name, key)
+        return backend.decrypt(value[len(prefix):]).decode()
+    return get_fernet(key).decrypt(base64.b64decode(value)).decode()
+
+
+@lru_cache(maxsize=8)
+def get_siv(master_key: bytes) -> AESSIV:
+    """결정적 암호화용 AES-SIV (마스터 키에서 64바이트 키 파생)"""
+    return AESSIV(derive_key(b'deterministic', length=64, master_key=master_key))
+
+
+def encrypt_deterministic(value: str, master_key: bytes = None) -> str:
+    """같은 평문은 항상 같은 암호문이 되도록 AES-SIV로 암호화합니다."""
+    siv = get_siv(master_key or get_encryption_key())
+    return DETERMINISTIC_PREFIX + base64.urlsafe_b64encode(siv.encrypt(value.encode(), None)).decode()
+
+
+def decrypt_deterministic(value: str, master_key: bytes = None) -> str:
+    siv = get_siv(master_key or get_encryption_key())
+    return siv.decrypt(base64.urlsafe_b64decode(value[len(DETERMINISTIC_PREFIX):]), None).decode()
+
+
+def reencrypt_deterministic(old_key: bytes, new_key: bytes, value: str):
+    """결정적 암호문을 새 키로 다시 암호화합니다. 반환값: (평문, 새 저장 값)"""
+    try:
+        text = decrypt_deterministic(value, old_key)
+    except Exception:
+        # 이미 새 키로 암호화된 값 (중단 후 재실행)
+        text = decrypt_deterministic(value, new_key)
+    return text, encrypt_deterministic(text, new_key)
+
+
+def decrypt_stored_value(value: str, wrapped_data_key: str = None, master_key: bytes = None) -> str:
+    """
+    저장 형식에 따라 값을 복호화합니다. (마이그레이션 등 모델 인스턴스가 없는 곳에서 사용)
+    봉투 암호화 값은 wrapped_data_key가 필요합니다.
+    """
+    master_key = master_key or get_encryption_key()
+    if value.startswith(DETERMINISTIC_PREFIX):
+        return decrypt_deterministic(value, master_key)
+    if is_envelope_value(value):
+        return decrypt_value(value, get_data_key(wrapped_data_key, master_key))
+    return decrypt_value(value, master_key)
+
+
+def reencrypt_stored_values(old_key: bytes, new_key: bytes, rows: list, with_plaintext: bool = False,
+                            cipher: str = DEFAULT_CIPHER):
+    """
+    (pk, [저장 값, ...]) 목록을 기존 키로 복호화한 뒤 새 키로 다시 암호화합니다.
+    Django 설정에 의존하지 않으므로 프로세스 풀 작업으로 실행할 수 있습니다.
+
+    반환값: (결과 목록, 이미 새 키로 암호화된 pk 목록, 실패한 pk 목록)
+    결과 항목은 (pk, [새 저장 값, ...], [평문, ...] 또는 None) 입니다.
+    """
+    results, skipped, failed = [], [], []
+    for pk, values in rows:
+        deterministic = [value is not None and value.startswith(DETERMINISTIC_PREFIX) for value in values]
+        try:
+            plaintexts = [
+                None if value is None
+                else decrypt_deterministic(value, old_key) if is_deterministic
+                else decrypt_value(value, old_key)
+                for value, is_deterministic in zip(values, deterministic)
+            ]
+        except Exception:
+            try:
+                for value, is_deterministic in zip(values, deterministic):
+                    if value is None:
+                        continue
+                    if is_deterministic:
+                        decrypt_deterministic(value, new_key)
+                    else:
+                        decrypt_value(value, new_key)
+                skipped.append(pk)
+            except Exception:
+                failed.append(pk)
+            continue
+        encrypted = [
+            None if text is None
+            else encrypt_deterministic(text, new_key) if is_deterministic
+            else encrypt_value(text, new_key, cipher=cipher)
+            for text, is_deterministic in zip(plaintexts, deterministic)
+        ]
+        results.append((pk, encrypted, plaintexts if with_plaintext else None))
+    return results, skipped, failed
+
+
+def rewrap_envelope_rows(old_key: bytes, new_key: bytes, rows: list, with_plaintext: bool = False,
+                         cipher: str = DEFAULT_CIPHER):
+    """
+    봉투 암호화 모델의 (pk, 감싼 데이터 키, [저장 값, ...]) 목록을 새 마스터 키 기준으로 변환합니다.
+
+    - 데이터 키가 있으면 기존 키로 풀어 새 키로 다시 감쌉니다. 봉투 암호화 값은 그대로 둡니다.
+    - 데이터 키가 없거나 마스터 키로 암호화된 값('f1:'/'g1:'/기존 형식)이 있으면
+      데이터 키를 만들고 해당 값을 데이터 키로 다시 암호화합니다.
+    old_key와 new_key가 같으면 마스터 키는 그대로 두고 봉투 암호화 형식으로만 변환합니다.
+
+    반환값: (결과 목록, 변경할 것이 없는 pk 목록, 실패한 pk 목록)
+    결과 항목은 (pk, 새 데이터 키, [저장 값, ...], 값 변경 여부, [평문, ...] 또는 None) 입니다.
+    """
+    results, skipped, failed = [], [], []
+    for pk, wrapped, values in rows:
+        try:
+            rewrap = old_key != new_key
+            if wrapped:
+                try:
+                    data_key = unwrap_data_key(wrapped, old_key)
+                except Exception:
+                    # 이미 새 키로 감싼 행 (중단 후 재실행)
+                    data_key = unwrap_data_key(wrapped, new_key)
+                    rewrap = False
+            else:
+                data_key = generate_data_key()
+                rewrap = True
+
+            stored, plaintexts, changed = [], [], False
+            for value in values:
+                if value is None:
+                    stored.append(None)
+                    plaintexts.append(None)
+                elif is_envelope_value(value):
+                    stored.append(value)
+                    plaintexts.append(decrypt_value(value, data_key) if with_plaintext else None)
+                elif value.startswith(DETERMINISTIC_PREFIX):
+                    # 결정적 암호화 값은 데이터 키를 쓰지 않으므로 마스터 키로 다시 암호화합니다.
+                    text, new_value = reencrypt_deterministic(old_key, new_key, value)
+                    stored.append(new_value)
+                    plaintexts.append(text)
+                    changed = changed or new_value != value
+                else:
+                    try:
+                        text = decrypt_value(value, old_key)
+                    except Exception:
+                        text = decrypt_value(value, new_key)
+                    stored.append(encrypt_value(text, data_key, envelope=True, cipher=cipher))
+                    plaintexts.append(text)
+                    changed = True
+        except Exception:
+            failed.append(pk)
+            continue
+
+        if not rewrap and not changed:
+            skipped.append(pk)
+            continue
+        new_wrapped = wrap_data_key(data_key, new_key) if rewrap else wrapped
+        results.append((pk, new_wrapped, stored, changed, plaintexts if with_plaintext else None))
+    return results, skipped, failed
+
+
+def raw_column(name: str) -> ExpressionWrapper:
+    """from_db_value를 거치지 않고 컬럼의 저장 값을 그대로 조회하는 표현식"""
+    return ExpressionWrapper(F(name), output_field=models.TextField())
+
+
+class Ciphertext(str):
+    """
+    아직 복호화하지 않은 데이터베이스 저장 값
+    get_prep_value는 이 값을 다시 암호화하지 않고 그대로 저장합니다.
+    """
+
+
+class LazyDecryptDescriptor(DeferredAttribute):
+    """처음 접근할 때 암호문을 복호화하고 결과를 인스턴스에 캐시하는 디스크립터"""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, Ciphertext):
+            value = self.field.decrypt(value, instance)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
 
 class EncryptedField:
     """
     Django 모델 필드를 위한 암호화 Mixin
+
+    search_index에 토크나이저 이름('ngram', 'phone', 'email')을 지정하면
+    저장 시 부분 검색용 토큰이 EncryptedSearchToken 테이블에 기록됩니다.
+
+    lazy=True이면 조회 시 복호화하지 않고 암호문(Ciphertext)을 보관했다가
+    속성에 처음 접근할 때 복호화합니다. 접근하지 않은 필드는 저장 시에도
+    다시 암호화하지 않습니다. 단, values()/values_list()는 모델 인스턴스를
+    거치지 않으므로 Ciphertext를 그대로 반환합니다. (field.decrypt()로 복호화)
+
+    모델에 DataKeyField가 있으면 행별 데이터 키로 암호화합니다. (봉투 암호화)
+    복호화에 인스턴스의 데이터 키가 필요하므로 이 경우 lazy=True여야 합니다.
+    update()/bulk_update()처럼 인스턴스를 거치지 않는 저장이나 데이터 키가 없는
+    기존 행은 마스터 키로 암호화되며, 읽기는 두 방식을 모두 지원합니다.
     """
-    def __init__(self, *args, **kwargs):
+    # 모델에 DataKeyField가 있으면 행별 데이터 키로 암호화할지 여부
+    envelope = True
+
+    def __init__(self, *args, lazy=False, search_index=None, **kwargs):
+        self.lazy = lazy
+        self.search_index = search_index
         super().__init__(*args, **kwargs)
-        # settings.py에서 ENCRYPTION_KEY를 가져옵니다.
-        # 키가 없으면 새로 생성합니다.
-        if not hasattr(settings, 'ENCRYPTION_KEY'):
-            key = Fernet.generate_key()
-            setattr(settings, 'ENCRYPTION_KEY', key)
-        self.fernet = Fernet(settings.ENCRYPTION_KEY)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.lazy:
+            kwargs['lazy'] = True
+        if self.search_index:
+            kwargs['search_index'] = self.search_index
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        if self.lazy:
+            setattr(cls, self.attname, LazyDecryptDescriptor(self))
+
+    @property
+    def blind_index_field(self):
+        """이 필드를 원본으로 하는 BlindIndexField (없으면 None)"""
+        model = getattr(self, 'model', None)
+        if model is None:
+            return None
+        for field in model._meta.concrete_fields:
+            if isinstance(field, BlindIndexField) and field.source == self.name:
+                return field
+        return None
+
+    @property
+    def data_key_field(self):
+        """같은 모델의 DataKeyField (없으면 None)"""
+        model = getattr(self, 'model', None)
+        if model is None:
+            return None
+        for field in model._meta.concrete_fields:
+            if isinstance(field, DataKeyField):
+                return field
+        return None
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        if self.envelope and self.data_key_field is not None and not self.lazy:
+            errors.append(checks.Error(
+                '봉투 암호화(DataKeyField)를 사용하는 모델의 암호화 필드는 lazy=True여야 합니다.',
+                obj=self,
+                id='reservations.E001',
+            ))
+        return errors
+
+    def get_lookup(self, lookup_name):
+        # 블라인드 인덱스가 있으면 exact 조회를 인덱스 컬럼 비교로 바꿉니다.
+        if lookup_name == 'exact' and self.blind_index_field is not None:
+            return BlindIndexExact
+        return super().get_lookup(lookup_name)
+
+    @staticmethod
+    def legacy_format() -> bool:
+        return getattr(settings, 'ENCRYPTED_FIELD_FORMAT', 'compact') == 'legacy'
+
+    def encrypt(self, value: str, data_key: bytes = None) -> str:
+        cache = get_decrypt_cache()
+        if cache is None:
+            return self.encrypt_uncached(value, data_key)
+        started = time.perf_counter()
+        stored = self.encrypt_uncached(value, data_key)
+        cache.record('encrypt', time.perf_counter() - started)
+        return stored
+
+    def encrypt_uncached(self, value: str, data_key: bytes = None) -> str:
+        # settings.py의 ENCRYPTION_KEY(봉투 암호화는 행별 데이터 키)로 암호화합니다.
+        if self.legacy_format():
+            return encrypt_legacy_value(value)
+        if data_key is not None:
+            return encrypt_value(value, data_key, envelope=True)
+        return encrypt_value(value)
+
+    def decrypt(self, value: str, instance=None):
+        # 요청 단위 캐시가 열려 있으면 같은 암호문은 한 번만 복호화합니다.
+        cache = get_decrypt_cache()
+        if cache is not None:
+            plaintext = cache.get(value)
+            if plaintext is not None:
+                return plaintext
+        if cache is None:
+            return self.decrypt_uncached(value, instance)
+        started = time.perf_counter()
+        plaintext = self.decrypt_uncached(value, instance)
+        cache.record('decrypt', time.perf_counter() - started)
+        if plaintext is not None:
+            cache.set(value, plaintext)
+        return plaintext
+
+    def decrypt_uncached(self, value: str, instance=None):
+        try:
+            if is_envelope_value(value):
+                # 봉투 암호화 값은 인스턴스의 데이터 키로만 복호화할 수 있습니다.
+                data_key_field = self.data_key_field
+                if instance is None or data_key_field is None:
+                    return None
+                return decrypt_value(value, data_key_field.get_data_key(instance))
+            return decrypt_value(value)
+        except Exception:
+            return None
+
+    def pre_save(self, model_instance, add):
+        # 한 번도 접근하지 않은 지연 필드는 저장된 암호문을 그대로 사용합니다.
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, Ciphertext):
+            return value
+        value = super().pre_save(model_instance, add)
+        data_key_field = self.data_key_field if self.envelope else None
+        if value is None or data_key_field is None or self.legacy_format():
+            return value
+        # 데이터 키는 INSERT 시에만 새로 만듭니다. (update_fields 저장에서 키 컬럼이 빠지는 것을 방지)
+        data_key = data_key_field.get_data_key(model_instance, create=add)
+        if data_key is None:
+            return value
+        return Ciphertext(self.encrypt(str(super().get_prep_value(value)), data_key))
 
     def get_prep_value(self, value):
         # 데이터베이스에 저장하기 전에 암호화
-        if value is None:
+        if value is None or isinstance(value, Ciphertext):
             return value
         value = super().get_prep_value(value)
-        encrypted = self.fernet.encrypt(str(value).encode())
-        return base64.b64encode(encrypted).decode()
+        return self.encrypt(str(value))
 
     def from_db_value(self, value, expression, connection):
         # 데이터베이스에서 읽을 때 복호화
         if value is None:
             return value
-        try:
-            decrypted = self.fernet.decrypt(base64.b64decode(value))
-            return decrypted.decode()
-        except Exception:
-            return None
+        if self.lazy:
+            return Ciphertext(value)
+        return self.decrypt(value)
 
 class EncryptedCharField(EncryptedField, models.CharField):
     pass
@@ -41,4 +497,129 @@ class EncryptedTextField(EncryptedField, models.TextField):
     pass
 
 class EncryptedEmailField(EncryptedField, models.EmailField):
-    pass 
\ No newline at end of file
+    pass
+
+
+class DeterministicEncryptedCharField(EncryptedField, models.CharField):
+    """
+    결정적 암호화(AES-SIV) 문자 필드
+
+    같은 평문은 항상 같은 암호문으로 저장되므로 일치 조회(filter, __in),
+    GROUP BY, 인덱스를 SQL에서 그대로 사용할 수 있습니다. 대신 값의 빈도가
+    드러나므로 종/품종처럼 식별성이 낮은 값에만 사용합니다.
+    복호화에 인스턴스가 필요 없으므로 lazy=True일 때 values()/values_list()가 반환한
+    Ciphertext도 field.decrypt()로 바로 복호화할 수 있습니다.
+    """
+    envelope = False
+
+    def encrypt_uncached(self, value: str, data_key: bytes = None) -> str:
+        return encrypt_deterministic(value)
+
+    def decrypt_uncached(self, value: str, instance=None):
+        try:
+            return decrypt_deterministic(value)
+        except Exception:
+            return None
+
+
+class DataKeyField(models.CharField):
+    """
+    행별 데이터 키(DEK)를 마스터 키로 감싸 저장하는 컬럼
+
+    같은 모델의 암호화 필드는 이 키로 암호화됩니다. 키는 행을 처음 저장할 때 생성되며,
+    마스터 키 교체 시(reencrypt_data) 이 컬럼만 다시 감싸면 됩니다.
+    """
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', 255)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('blank', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        for key, default in (('max_length', 255), ('editable', False), ('null', True), ('blank', True)):
+            if kwargs.get(key, default) == default:
+                kwargs.pop(key, None)
+        return name, path, args, kwargs
+
+    def get_data_key(self, model_instance, create: bool = False):
+        """인스턴스의 데이터 키 (키가 없고 create=False이면 None)"""
+        wrapped = getattr(model_instance, self.attname)
+        if not wrapped:
+            if not create:
+                return None
+            wrapped = wrap_data_key(generate_data_key())
+            setattr(model_instance, self.attname, wrapped)
+        return get_data_key(wrapped, get_encryption_key())
+
+    def pre_save(self, model_instance, add):
+        if add and not EncryptedField.legacy_format():
+            self.get_data_key(model_instance, create=True)
+        return getattr(model_instance, self.attname)
+
+
+class BlindIndexField(models.CharField):
+    """
+    암호화 필드의 평문을 정규화한 뒤 HMAC-SHA256으로 해시해 저장하는 동반 컬럼
+
+    암호문은 저장할 때마다 달라지므로 원본 필드로는 일치 검색을 할 수 없습니다.
+    source 필드에 대한 exact 조회(filter, get, get_or_create)는 이 컬럼의
+    인덱스 검색으로 변환됩니다.
+    """
+    def __init__(self, *args, source=None, normalizer=None, **kwargs):
+        self.source = source
+        self.normalizer = normalizer
+        kwargs.setdefault('max_length', 64)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('blank', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        if self.normalizer is not None:
+            kwargs['normalizer'] = self.normalizer
+        for key, default in (('max_length', 64), ('db_index', True), ('editable', False),
+                             ('null', True), ('blank', True)):
+            if kwargs.get(key, default) == default:
+                kwargs.pop(key, None)
+        return name, path, args, kwargs
+
+    def digest(self, value, master_key: bytes = None):
+        """평문 값의 블라인드 인덱스를 계산합니다."""
+        if value is None:
+            return None
+        normalized = (self.normalizer or normalize_text)(str(value))
+        if not normalized:
+            return None
+        return hmac.new(
+            get_blind_index_key(master_key),
+            normalized.encode(),
+            hashlib.sha256
+        ).hexdigest()
+
+    def pre_save(self, model_instance, add):
+        source = model_instance._meta.get_field(self.source)
+        if isinstance(model_instance.__dict__.get(source.attname), Ciphertext):
+            # 원본 값이 바뀌지 않았으면 복호화 없이 기존 인덱스를 유지합니다.
+            return getattr(model_instance, self.attname)
+        value = self.digest(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class BlindIndexExact(Lookup):
+    """암호화 필드의 exact 조회를 블라인드 인덱스 컬럼 비교로 변환합니다."""
+    lookup_name = 'exact'
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return self.lhs.output_field.blind_index_field.digest(self.rhs)
+
+    def as_sql(self, compiler, connection):
+        index_field = self.lhs.output_field.blind_index_field
+        lhs_sql, lhs_params = compiler.compile(index_field.get_col(self.lhs.alias))
+        return f'{lhs_sql} = %s', [*lhs_params, self.rhs]
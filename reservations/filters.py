@@ -0,0 +1,73 @@
+import operator
+from functools import reduce
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework import filters
+
+from .fields import EncryptedField
+from .search import search_object_ids
+
+
+class EncryptedSearchFilter(filters.SearchFilter):
+    """
+    암호화 필드를 지원하는 SearchFilter
+
+    search_index가 지정된 암호화 필드(관계 경로 포함, 예: customer__name)는
+    검색 토큰 테이블의 인덱스 조인으로 검색하고, 나머지 필드는 기존 SearchFilter와
+    동일하게 검색합니다.
+    """
+
+    def resolve_encrypted_field(self, model, search_field: str):
+        """검색 필드 경로가 검색 가능한 암호화 필드이면 (경로 prefix, 필드)를 반환합니다."""
+        parts = search_field.lstrip(''.join(self.lookup_prefixes)).split('__')
+        prefix = ''
+        for index, part in enumerate(parts):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            if index == len(parts) - 1:
+                if isinstance(field, EncryptedField) and field.search_index:
+                    return prefix, field
+                return None
+            if not field.is_relation:
+                return None
+            model = field.related_model
+            prefix += f'{part}__'
+        return None
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        encrypted_fields = {
+            search_field: self.resolve_encrypted_field(queryset.model, str(search_field))
+            for search_field in search_fields
+        }
+        plain_fields = [field for field, resolved in encrypted_fields.items() if resolved is None]
+        orm_lookups = [
+            self.construct_search(str(search_field), queryset)
+            for search_field in plain_fields
+        ]
+
+        base = queryset
+        for term in search_terms:
+            conditions = [Q(**{orm_lookup: term}) for orm_lookup in orm_lookups]
+            for resolved in encrypted_fields.values():
+                if resolved is None:
+                    continue
+                prefix, field = resolved
+                object_ids = search_object_ids(field, term)
+                if object_ids is not None:
+                    conditions.append(Q(**{f'{prefix}pk__in': object_ids}))
+            if not conditions:
+                return queryset.none()
+            queryset = queryset.filter(reduce(operator.or_, conditions))
+
+        if plain_fields and self.must_call_distinct(base, plain_fields):
+            queryset = queryset.distinct()
+        return queryset
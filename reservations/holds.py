@@ -0,0 +1,105 @@
+"""
+예약 선점(SlotHold)
+
+직원이 예약 내용을 입력하는 동안 추모실/시간을 몇 분간 선점해 두고, 예약 생성 시 토큰으로 소비합니다.
+- 선점: 추모실 행을 잠근 짧은 트랜잭션 안에서 겹치는 예약/선점이 없으면 생성합니다.
+  (추모실, 예약일시) unique 제약이 같은 시간의 중복 선점을 DB에서 한 번 더 막습니다.
+- 소비: 예약 생성 시 같은 잠금 안에서 토큰이 요청한 직원/추모실/예약 일시의 만료되지 않은
+  선점인지 확인한 뒤에만 그 선점을 무시하고 삭제합니다.
+- 입력하는 동안에는 잠금을 잡지 않습니다. 다른 직원의 예약 생성/수정/일정 변경은
+  check_room_available에서 만료되지 않은 선점과 겹치면 거절됩니다.
+- 만료된 선점은 예약 상태 체크 작업에서 DELETE 한 번으로 일괄 삭제합니다. 삭제 전이라도
+  만료된 선점은 무시됩니다.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .availability import Booking, RoomUnavailable, check_room_available, lock_room
+from .models import Reservation, SlotHold
+
+DEFAULT_HOLD_MINUTES = 10
+MAX_HOLD_MINUTES = 30
+
+
+class InvalidHold(ValueError):
+    """선점 토큰이 없거나 만료되었거나 다른 직원/추모실/시간의 선점인 경우"""
+
+    def __init__(self, token):
+        self.token = token
+        super().__init__("선점이 만료되었거나 요청한 추모실/예약 일시의 선점이 아닙니다.")
+
+
+def get_hold_duration(minutes: Optional[int] = None) -> timedelta:
+    """선점 시간 (요청 값은 1분 ~ MAX_HOLD_MINUTES분으로 제한)"""
+    minutes = minutes or getattr(settings, 'RESERVATION_HOLD_MINUTES', DEFAULT_HOLD_MINUTES)
+    return timedelta(minutes=min(max(int(minutes), 1), MAX_HOLD_MINUTES))
+
+
+def hold_slot(room_id: int, scheduled_at: datetime, user, minutes: Optional[int] = None,
+              token=None, now: datetime = None) -> SlotHold:
+    """
+    추모실/시간을 선점합니다. 겹치는 예약이나 다른 선점이 있으면 RoomUnavailable을 발생시킵니다.
+    자신의 선점 token을 주면 새 시간으로 옮기고 만료 시각을 연장합니다.
+    """
+    now = now or timezone.now()
+    expires_at = now + get_hold_duration(minutes)
+    with transaction.atomic():
+        lock_room(room_id)
+        # 같은 추모실의 만료된 선점은 unique 제약에 걸리지 않도록 먼저 정리합니다.
+        SlotHold.objects.filter(memorial_room_id=room_id, expires_at__lte=now).delete()
+        hold = SlotHold.objects.filter(token=token, held_by=user).first() if token else None
+        check_room_available(room_id, scheduled_at, exclude_hold=hold.token if hold else None)
+
+        try:
+            with transaction.atomic():
+                if hold is None:
+                    return SlotHold.objects.create(
+                        memorial_room_id=room_id, scheduled_at=scheduled_at, held_by=user, expires_at=expires_at
+                    )
+                hold.memorial_room_id = room_id
+                hold.scheduled_at = scheduled_at
+                hold.expires_at = expires_at
+                hold.save(update_fields=['memorial_room', 'scheduled_at', 'expires_at'])
+                return hold
+        except IntegrityError:
+            # 같은 시간을 다른 직원이 먼저 선점
+            hold_id = SlotHold.objects.filter(
+                memorial_room_id=room_id, scheduled_at=scheduled_at
+            ).values_list('id', flat=True).first()
+            raise RoomUnavailable(
+                room_id, [Booking(None, scheduled_at, scheduled_at + Reservation.DEFAULT_DURATION, hold_id)]
+            )
+
+
+def get_valid_hold(token, room_id: int, scheduled_at: datetime, user, now: datetime = None) -> SlotHold:
+    """
+    user가 room_id/scheduled_at에 잡은 만료되지 않은 선점을 반환합니다. 없으면 InvalidHold를 발생시킵니다.
+    (lock_room으로 추모실을 잠근 트랜잭션 안에서 호출)
+    """
+    now = now or timezone.now()
+    hold = SlotHold.objects.filter(
+        token=token, held_by=user, memorial_room_id=room_id, scheduled_at=scheduled_at, expires_at__gt=now
+    ).first()
+    if hold is None:
+        raise InvalidHold(token)
+    return hold
+
+
+def consume_hold(hold: SlotHold) -> bool:
+    """예약 생성에 사용한 선점을 삭제합니다. (get_valid_hold와 같은 트랜잭션 안에서 호출)"""
+    return SlotHold.objects.filter(pk=hold.pk).delete()[0] > 0
+
+
+def release_hold(token, user) -> bool:
+    """자신의 선점을 취소합니다."""
+    return SlotHold.objects.filter(token=token, held_by=user).delete()[0] > 0
+
+
+def expire_holds(now: datetime = None) -> int:
+    """만료된 선점을 일괄 삭제하고 삭제한 수를 반환합니다."""
+    now = now or timezone.now()
+    return SlotHold.objects.filter(expires_at__lte=now).delete()[0]
@@ -0,0 +1,76 @@
+"""
+스케줄러 작업 실행 이력 정리
+
+DjangoJobStore를 사용하면 django_apscheduler가 작업을 실행할 때마다 DjangoJobExecution 행을
+남기므로 이력이 계속 쌓입니다. 보관 기간(settings.SCHEDULER_JOB_HISTORY_DAYS, 기본 7일)이 지난
+행은 작업/날짜별 실행 횟수와 소요 시간(JobExecutionSummary)으로 합친 뒤 삭제합니다.
+스케줄러 리더가 매일 한 번 실행합니다. (reservations/scheduler.py 참고)
+"""
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django_apscheduler.models import DjangoJobExecution
+
+from .models import JobExecutionSummary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DAYS = 7
+
+
+def get_history_days() -> int:
+    return getattr(settings, 'SCHEDULER_JOB_HISTORY_DAYS', DEFAULT_HISTORY_DAYS)
+
+
+def rollup_job_executions(keep_days: int = None, now: datetime = None) -> int:
+    """
+    keep_days보다 오래된 실행 이력을 일별 집계에 더하고 삭제합니다. 삭제한 행 수를 반환합니다.
+    같은 날짜의 집계가 이미 있으면(여러 번 실행한 경우) 값을 누적합니다.
+    """
+    keep_days = get_history_days() if keep_days is None else keep_days
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=keep_days)
+
+    with transaction.atomic():
+        old = DjangoJobExecution.objects.filter(run_time__lt=cutoff)
+        rows = list(
+            old.annotate(date=TruncDate('run_time')).order_by().values('job_id', 'date').annotate(
+                runs=Count('id'),
+                errors=Count('id', filter=Q(status=DjangoJobExecution.ERROR)),
+                missed=Count('id', filter=Q(status=DjangoJobExecution.MISSED)),
+                total_duration=Sum('duration'),
+                max_duration=Max('duration'),
+            )
+        )
+        for row in rows:
+            total_duration = float(row['total_duration'] or 0)
+            max_duration = float(row['max_duration'] or 0)
+            summary, created = JobExecutionSummary.objects.select_for_update().get_or_create(
+                job_id=row['job_id'],
+                date=row['date'],
+                defaults={
+                    'runs': row['runs'],
+                    'errors': row['errors'],
+                    'missed': row['missed'],
+                    'total_duration': total_duration,
+                    'max_duration': max_duration,
+                }
+            )
+            if not created:
+                JobExecutionSummary.objects.filter(pk=summary.pk).update(
+                    runs=F('runs') + row['runs'],
+                    errors=F('errors') + row['errors'],
+                    missed=F('missed') + row['missed'],
+                    total_duration=F('total_duration') + total_duration,
+                    max_duration=max(summary.max_duration, max_duration),
+                )
+        deleted, _ = old.delete()
+
+    if deleted:
+        logger.info(f"Rolled up {deleted} job executions older than {cutoff} into {len(rows)} daily summaries")
+    return deleted
@@ -0,0 +1,39 @@
+"""
+리더 작업 저장소
+
+DjangoJobStore는 연결될 때 스케줄러 전체에 실행 이력 리스너를 등록하고 분리할 때 제거하지 않습니다.
+그대로 쓰면 메모리 저장소의 하트비트 작업이 실행될 때마다 "Job 'scheduler_heartbeat' no longer exists!"
+경고가 남고, 리더를 잃었다가 다시 될 때마다 리스너가 한 벌씩 늘어납니다.
+
+LeaderJobStore는 리스너가 이 저장소의 작업 이벤트만 기록하게 하고, 저장소를 분리할 때
+(scheduler.remove_jobstore → shutdown) 함께 제거합니다.
+(django_apscheduler 모델을 불러오므로 앱 로딩 후에 import합니다.)
+"""
+from apscheduler import events
+from django_apscheduler.jobstores import DjangoJobStore
+
+
+class LeaderJobStore(DjangoJobStore):
+    _listeners = ()
+
+    def register_event_listeners(self):
+        self._listeners = [
+            (self._only_own_jobs(self.handle_submission_event),
+             events.EVENT_JOB_SUBMITTED | events.EVENT_JOB_MAX_INSTANCES),
+            (self._only_own_jobs(self.handle_execution_event), events.EVENT_JOB_EXECUTED),
+            (self._only_own_jobs(self.handle_error_event), events.EVENT_JOB_ERROR | events.EVENT_JOB_MISSED),
+        ]
+        for callback, mask in self._listeners:
+            self._scheduler.add_listener(callback, mask)
+
+    def _only_own_jobs(self, handler):
+        def listener(event):
+            if event.jobstore == self._alias:
+                handler(event)
+        return listener
+
+    def shutdown(self):
+        for callback, _ in self._listeners:
+            self._scheduler.remove_listener(callback)
+        self._listeners = ()
+        super().shutdown()
@@ -0,0 +1,79 @@
+"""
+DB 행 기반 리더 임대(lease)
+
+SchedulerLease 행 하나를 조건부 UPDATE로 획득/갱신합니다.
+- 갱신: 보유자가 자신이고 만료 전이면 만료 시각을 연장
+- 획득: 만료되었거나 보유자가 없으면 보유자를 자신으로 변경
+UPDATE의 WHERE 조건으로 경쟁을 판정하므로 데이터베이스 종류와 관계없이
+동시에 한 프로세스만 임대를 가집니다. 보유자가 갱신하지 못하고 ttl이 지나면
+다른 프로세스가 임대를 넘겨받습니다.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import SchedulerLease
+
+
+def acquire_lease(name: str, holder: str, ttl: timedelta, now: datetime = None) -> bool:
+    """임대를 갱신하거나 획득합니다. 임대를 가지고 있으면 True를 반환합니다."""
+    now = now or timezone.now()
+    leases = SchedulerLease.objects.filter(name=name)
+
+    renewed = leases.filter(holder=holder, expires_at__gte=now).update(
+        renewed_at=now, expires_at=now + ttl
+    )
+    if renewed:
+        return True
+
+    acquired = leases.filter(
+        Q(expires_at__isnull=True) | Q(expires_at__lt=now) | Q(holder='')
+    ).update(holder=holder, acquired_at=now, renewed_at=now, expires_at=now + ttl)
+    if acquired:
+        return True
+
+    if leases.exists():
+        return False
+    try:
+        with transaction.atomic():
+            SchedulerLease.objects.create(
+                name=name, holder=holder, acquired_at=now, renewed_at=now, expires_at=now + ttl
+            )
+        return True
+    except IntegrityError:
+        # 다른 프로세스가 먼저 생성
+        return False
+
+
+def release_lease(name: str, holder: str) -> None:
+    """자신이 가진 임대를 즉시 만료시켜 다른 프로세스가 바로 넘겨받을 수 있게 합니다."""
+    SchedulerLease.objects.filter(name=name, holder=holder).update(holder='', expires_at=None)
+
+
+def get_lease(name: str) -> Optional[SchedulerLease]:
+    return SchedulerLease.objects.filter(name=name).first()
+
+
+def request_wakeup(name: str, wake_at: datetime) -> None:
+    """리더가 아닌 프로세스에서 리더에게 wake_at까지 작업을 실행하도록 요청합니다."""
+    SchedulerLease.objects.filter(name=name).filter(
+        Q(wake_at__isnull=True) | Q(wake_at__gt=wake_at)
+    ).update(wake_at=wake_at)
+
+
+def publish_metrics(name: str, holder: str, metrics: dict) -> None:
+    """리더가 작업 지표 스냅샷을 기록해 다른 프로세스에서도 조회할 수 있게 합니다."""
+    SchedulerLease.objects.filter(name=name, holder=holder).update(metrics=metrics)
+
+
+def pop_wakeup(name: str, holder: str) -> Optional[datetime]:
+    """리더가 요청된 재예약 시각을 가져오고 비웁니다."""
+    wake_at = SchedulerLease.objects.filter(
+        name=name, holder=holder, wake_at__isnull=False
+    ).values_list('wake_at', flat=True).first()
+    if wake_at is not None:
+        SchedulerLease.objects.filter(name=name, wake_at=wake_at).update(wake_at=None)
+    return wake_at
@@ -0,0 +1,50 @@
+import time
+
+from cryptography.fernet import Fernet
+from django.core.management.base import BaseCommand
+from reservations.ciphers import CIPHERS, get_cipher
+
+'''
+암호 백엔드별 암호화/복호화 처리량을 측정합니다. (데이터베이스를 사용하지 않음)
+
+  - python manage.py benchmark_ciphers
+  - python manage.py benchmark_ciphers --iterations 50000 --sizes 16 64 1024
+'''
+class Command(BaseCommand):
+    help = '암호 백엔드(fernet, aes-gcm)의 암호화/복호화 처리량을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000, help='크기별 반복 횟수')
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[16, 64, 256, 1024],
+            help='평문 크기(바이트) 목록'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        key = Fernet.generate_key()
+
+        self.stdout.write(
+            f"{'backend':<10} {'size':>6} {'token':>7} {'encrypt/s':>12} {'decrypt/s':>12}"
+        )
+        for size in options['sizes']:
+            plaintext = b'x' * size
+            for name in CIPHERS:
+                cipher = get_cipher(name, key)
+                token_size, encrypt_rate, decrypt_rate = self.measure(cipher, plaintext, iterations)
+                self.stdout.write(
+                    f'{name:<10} {size:>6} {token_size:>7} {encrypt_rate:>12,.0f} {decrypt_rate:>12,.0f}'
+                )
+
+    def measure(self, cipher, plaintext: bytes, iterations: int):
+        started = time.perf_counter()
+        tokens = [cipher.encrypt(plaintext) for _ in range(iterations)]
+        encrypt_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for token in tokens:
+            cipher.decrypt(token)
+        decrypt_elapsed = time.perf_counter() - started
+
+        token_size = len(cipher.prefix) + len(tokens[0])
+        return token_size, iterations / encrypt_elapsed, iterations / decrypt_elapsed
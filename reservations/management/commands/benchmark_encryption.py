@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from reservations.benchmarks import benchmark_fields, benchmark_reservation_pages
+
+'''
+암호화 필드 계층의 비용을 측정합니다.
+
+  - python manage.py benchmark_encryption
+  - python manage.py benchmark_encryption --suite fields --iterations 5000 --sizes 16 256
+  - python manage.py benchmark_encryption --suite pages --page-sizes 20 100 1000
+
+pages 벤치마크는 테스트 데이터를 트랜잭션 안에서 만들고 롤백합니다.
+암호 백엔드 자체의 처리량은 benchmark_ciphers 명령을 사용하세요.
+'''
+class Command(BaseCommand):
+    help = '암호화 필드 암호화/복호화 비용과 예약 목록 페이지 로드 시간을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--suite', choices=['fields', 'pages', 'all'], default='all', help='실행할 벤치마크')
+        parser.add_argument('--iterations', type=int, default=2000, help='필드 벤치마크 반복 횟수')
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[16, 64, 256, 1024],
+            help='필드 벤치마크 평문 크기(바이트) 목록'
+        )
+        parser.add_argument(
+            '--page-sizes', type=int, nargs='+', default=[20, 100, 1000],
+            help='예약 목록 페이지 크기 목록'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='페이지 벤치마크 반복 횟수 (최솟값 사용)')
+
+    def handle(self, *args, **options):
+        if options['suite'] in ('fields', 'all'):
+            self.stdout.write(self.style.MIGRATE_HEADING('필드별 암호화/복호화'))
+            self.stdout.write(
+                f"{'field':<32} {'mode':<9} {'size':>6} {'stored':>7} "
+                f"{'enc us':>8} {'dec us':>8} {'dec/s':>10}"
+            )
+            for row in benchmark_fields(options['iterations'], options['sizes']):
+                self.stdout.write(
+                    f"{row['field']:<32} {row['mode']:<9} {row['size']:>6} {row['stored_size']:>7} "
+                    f"{row['encrypt_us']:>8.1f} {row['decrypt_us']:>8.1f} {row['decrypt_per_sec']:>10,.0f}"
+                )
+
+        if options['suite'] in ('pages', 'all'):
+            self.stdout.write(self.style.MIGRATE_HEADING('예약 목록 페이지 로드'))
+            self.stdout.write(
+                f"{'rows':>6} {'total ms':>10} {'ms/row':>8} {'decrypts':>9} "
+                f"{'hits':>6} {'crypto ms':>10} {'crypto %':>9}"
+            )
+            for row in benchmark_reservation_pages(options['page_sizes'], options['repeat']):
+                self.stdout.write(
+                    f"{row['rows']:>6} {row['total_ms']:>10.1f} {row['per_row_ms']:>8.2f} {row['decrypts']:>9} "
+                    f"{row['cache_hits']:>6} {row['crypto_ms']:>10.1f} {row['crypto_share']:>8.1f}%"
+                )
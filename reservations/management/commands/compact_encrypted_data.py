@@ -0,0 +1,72 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models
+from reservations.fields import EncryptedField, compact_stored_value, raw_column
+
+'''
+기존 형식(base64 이중 인코딩)으로 저장된 암호화 필드를 압축 형식('f1:' + Fernet 토큰)으로 변환합니다.
+복호화/재암호화 없이 저장 형식만 바꾸므로 키가 필요 없고, 여러 번 실행해도 안전합니다.
+
+  - python manage.py compact_encrypted_data
+  - python manage.py compact_encrypted_data --batch-size 1000 --dry-run
+
+주의사항:
+1. 모든 서버가 압축 형식을 읽을 수 있는 버전으로 배포된 후에 실행하세요.
+2. 변환 전에 데이터베이스를 백업해두세요.
+'''
+class Command(BaseCommand):
+    help = '암호화 필드를 압축 저장 형식으로 변환합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 처리할 레코드 수')
+        parser.add_argument('--dry-run', action='store_true', help='변환 대상 수만 확인합니다.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        for model in apps.get_models():
+            fields = [
+                field for field in model._meta.concrete_fields
+                if isinstance(field, EncryptedField)
+            ]
+            if not fields:
+                continue
+
+            converted = self.compact_model(model, fields, batch_size, dry_run)
+            self.stdout.write(f'{model._meta.label}: {converted}건 변환')
+
+        self.stdout.write(self.style.SUCCESS('암호화 필드 저장 형식 변환이 완료되었습니다.'))
+
+    def compact_model(self, model, fields, batch_size, dry_run) -> int:
+        rows = model.objects.order_by('pk').values_list(
+            'pk', *[raw_column(field.attname) for field in fields]
+        )
+        converted = 0
+        batch = []
+        for pk, *values in rows.iterator(chunk_size=batch_size):
+            compacted = [
+                compact_stored_value(value) if value is not None else None
+                for value in values
+            ]
+            if compacted == values:
+                continue
+
+            instance = model(pk=pk)
+            for field, value in zip(fields, compacted):
+                # Value로 감싸 저장 값을 다시 암호화하지 않고 그대로 기록합니다.
+                setattr(instance, field.attname, models.Value(value, output_field=models.TextField()))
+            batch.append(instance)
+
+            if len(batch) >= batch_size:
+                converted += self.flush(model, fields, batch, dry_run)
+                batch = []
+
+        if batch:
+            converted += self.flush(model, fields, batch, dry_run)
+        return converted
+
+    def flush(self, model, fields, batch, dry_run) -> int:
+        if not dry_run:
+            model.objects.bulk_update(batch, [field.attname for field in fields])
+        return len(batch)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from reservations.slots import rebuild_slot_ledger
+
+'''
+예약 시간대 장부(ReservationSlot)의 예약 수를 예약 데이터로 다시 계산합니다.
+
+  - python manage.py rebuild_slot_ledger
+
+update()나 관리자 화면 외의 경로로 예약을 직접 수정해 장부가 어긋난 경우에 사용합니다.
+'''
+class Command(BaseCommand):
+    help = '예약 시간대 장부의 예약 수를 예약 데이터로 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        count = rebuild_slot_ledger()
+        self.stdout.write(self.style.SUCCESS(f'{count}개 시간대의 예약 수를 다시 계산했습니다.'))
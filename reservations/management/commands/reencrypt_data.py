@@ -1,17 +1,43 @@
-from django.core.management.base import BaseCommand
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 from django.conf import settings
-from cryptography.fernet import Fernet
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from reservations.ciphers import get_cipher_name
+from reservations.fields import (
+    BlindIndexField, DataKeyField, EncryptedField, raw_column, reencrypt_stored_values,
+    rewrap_envelope_rows
+)
 from reservations.models import Customer, Pet
-import base64
+from reservations.search import get_searchable_fields, replace_search_tokens
 
 '''
 1. 먼저 새로운 암호화 키를 생성합니다:
   - python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
 2. 기존 데이터를 새로운 키로 재암호화합니다:
-  - python manage.py reencrypt_data --old-key [기존_키] --new-key [새로운_키]
+  - python manage.py reencrypt_data --old-key=[기존_키] --new-key=[새로운_키]
+    (키가 '-'로 시작할 수 있으므로 '=' 형식으로 전달하세요.)
+  - 옵션: --batch-size 1000 --workers 4
 3. .env 파일의 ENCRYPTION_KEY를 새로운 키로 업데이트합니다.
 4. 서버를 재시작합니다.
 
+동작 방식:
+- 레코드를 pk 순서로 batch-size 단위씩 나누어 읽습니다. (전체를 메모리에 올리지 않음)
+- 복호화/재암호화는 --workers 개의 프로세스에서 병렬로 처리하고, bulk_update로 일괄 저장합니다.
+- 배치가 저장될 때마다 마지막 pk를 체크포인트 파일(--checkpoint)에 기록합니다.
+  중단된 경우 같은 명령을 다시 실행하면 체크포인트 이후부터 이어서 처리합니다. (--reset으로 처음부터)
+- BLIND_INDEX_KEY를 따로 설정하지 않았다면 블라인드 인덱스/검색 토큰도 새 키 기준으로 다시 계산합니다.
+- 봉투 암호화 모델(DataKeyField)은 행별 데이터 키만 새 키로 다시 감쌉니다.
+  마스터 키로 암호화된 기존 값이 남아 있으면 이때 데이터 키로 다시 암호화합니다.
+  (--old-key와 --new-key를 같게 주면 키 교체 없이 봉투 암호화 형식으로만 변환합니다.)
+  BLIND_INDEX_KEY를 설정해 두면 암호화 필드를 복호화/재기록하지 않으므로
+  처리량이 필드 크기와 무관하게 행 수에만 비례합니다.
+
 주의사항:
 1. 키 변경 전에 반드시 데이터베이스를 백업해두세요.
 2. 키 변경 작업은 서비스 중단 시간에 수행하는 것이 좋습니다.
@@ -22,71 +48,176 @@ class Command(BaseCommand):
     help = '기존 데이터를 새로운 키로 재암호화합니다.'
 
     def add_arguments(self, parser):
-        parser.add_argument('--old-key', type=str, required=True, help='기존 암호화 키')
-        parser.add_argument('--new-key', type=str, required=True, help='새로운 암호화 키')
+        # required=True로 두면 call_command가 값을 별도 인자로 넘겨 '-'로 시작하는 키를 옵션으로
+        # 해석하므로, 필수 여부는 handle에서 확인합니다.
+        parser.add_argument('--old-key', type=str, help='기존 암호화 키 (필수)')
+        parser.add_argument('--new-key', type=str, help='새로운 암호화 키 (필수)')
+        parser.add_argument('--batch-size', type=int, default=500, help='배치당 레코드 수')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='암호화 작업 프로세스 수')
+        parser.add_argument(
+            '--checkpoint', type=str, default='reencrypt_checkpoint.json',
+            help='진행 상황을 기록할 체크포인트 파일'
+        )
+        parser.add_argument('--reset', action='store_true', help='체크포인트를 무시하고 처음부터 실행합니다.')
 
     def handle(self, *args, **options):
-        old_key = options['old_key'].encode()
-        new_key = options['new_key'].encode()
-
-        old_fernet = Fernet(old_key)
-        new_fernet = Fernet(new_key)
+        if not options['old_key'] or not options['new_key']:
+            raise CommandError('--old-key와 --new-key는 필수입니다.')
+        self.old_key = options['old_key'].encode()
+        self.new_key = options['new_key'].encode()
+        self.batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = self.load_checkpoint(options['reset'])
+        # 다시 암호화하는 값은 현재 설정된 암호 백엔드(ENCRYPTED_FIELD_CIPHER)로 저장합니다.
+        self.cipher = get_cipher_name()
+        # 블라인드 인덱스 키가 ENCRYPTION_KEY에서 파생되는 경우 인덱스도 다시 계산해야 합니다.
+        self.rebuild_indexes = not getattr(settings, 'BLIND_INDEX_KEY', None)
 
         self.stdout.write('데이터 재암호화를 시작합니다...')
 
-        # Customer 모델 데이터 재암호화
-        for customer in Customer.objects.all():
-            try:
-                # 기존 암호화된 데이터 가져오기
-                encrypted_name = base64.b64decode(customer.name)
-                encrypted_phone = base64.b64decode(customer.phone)
-                encrypted_email = base64.b64decode(customer.email) if customer.email else None
-                encrypted_address = base64.b64decode(customer.address) if customer.address else None
-
-                # 기존 키로 복호화
-                name = old_fernet.decrypt(encrypted_name).decode()
-                phone = old_fernet.decrypt(encrypted_phone).decode()
-                email = old_fernet.decrypt(encrypted_email).decode() if encrypted_email else ''
-                address = old_fernet.decrypt(encrypted_address).decode() if encrypted_address else ''
-
-                # 새 키로 암호화
-                customer.name = base64.b64encode(new_fernet.encrypt(name.encode())).decode()
-                customer.phone = base64.b64encode(new_fernet.encrypt(phone.encode())).decode()
-                if email:
-                    customer.email = base64.b64encode(new_fernet.encrypt(email.encode())).decode()
-                if address:
-                    customer.address = base64.b64encode(new_fernet.encrypt(address.encode())).decode()
-
-                customer.save()
-                self.stdout.write(f'고객 ID {customer.id} 재암호화 완료')
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'고객 ID {customer.id} 처리 중 오류: {str(e)}'))
-
-        # Pet 모델 데이터 재암호화
-        for pet in Pet.objects.all():
-            try:
-                # 기존 암호화된 데이터 가져오기
-                encrypted_name = base64.b64decode(pet.name)
-                encrypted_species = base64.b64decode(pet.species) if pet.species else None
-                encrypted_breed = base64.b64decode(pet.breed) if pet.breed else None
-
-                # 기존 키로 복호화
-                name = old_fernet.decrypt(encrypted_name).decode()
-                species = old_fernet.decrypt(encrypted_species).decode() if encrypted_species else ''
-                breed = old_fernet.decrypt(encrypted_breed).decode() if encrypted_breed else ''
-
-                # 새 키로 암호화
-                pet.name = base64.b64encode(new_fernet.encrypt(name.encode())).decode()
-                if species:
-                    pet.species = base64.b64encode(new_fernet.encrypt(species.encode())).decode()
-                if breed:
-                    pet.breed = base64.b64encode(new_fernet.encrypt(breed.encode())).decode()
-
-                pet.save()
-                self.stdout.write(f'반려동물 ID {pet.id} 재암호화 완료')
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'반려동물 ID {pet.id} 처리 중 오류: {str(e)}'))
-
-        self.stdout.write(self.style.SUCCESS('모든 데이터 재암호화가 완료되었습니다.')) 
\ No newline at end of file
+        workers = max(options['workers'], 1)
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        started = time.monotonic()
+        total = 0
+        try:
+            for model in (Customer, Pet):
+                total += self.reencrypt_model(model, executor, workers)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        elapsed = time.monotonic() - started
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'모든 데이터 재암호화가 완료되었습니다. '
+            f'({total}건, {elapsed:.1f}초, {total / elapsed if elapsed else 0:.0f} rows/sec)'
+        ))
+
+    def reencrypt_model(self, model, executor, workers) -> int:
+        label = model._meta.label
+        fields = [field for field in model._meta.concrete_fields if isinstance(field, EncryptedField)]
+        data_key_field = next(
+            (field for field in model._meta.concrete_fields if isinstance(field, DataKeyField)), None
+        )
+        index_fields = [
+            field for field in model._meta.concrete_fields if isinstance(field, BlindIndexField)
+        ] if self.rebuild_indexes else []
+        search_fields = get_searchable_fields(model) if self.rebuild_indexes else []
+        last_pk = self.checkpoint['models'].get(label, 0)
+
+        key_columns = [raw_column(data_key_field.attname)] if data_key_field else []
+        rows = model.objects.order_by('pk').values_list(
+            'pk', *key_columns, *[raw_column(field.attname) for field in fields]
+        )
+
+        processed = 0
+        started = time.monotonic()
+        pending = deque()
+
+        def flush_one():
+            nonlocal processed
+            batch_last_pk, future = pending.popleft()
+            results, skipped, failed = future.result() if executor else future
+            if data_key_field is None:
+                results = [
+                    (pk, None, encrypted, True, plaintexts) for pk, encrypted, plaintexts in results
+                ]
+            self.write_batch(model, fields, data_key_field, index_fields, search_fields, results)
+            for pk in failed:
+                self.stdout.write(self.style.ERROR(f'{label} ID {pk} 처리 중 오류: 기존 키로 복호화할 수 없습니다.'))
+            processed += len(results) + len(skipped) + len(failed)
+            self.save_checkpoint(label, batch_last_pk)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{label}: {processed}건 처리 (마지막 ID {batch_last_pk}, '
+                f'{processed / elapsed if elapsed else 0:.0f} rows/sec)'
+            )
+
+        # pk 기준 키셋 페이지네이션으로 배치를 읽습니다.
+        # (MySQL 드라이버는 iterator()도 결과 전체를 메모리에 올리므로 사용하지 않습니다.)
+        while True:
+            page = list(rows.filter(pk__gt=last_pk)[:self.batch_size])
+            if not page:
+                break
+            if data_key_field:
+                batch = [(pk, wrapped, values) for pk, wrapped, *values in page]
+                worker = rewrap_envelope_rows
+            else:
+                batch = [(pk, values) for pk, *values in page]
+                worker = reencrypt_stored_values
+            last_pk = page[-1][0]
+            pending.append((last_pk, self.submit(executor, worker, batch, bool(index_fields or search_fields))))
+            # 작업 프로세스가 쉬지 않도록 일정 수의 배치를 미리 제출해 둡니다.
+            if len(pending) >= workers * 2:
+                flush_one()
+        while pending:
+            flush_one()
+
+        return processed
+
+    def submit(self, executor, worker, batch, with_plaintext):
+        args = (self.old_key, self.new_key, batch, with_plaintext, self.cipher)
+        if executor is None:
+            return worker(*args)
+        return executor.submit(worker, *args)
+
+    def write_batch(self, model, fields, data_key_field, index_fields, search_fields, results):
+        """
+        results: (pk, 새 데이터 키, [저장 값, ...], 값 변경 여부, [평문, ...] 또는 None) 목록
+        암호화 필드 값이 하나도 바뀌지 않은 배치는 데이터 키 컬럼만 기록합니다.
+        """
+        if not results:
+            return
+
+        write_fields = any(changed for _, _, _, changed, _ in results)
+        update_fields = [field.attname for field in index_fields]
+        if data_key_field:
+            update_fields.append(data_key_field.attname)
+        if write_fields:
+            update_fields.extend(field.attname for field in fields)
+
+        field_positions = {field.name: position for position, field in enumerate(fields)}
+        instances = []
+        for pk, wrapped, stored, _, plaintexts in results:
+            instance = model(pk=pk)
+            # Value로 감싸 새 키로 암호화된 값을 그대로 기록합니다.
+            if data_key_field:
+                setattr(instance, data_key_field.attname, models.Value(wrapped, output_field=models.TextField()))
+            if write_fields:
+                for field, value in zip(fields, stored):
+                    setattr(instance, field.attname, models.Value(value, output_field=models.TextField()))
+            for index_field in index_fields:
+                plaintext = plaintexts[field_positions[index_field.source]]
+                setattr(instance, index_field.attname, index_field.digest(plaintext, master_key=self.new_key))
+            instances.append(instance)
+
+        with transaction.atomic():
+            model.objects.bulk_update(instances, update_fields)
+            if search_fields:
+                replace_search_tokens(search_fields, {
+                    pk: [plaintexts[field_positions[field.name]] for field in search_fields]
+                    for pk, _, _, _, plaintexts in results
+                }, master_key=self.new_key)
+
+    def key_fingerprint(self) -> str:
+        return hashlib.sha256(self.old_key + b':' + self.new_key).hexdigest()[:16]
+
+    def load_checkpoint(self, reset: bool) -> dict:
+        empty = {'key_fingerprint': self.key_fingerprint(), 'models': {}}
+        if reset or not os.path.exists(self.checkpoint_path):
+            return empty
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('key_fingerprint') != empty['key_fingerprint']:
+            self.stdout.write(self.style.WARNING('체크포인트의 키가 일치하지 않아 처음부터 실행합니다.'))
+            return empty
+        self.stdout.write(f"체크포인트에서 이어서 실행합니다: {checkpoint['models']}")
+        return checkpoint
+
+    def save_checkpoint(self, label: str, last_pk: int) -> None:
+        self.checkpoint['models'][label] = last_pk
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
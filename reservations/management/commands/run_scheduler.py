@@ -0,0 +1,28 @@
+import signal
+
+from django.core.management.base import BaseCommand
+from reservations.scheduler import run_scheduler
+
+'''
+예약 상태 전환 등 주기 작업을 실행하는 전용 스케줄러 프로세스입니다.
+
+  - python manage.py run_scheduler
+
+관리 명령에서는 SCHEDULER_AUTOSTART 값과 관계없이 앱 로드 시 스케줄러를 시작하지 않으므로
+(reservations/apps.py) 이 프로세스에는 아래 스케줄러 하나만 실행됩니다.
+웹 프로세스는 SCHEDULER_AUTOSTART=false(기본)로 실행해 스케줄러를 띄우지 않습니다.
+여러 개를 띄워도 임대를 가진 한 프로세스만 작업을 실행하고, 나머지는 대기하다가
+리더가 멈추면 넘겨받습니다. (reservations/scheduler.py 참고)
+'''
+class Command(BaseCommand):
+    help = '예약 상태 전환 등 주기 작업을 실행하는 스케줄러 프로세스를 시작합니다.'
+
+    def handle(self, *args, **options):
+        # docker stop 등의 SIGTERM도 Ctrl+C와 같이 임대를 반납하고 종료합니다.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self.stdout.write('스케줄러를 시작합니다. (종료: Ctrl+C)')
+        try:
+            run_scheduler()
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS('스케줄러를 종료했습니다.'))
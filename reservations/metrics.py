@@ -0,0 +1,179 @@
+"""
+스케줄러 작업 지표
+
+APScheduler 이벤트로 작업별 지표를 프로세스 메모리에 기록합니다.
+- 지연(lag): 예정 실행 시각과 실제 시작 시각의 차이
+- 소요 시간(duration)
+- 처리 건수(rows): 작업 함수가 반환한 {이름: 건수} dict를 누적 (check_reservation_status 참고)
+- 오류(errors), 누락(missed), 이전 실행과 겹침(overlaps), 겹쳐서 건너뜀(skipped)
+
+작업이 끝날 때마다 요약을 로그로 남기고, 지연이 settings.SCHEDULER_LAG_WARNING(초, 기본 60)을
+넘으면 경고합니다. 리더 프로세스는 하트비트마다 스냅샷을 임대 행에 기록하므로
+웹 프로세스에서도 /api/v1/reservations/scheduler-metrics/로 조회할 수 있습니다.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from apscheduler import events
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAG_WARNING = 60
+
+
+class JobMetrics:
+    """작업 하나의 누적 지표"""
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.missed = 0
+        self.skipped = 0
+        self.overlaps = 0
+        self.running = 0
+        self.last_scheduled_at: Optional[datetime] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        self.last_error = ''
+        self.rows = {}
+
+    def as_dict(self) -> dict:
+        finished = self.runs or 1
+        return {
+            'runs': self.runs,
+            'errors': self.errors,
+            'missed': self.missed,
+            'skipped': self.skipped,
+            'overlaps': self.overlaps,
+            'running': self.running,
+            'last_scheduled_at': self.last_scheduled_at.isoformat() if self.last_scheduled_at else None,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_lag': round(self.last_lag, 3),
+            'max_lag': round(self.max_lag, 3),
+            'avg_lag': round(self.total_lag / finished, 3),
+            'last_duration': round(self.last_duration, 3),
+            'max_duration': round(self.max_duration, 3),
+            'avg_duration': round(self.total_duration / finished, 3),
+            'last_error': self.last_error,
+            'rows': dict(self.rows),
+        }
+
+
+class MetricsRegistry:
+    """작업 ID별 JobMetrics 모음 (스케줄러 스레드에서 동시에 갱신되므로 잠금 사용)"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def _job(self, job_id: str) -> JobMetrics:
+        return self._jobs.setdefault(job_id, JobMetrics())
+
+    def job_started(self, job_id: str, scheduled_at: datetime, started_at: datetime = None) -> float:
+        """작업 시작을 기록하고 지연(초)을 반환합니다."""
+        started_at = started_at or timezone.now()
+        lag = max((started_at - scheduled_at).total_seconds(), 0.0)
+        with self._lock:
+            metrics = self._job(job_id)
+            if metrics.running:
+                metrics.overlaps += 1
+            metrics.running += 1
+            metrics.last_scheduled_at = scheduled_at
+            metrics.last_started_at = started_at
+            metrics.last_lag = lag
+            metrics.max_lag = max(metrics.max_lag, lag)
+            metrics.total_lag += lag
+            self._started[(job_id, scheduled_at)] = started_at
+        return lag
+
+    def job_finished(self, job_id: str, scheduled_at: datetime, retval=None, exception=None,
+                     finished_at: datetime = None) -> JobMetrics:
+        finished_at = finished_at or timezone.now()
+        with self._lock:
+            metrics = self._job(job_id)
+            started_at = self._started.pop((job_id, scheduled_at), None)
+            if started_at is not None:
+                metrics.running = max(metrics.running - 1, 0)
+                duration = (finished_at - started_at).total_seconds()
+                metrics.last_duration = duration
+                metrics.max_duration = max(metrics.max_duration, duration)
+                metrics.total_duration += duration
+            metrics.runs += 1
+            if exception is not None:
+                metrics.errors += 1
+                metrics.last_error = str(exception)
+            if isinstance(retval, dict):
+                for name, count in retval.items():
+                    metrics.rows[name] = metrics.rows.get(name, 0) + count
+            return metrics
+
+    def job_missed(self, job_id: str) -> None:
+        with self._lock:
+            self._job(job_id).missed += 1
+
+    def job_skipped(self, job_id: str) -> None:
+        with self._lock:
+            self._job(job_id).skipped += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {job_id: metrics.as_dict() for job_id, metrics in self._jobs.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+            self._started.clear()
+
+
+registry = MetricsRegistry()
+
+
+def get_lag_warning() -> timedelta:
+    return timedelta(seconds=getattr(settings, 'SCHEDULER_LAG_WARNING', DEFAULT_LAG_WARNING))
+
+
+def handle_job_event(event) -> None:
+    """APScheduler 작업 이벤트를 지표로 기록합니다."""
+    if event.code == events.EVENT_JOB_SUBMITTED:
+        for scheduled_at in event.scheduled_run_times:
+            lag = registry.job_started(event.job_id, scheduled_at)
+            if lag > get_lag_warning().total_seconds():
+                logger.warning(f"Job {event.job_id} started {lag:.1f}s late (scheduled at {scheduled_at})")
+    elif event.code == events.EVENT_JOB_MAX_INSTANCES:
+        registry.job_skipped(event.job_id)
+        logger.warning(f"Job {event.job_id} skipped: previous run still in progress")
+    elif event.code == events.EVENT_JOB_MISSED:
+        registry.job_missed(event.job_id)
+        logger.warning(f"Job {event.job_id} missed its run time {event.scheduled_run_time}")
+    else:
+        metrics = registry.job_finished(
+            event.job_id, event.scheduled_run_time, retval=event.retval, exception=event.exception
+        )
+        reports_rows = isinstance(event.retval, dict)
+        rows = ', '.join(f'{name}={count}' for name, count in event.retval.items()) if reports_rows else '-'
+        # 처리 건수를 보고하지 않는 작업(하트비트 등)은 자주 실행되므로 DEBUG로 남깁니다.
+        level = logging.INFO if reports_rows or event.exception is not None else logging.DEBUG
+        logger.log(
+            level,
+            f"Job {event.job_id} finished: lag={metrics.last_lag:.3f}s "
+            f"duration={metrics.last_duration:.3f}s rows=[{rows}] runs={metrics.runs} "
+            f"errors={metrics.errors} overlaps={metrics.overlaps} skipped={metrics.skipped}"
+        )
+
+
+def register_listeners(scheduler) -> None:
+    scheduler.add_listener(
+        handle_job_event,
+        events.EVENT_JOB_SUBMITTED | events.EVENT_JOB_MAX_INSTANCES | events.EVENT_JOB_MISSED
+        | events.EVENT_JOB_EXECUTED | events.EVENT_JOB_ERROR
+    )
@@ -0,0 +1,38 @@
+import logging
+import time
+
+from .decrypt_cache import decrypt_cache
+
+logger = logging.getLogger('reservations')
+
+
+class DecryptCacheMiddleware:
+    """
+    요청마다 복호화 캐시를 열고 통계를 응답 헤더와 로그로 남깁니다.
+    - X-Decrypt-Cache: 캐시 적중/미스 횟수
+    - X-Crypto-Time: 실제 암호화/복호화 횟수와 누적 소요 시간
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with decrypt_cache() as cache:
+            started = time.perf_counter()
+            response = self.get_response(request)
+            elapsed = time.perf_counter() - started
+
+        stats = cache.stats()
+        if stats['hits'] or stats['misses']:
+            response['X-Decrypt-Cache'] = f"hits={stats['hits']}, misses={stats['misses']}"
+        crypto = cache.crypto_stats()
+        if crypto['decrypts'] or crypto['encrypts']:
+            response['X-Crypto-Time'] = (
+                f"decrypts={crypto['decrypts']}, encrypts={crypto['encrypts']}, "
+                f"time={crypto['crypto_ms']}ms"
+            )
+            logger.debug(
+                f"{request.method} {request.path}: {cache.summary()} "
+                f"(전체 {elapsed * 1000:.1f}ms 중 {cache.crypto_time / elapsed * 100 if elapsed else 0:.1f}%)"
+            )
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:02
+
+import reservations.fields
+from django.db import migrations
+
+
+def fill_blind_indexes(apps, schema_editor):
+    """기존 고객 데이터의 블라인드 인덱스를 채웁니다."""
+    Customer = apps.get_model("reservations", "Customer")
+    phone_index = Customer._meta.get_field("phone_index")
+    email_index = Customer._meta.get_field("email_index")
+
+    batch = []
+    for customer in Customer.objects.iterator(chunk_size=500):
+        customer.phone_index = phone_index.digest(customer.phone)
+        customer.email_index = email_index.digest(customer.email)
+        batch.append(customer)
+        if len(batch) >= 500:
+            Customer.objects.bulk_update(batch, ["phone_index", "email_index"])
+            batch = []
+    if batch:
+        Customer.objects.bulk_update(batch, ["phone_index", "email_index"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0016_alter_customer_address_alter_customer_email_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="email_index",
+            field=reservations.fields.BlindIndexField(
+                normalizer=reservations.fields.normalize_email, source="email"
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="phone_index",
+            field=reservations.fields.BlindIndexField(
+                normalizer=reservations.fields.normalize_phone, source="phone"
+            ),
+        ),
+        migrations.RunPython(fill_blind_indexes, migrations.RunPython.noop),
+    ]
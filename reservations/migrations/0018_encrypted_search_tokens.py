@@ -0,0 +1,101 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:03
+
+import reservations.fields
+from django.db import migrations, models
+
+
+def build_search_tokens(apps, schema_editor):
+    """기존 고객/반려동물 데이터의 검색 토큰을 생성합니다."""
+    from reservations.search import get_searchable_fields, update_search_tokens
+
+    EncryptedSearchToken = apps.get_model("reservations", "EncryptedSearchToken")
+    for model_name in ("Customer", "Pet"):
+        model = apps.get_model("reservations", model_name)
+        fields = get_searchable_fields(model)
+        for instance in model.objects.iterator(chunk_size=500):
+            update_search_tokens(instance, fields, token_model=EncryptedSearchToken)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0017_customer_blind_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="email",
+            field=reservations.fields.EncryptedEmailField(
+                blank=True,
+                max_length=254,
+                null=True,
+                search_index="email",
+                verbose_name="이메일",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="name",
+            field=reservations.fields.EncryptedCharField(
+                max_length=100, search_index="ngram", verbose_name="고객명"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="phone",
+            field=reservations.fields.EncryptedCharField(
+                max_length=20, search_index="phone", verbose_name="전화번호"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="breed",
+            field=reservations.fields.EncryptedCharField(
+                blank=True,
+                max_length=100,
+                null=True,
+                search_index="ngram",
+                verbose_name="품종",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="name",
+            field=reservations.fields.EncryptedCharField(
+                max_length=100, search_index="ngram", verbose_name="반려동물명"
+            ),
+        ),
+        migrations.CreateModel(
+            name="EncryptedSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=100, verbose_name="검색 범위")),
+                ("object_id", models.BigIntegerField(verbose_name="대상 ID")),
+                ("token", models.CharField(max_length=32, verbose_name="토큰")),
+            ],
+            options={
+                "verbose_name": "검색 토큰",
+                "verbose_name_plural": "검색 토큰 목록",
+                "indexes": [
+                    models.Index(
+                        fields=["scope", "token", "object_id"],
+                        name="reservation_scope_41585e_idx",
+                    ),
+                    models.Index(
+                        fields=["scope", "object_id"],
+                        name="reservation_scope_144f2d_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_search_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:04
+
+import reservations.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0018_encrypted_search_tokens"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="address",
+            field=reservations.fields.EncryptedTextField(
+                blank=True, lazy=True, null=True, verbose_name="주소"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="email",
+            field=reservations.fields.EncryptedEmailField(
+                blank=True,
+                lazy=True,
+                max_length=254,
+                null=True,
+                search_index="email",
+                verbose_name="이메일",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="name",
+            field=reservations.fields.EncryptedCharField(
+                lazy=True, max_length=100, search_index="ngram", verbose_name="고객명"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="customer",
+            name="phone",
+            field=reservations.fields.EncryptedCharField(
+                lazy=True, max_length=20, search_index="phone", verbose_name="전화번호"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="breed",
+            field=reservations.fields.EncryptedCharField(
+                blank=True,
+                lazy=True,
+                max_length=100,
+                null=True,
+                search_index="ngram",
+                verbose_name="품종",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="name",
+            field=reservations.fields.EncryptedCharField(
+                lazy=True,
+                max_length=100,
+                search_index="ngram",
+                verbose_name="반려동물명",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="species",
+            field=reservations.fields.EncryptedCharField(
+                blank=True, lazy=True, max_length=50, null=True, verbose_name="종"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:10
+
+import reservations.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0019_encrypted_fields_lazy_decrypt"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="data_key",
+            field=reservations.fields.DataKeyField(),
+        ),
+        migrations.AddField(
+            model_name="pet",
+            name="data_key",
+            field=reservations.fields.DataKeyField(),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:12
+
+import reservations.fields
+from django.db import migrations, models
+from reservations.fields import (
+    decrypt_stored_value,
+    encrypt_deterministic,
+    encrypt_value,
+    raw_column,
+)
+
+FIELDS = ["species", "breed"]
+
+
+def _convert(apps, encrypt):
+    Pet = apps.get_model("reservations", "Pet")
+    rows = Pet.objects.order_by("pk").values_list(
+        "pk", raw_column("data_key"), *[raw_column(name) for name in FIELDS]
+    )
+
+    batch = []
+    for pk, data_key, *values in rows.iterator(chunk_size=500):
+        pet = Pet(pk=pk)
+        for name, value in zip(FIELDS, values):
+            if value is not None:
+                value = encrypt(decrypt_stored_value(value, data_key))
+            # Value로 감싸 변환한 저장 값을 그대로 기록합니다.
+            setattr(pet, name, models.Value(value, output_field=models.TextField()))
+        batch.append(pet)
+        if len(batch) >= 500:
+            Pet.objects.bulk_update(batch, FIELDS)
+            batch = []
+    if batch:
+        Pet.objects.bulk_update(batch, FIELDS)
+
+
+def encrypt_species_breed(apps, schema_editor):
+    """기존 종/품종 값을 결정적 암호화 형식으로 변환합니다."""
+    _convert(apps, encrypt_deterministic)
+
+
+def decrypt_species_breed(apps, schema_editor):
+    _convert(apps, encrypt_value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0020_envelope_data_keys"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pet",
+            name="breed",
+            field=reservations.fields.DeterministicEncryptedCharField(
+                blank=True,
+                max_length=100,
+                null=True,
+                search_index="ngram",
+                verbose_name="품종",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="species",
+            field=reservations.fields.DeterministicEncryptedCharField(
+                blank=True, max_length=50, null=True, verbose_name="종"
+            ),
+        ),
+        migrations.RunPython(encrypt_species_breed, decrypt_species_breed),
+    ]
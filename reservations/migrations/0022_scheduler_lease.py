@@ -0,0 +1,65 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0021_deterministic_pet_species_breed"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchedulerLease",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=100, unique=True, verbose_name="이름"),
+                ),
+                (
+                    "holder",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="보유 프로세스"
+                    ),
+                ),
+                (
+                    "acquired_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="획득일시"
+                    ),
+                ),
+                (
+                    "renewed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="갱신일시"
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="만료일시"
+                    ),
+                ),
+                (
+                    "wake_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="작업 재예약 요청 시각"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "스케줄러 임대",
+                "verbose_name_plural": "스케줄러 임대 목록",
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0022_scheduler_lease"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobExecutionSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job_id", models.CharField(max_length=255, verbose_name="작업 ID")),
+                ("date", models.DateField(verbose_name="날짜")),
+                (
+                    "runs",
+                    models.PositiveIntegerField(default=0, verbose_name="실행 횟수"),
+                ),
+                (
+                    "errors",
+                    models.PositiveIntegerField(default=0, verbose_name="오류 횟수"),
+                ),
+                (
+                    "missed",
+                    models.PositiveIntegerField(default=0, verbose_name="누락 횟수"),
+                ),
+                (
+                    "total_duration",
+                    models.FloatField(default=0, verbose_name="총 소요 시간(초)"),
+                ),
+                (
+                    "max_duration",
+                    models.FloatField(default=0, verbose_name="최대 소요 시간(초)"),
+                ),
+            ],
+            options={
+                "verbose_name": "작업 실행 일별 집계",
+                "verbose_name_plural": "작업 실행 일별 집계 목록",
+                "ordering": ["-date", "job_id"],
+                "unique_together": {("job_id", "date")},
+            },
+        ),
+    ]
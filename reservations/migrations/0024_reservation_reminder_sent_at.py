@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0023_job_execution_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reservation",
+            name="reminder_sent_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="사전 알림 발송일시"
+            ),
+        ),
+    ]
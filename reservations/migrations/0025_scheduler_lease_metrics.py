@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0024_reservation_reminder_sent_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="schedulerlease",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict, verbose_name="작업 지표"),
+        ),
+    ]
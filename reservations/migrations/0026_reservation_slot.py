@@ -0,0 +1,72 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:43
+
+from collections import Counter
+from datetime import time
+
+import pytz
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_reservation_slots(apps, schema_editor):
+    """기존 예약(취소 제외)으로 시간대별 예약 수를 채웁니다."""
+    Reservation = apps.get_model("reservations", "Reservation")
+    ReservationSlot = apps.get_model("reservations", "ReservationSlot")
+    kst = pytz.timezone("Asia/Seoul")
+    capacity = getattr(settings, "RESERVATION_SLOT_CAPACITY", 3)
+
+    counts = Counter()
+    scheduled_ats = (
+        Reservation.objects.exclude(status="cancelled")
+        .filter(scheduled_at__isnull=False)
+        .values_list("scheduled_at", flat=True)
+    )
+    for scheduled_at in scheduled_ats.iterator():
+        local = timezone.localtime(scheduled_at, kst)
+        counts[(local.date(), time(local.hour, local.minute - local.minute % 30))] += 1
+    ReservationSlot.objects.bulk_create(
+        [
+            ReservationSlot(date=slot_date, time=slot_time, booked=count, capacity=capacity)
+            for (slot_date, slot_time), count in counts.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0025_scheduler_lease_metrics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="날짜")),
+                ("time", models.TimeField(verbose_name="시간")),
+                (
+                    "booked",
+                    models.PositiveIntegerField(default=0, verbose_name="예약 수"),
+                ),
+                ("capacity", models.PositiveIntegerField(verbose_name="정원")),
+            ],
+            options={
+                "verbose_name": "예약 시간대",
+                "verbose_name_plural": "예약 시간대 목록",
+                "ordering": ["date", "time"],
+                "unique_together": {("date", "time")},
+            },
+        ),
+        migrations.RunPython(fill_reservation_slots, migrations.RunPython.noop),
+    ]
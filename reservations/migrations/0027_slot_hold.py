@@ -0,0 +1,74 @@
+# Generated by Django 5.1.5 on 2026-10-17 00:52
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memorial_rooms", "0004_room_schedule"),
+        ("reservations", "0026_reservation_slot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlotHold",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        unique=True,
+                        verbose_name="선점 토큰",
+                    ),
+                ),
+                ("scheduled_at", models.DateTimeField(verbose_name="예약일시")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="생성일"),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(db_index=True, verbose_name="만료일시"),
+                ),
+                (
+                    "held_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slot_holds",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="선점한 직원",
+                    ),
+                ),
+                (
+                    "memorial_room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slot_holds",
+                        to="memorial_rooms.memorialroom",
+                        verbose_name="추모실",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "예약 선점",
+                "verbose_name_plural": "예약 선점 목록",
+                "ordering": ["expires_at"],
+                "unique_together": {("memorial_room", "scheduled_at")},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-17 01:03
+
+import reservations.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0027_slot_hold"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pet",
+            name="breed",
+            field=reservations.fields.DeterministicEncryptedCharField(
+                blank=True,
+                db_index=True,
+                lazy=True,
+                max_length=100,
+                null=True,
+                search_index="ngram",
+                verbose_name="품종",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="pet",
+            name="species",
+            field=reservations.fields.DeterministicEncryptedCharField(
+                blank=True,
+                db_index=True,
+                lazy=True,
+                max_length=50,
+                null=True,
+                verbose_name="종",
+            ),
+        ),
+    ]
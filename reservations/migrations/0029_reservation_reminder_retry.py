@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-17 01:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0028_pet_species_breed_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reservation",
+            name="reminder_attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0, verbose_name="사전 알림 실패 횟수"
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservation",
+            name="reminder_retry_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="사전 알림 재시도 일시"
+            ),
+        ),
+    ]
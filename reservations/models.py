@@ -1,19 +1,30 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from funeral.models import FuneralPackage, PremiumLine, AdditionalOption
 from memorial_rooms.models import MemorialRoom
 from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal
-from .fields import EncryptedCharField, EncryptedTextField, EncryptedEmailField
+import uuid
+from utils.field_tracker import FieldTrackerMixin
+from .fields import (
+    EncryptedCharField, EncryptedTextField, EncryptedEmailField,
+    DeterministicEncryptedCharField, BlindIndexField, DataKeyField, normalize_phone, normalize_email
+)
 
 
 class Customer(models.Model):
     """고객 정보를 관리하는 모델"""
-    name = EncryptedCharField(_('고객명'), max_length=100)
-    phone = EncryptedCharField(_('전화번호'), max_length=20)
-    email = EncryptedEmailField(_('이메일'), blank=True, null=True)
-    address = EncryptedTextField(_('주소'), blank=True, null=True)
+    name = EncryptedCharField(_('고객명'), max_length=100, lazy=True, search_index='ngram')
+    phone = EncryptedCharField(_('전화번호'), max_length=20, lazy=True, search_index='phone')
+    email = EncryptedEmailField(_('이메일'), blank=True, null=True, lazy=True, search_index='email')
+    address = EncryptedTextField(_('주소'), blank=True, null=True, lazy=True)
+    # 암호화 필드 일치 검색용 블라인드 인덱스
+    phone_index = BlindIndexField(source='phone', normalizer=normalize_phone)
+    email_index = BlindIndexField(source='email', normalizer=normalize_email)
+    # 암호화 필드용 행별 데이터 키 (마스터 키로 감싸 저장)
+    data_key = DataKeyField()
     created_at = models.DateTimeField(_('생성일'), auto_now_add=True)
     updated_at = models.DateTimeField(_('수정일'), auto_now=True)
 
@@ -50,9 +61,16 @@ class Pet(models.Model):
         related_name='pets',
         verbose_name=_('고객')
     )
-    name = EncryptedCharField(_('반려동물명'), max_length=100)
-    species = EncryptedCharField(_('종'), max_length=50, blank=True, null=True)
-    breed = EncryptedCharField(_('품종'), max_length=100, blank=True, null=True)
+    name = EncryptedCharField(_('반려동물명'), max_length=100, lazy=True, search_index='ngram')
+    # 종/품종은 필터링과 통계를 위해 결정적 암호화로 저장합니다.
+    species = DeterministicEncryptedCharField(
+        _('종'), max_length=50, blank=True, null=True, db_index=True, lazy=True
+    )
+    breed = DeterministicEncryptedCharField(
+        _('품종'), max_length=100, blank=True, null=True, db_index=True, lazy=True, search_index='ngram'
+    )
+    # 암호화 필드용 행별 데이터 키 (마스터 키로 감싸 저장)
+    data_key = DataKeyField()
     age = models.IntegerField(_('나이'), blank=True, null=True)
     weight = models.DecimalField(
         _('체중'), 
@@ -92,7 +110,7 @@ class Pet(models.Model):
         return f"반려동물 {self.id}"  # 보안을 위해 ID만 표시
 
 
-class Reservation(models.Model):
+class Reservation(FieldTrackerMixin, models.Model):
     """예약 정보를 관리하는 모델"""
     STATUS_PENDING = 'pending'
     STATUS_CONFIRMED = 'confirmed'
@@ -108,6 +126,9 @@ class Reservation(models.Model):
         (STATUS_CANCELLED, '취소'),
     ]
 
+    # 예약 1건의 기본 진행 시간 (예약 시간으로부터 이 시간이 지나면 자동 완료 처리)
+    DEFAULT_DURATION = timedelta(hours=2)
+
     VISIT_ROUTE_CHOICES = [
         ('internet', '인터넷'),
         ('blog', '블로그'),
@@ -180,6 +201,9 @@ class Reservation(models.Model):
     # 예약 상태 및 일정
     scheduled_at = models.DateTimeField(_('예약일시'), blank=True, null=True)
     completed_at = models.DateTimeField(_('완료일시'), blank=True, null=True)
+    reminder_sent_at = models.DateTimeField(_('사전 알림 발송일시'), blank=True, null=True)
+    reminder_attempts = models.PositiveSmallIntegerField(_('사전 알림 실패 횟수'), default=0)
+    reminder_retry_at = models.DateTimeField(_('사전 알림 재시도 일시'), blank=True, null=True)
     is_blocked = models.BooleanField(_('블록 처리 여부'), default=False)
     block_end_time = models.DateTimeField(_('블록 종료 시간'), blank=True, null=True)
     status = models.CharField(
@@ -299,19 +323,47 @@ class Reservation(models.Model):
     def __str__(self) -> str:
         return f"{self.customer.name} - {self.pet.name} ({self.get_status_display()})"
 
-    def save(self, *args, **kwargs):
-        is_status_completed = False
-        if self.pk:
-            old_instance = Reservation.objects.get(pk=self.pk)
-            if old_instance.status != self.STATUS_COMPLETED and self.status == self.STATUS_COMPLETED:
-                is_status_completed = True
-
-        super().save(*args, **kwargs)
+    def save(self, *args, check_capacity=False, **kwargs):
+        """
+        check_capacity=True이면 예약 시간대 정원이 찬 경우 slots.SlotFull을 발생시킵니다.
+        (예약 생성/수정/일정 변경 API에서 사용)
+        """
+        from .slots import get_slot_change, move_slot
+
+        # 일정이 바뀌면 새 일정 기준으로 사전 알림을 다시 보냅니다.
+        if not self._state.adding and self.has_changed('scheduled_at'):
+            self.reminder_sent_at = None
+            self.reminder_attempts = 0
+            self.reminder_retry_at = None
+
+        # 불러온 값과 비교하므로 기존 상태를 다시 조회하지 않습니다. (FieldTrackerMixin)
+        is_status_completed = (
+            not self._state.adding
+            and self.status == self.STATUS_COMPLETED
+            and self.get_loaded_value('status') != self.STATUS_COMPLETED
+        )
+
+        slot_change = get_slot_change(self)
+        if slot_change is None:
+            super().save(*args, **kwargs)
+        else:
+            # 시간대 장부와 예약을 함께 저장합니다.
+            with transaction.atomic():
+                move_slot(*slot_change, check_capacity=check_capacity)
+                super().save(*args, **kwargs)
 
         # 상태가 완료로 변경될 때 재고 처리
         if is_status_completed:
             self.process_inventory_usage()
 
+    def delete(self, *args, **kwargs):
+        from .slots import release_slots
+
+        with transaction.atomic():
+            if self.get_loaded_value('status') != self.STATUS_CANCELLED:
+                release_slots([self.get_loaded_value('scheduled_at')])
+            return super().delete(*args, **kwargs)
+
     def process_inventory_usage(self):
         """예약 완료 시 사용된 재고를 처리합니다."""
         from inventory.models import StockMovement
@@ -437,6 +489,123 @@ class MemorialRoom(models.Model):
         return f"{self.name} ({self.get_current_status_display()})"
 
 
+class EncryptedSearchToken(models.Model):
+    """암호화 필드 부분 검색용 HMAC 토큰 (reservations.search 참고)"""
+    scope = models.CharField(_('검색 범위'), max_length=100)
+    object_id = models.BigIntegerField(_('대상 ID'))
+    token = models.CharField(_('토큰'), max_length=32)
+
+    class Meta:
+        verbose_name = _('검색 토큰')
+        verbose_name_plural = _('검색 토큰 목록')
+        indexes = [
+            models.Index(fields=['scope', 'token', 'object_id']),
+            models.Index(fields=['scope', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} #{self.object_id}"
+
+
+class SchedulerLease(models.Model):
+    """
+    스케줄러 리더 임대(lease)
+    여러 프로세스 중 임대를 가진 한 프로세스만 예약 작업을 실행합니다. (reservations.leases 참고)
+    """
+    name = models.CharField(_('이름'), max_length=100, unique=True)
+    holder = models.CharField(_('보유 프로세스'), max_length=255, blank=True)
+    acquired_at = models.DateTimeField(_('획득일시'), null=True, blank=True)
+    renewed_at = models.DateTimeField(_('갱신일시'), null=True, blank=True)
+    expires_at = models.DateTimeField(_('만료일시'), null=True, blank=True)
+    wake_at = models.DateTimeField(_('작업 재예약 요청 시각'), null=True, blank=True)
+    metrics = models.JSONField(_('작업 지표'), default=dict, blank=True)
+
+    class Meta:
+        verbose_name = _('스케줄러 임대')
+        verbose_name_plural = _('스케줄러 임대 목록')
+
+    def __str__(self):
+        return f"{self.name} ({self.holder or '없음'})"
+
+
+class JobExecutionSummary(models.Model):
+    """
+    스케줄러 작업 실행 이력 일별 집계
+    보관 기간이 지난 DjangoJobExecution 행은 작업/날짜별 실행 횟수와 소요 시간으로 합쳐지고 삭제됩니다.
+    (reservations.job_history 참고)
+    """
+    job_id = models.CharField(_('작업 ID'), max_length=255)
+    date = models.DateField(_('날짜'))
+    runs = models.PositiveIntegerField(_('실행 횟수'), default=0)
+    errors = models.PositiveIntegerField(_('오류 횟수'), default=0)
+    missed = models.PositiveIntegerField(_('누락 횟수'), default=0)
+    total_duration = models.FloatField(_('총 소요 시간(초)'), default=0)
+    max_duration = models.FloatField(_('최대 소요 시간(초)'), default=0)
+
+    class Meta:
+        verbose_name = _('작업 실행 일별 집계')
+        verbose_name_plural = _('작업 실행 일별 집계 목록')
+        ordering = ['-date', 'job_id']
+        unique_together = ['job_id', 'date']
+
+    def __str__(self):
+        return f"{self.job_id} {self.date} ({self.runs}회)"
+
+
+class ReservationSlot(models.Model):
+    """
+    예약 시간대(30분)별 예약 수 장부
+    예약 생성/일정 변경/취소 시 booked를 조건부 UPDATE로 증감하므로 예약 가능 시간 조회가
+    행 하나씩의 인덱스 조회로 끝나고, 정원이 찬 시간대의 예약은 DB에서 거절됩니다. (reservations.slots 참고)
+    """
+    date = models.DateField(_('날짜'))
+    time = models.TimeField(_('시간'))
+    booked = models.PositiveIntegerField(_('예약 수'), default=0)
+    capacity = models.PositiveIntegerField(_('정원'))
+
+    class Meta:
+        verbose_name = _('예약 시간대')
+        verbose_name_plural = _('예약 시간대 목록')
+        ordering = ['date', 'time']
+        unique_together = ['date', 'time']
+
+    def __str__(self):
+        return f"{self.date} {self.time:%H:%M} ({self.booked}/{self.capacity})"
+
+
+class SlotHold(models.Model):
+    """
+    예약 입력 중 추모실/시간 임시 선점
+    직원이 예약을 입력하는 동안 같은 추모실/시간을 다른 직원이 예약하지 못하도록 짧은 시간 동안
+    선점합니다. 예약 생성 시 token으로 소비되고, 만료된 선점은 일괄 삭제됩니다. (reservations.holds 참고)
+    """
+    token = models.UUIDField(_('선점 토큰'), default=uuid.uuid4, unique=True, editable=False)
+    memorial_room = models.ForeignKey(
+        'memorial_rooms.MemorialRoom',
+        on_delete=models.CASCADE,
+        related_name='slot_holds',
+        verbose_name=_('추모실')
+    )
+    scheduled_at = models.DateTimeField(_('예약일시'))
+    held_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='slot_holds',
+        verbose_name=_('선점한 직원')
+    )
+    created_at = models.DateTimeField(_('생성일'), auto_now_add=True)
+    expires_at = models.DateTimeField(_('만료일시'), db_index=True)
+
+    class Meta:
+        verbose_name = _('예약 선점')
+        verbose_name_plural = _('예약 선점 목록')
+        ordering = ['expires_at']
+        unique_together = ['memorial_room', 'scheduled_at']
+
+    def __str__(self):
+        return f"{self.memorial_room_id} {self.scheduled_at} (~{self.expires_at})"
+
+
 # 예약에 사용된 재고 아이템을 관리하는 중간 모델
 class ReservationInventoryItem(models.Model):
     reservation = models.ForeignKey(
@@ -0,0 +1,381 @@
+"""
+예약 상태 전환 스케줄러
+
+1분마다 전체 예약을 확인하는 대신, 다음 상태 전환 시각을 조회해 그 시각에 한 번만
+check_reservation_status를 실행합니다.
+
+다음 전환 시각 (모두 ['status', 'scheduled_at'] 인덱스의 첫 행만 읽음)
+- 확정 예약의 예약 시간 (확정 → 진행중, 추모실 사용중)
+- 추모실이 지정된 확정 예약의 예약 시간 - 기본 진행 시간 (추모실 예약중)
+- 진행중 예약의 예약 시간 + 기본 진행 시간 (진행중 → 완료, 추모실 사용가능)
+- 사전 알림을 보내지 않은 확정 예약의 예약 시간 - 알림 시점 (사전 알림, cron.dispatch_reminders)
+  전송에 실패한 예약은 재시도 시각(reminder_retry_at)
+
+예약이 생성/변경되면(signals.py) 더 이른 전환 시각이 생겼는지 확인해 작업을 다시 예약합니다.
+추모실이 지정된 예약이 취소되거나 추모실/시간이 바뀌면 추모실 상태를 갱신하도록 바로 실행합니다.
+update()처럼 시그널이 발생하지 않는 변경을 놓치지 않도록
+settings.RESERVATION_SCHEDULER_MAX_IDLE(기본 30분)보다 오래 쉬지는 않습니다.
+
+리더 선출
+gunicorn 등으로 여러 프로세스가 뜨면 모든 프로세스가 스케줄러를 시작하지만, 예약 작업은
+SchedulerLease 임대를 가진 리더 프로세스만 실행합니다. 각 프로세스는 메모리 작업 저장소의
+하트비트 작업으로 임대를 갱신/획득하고, 리더가 되면 작업 저장소를 연결해 작업을 예약합니다.
+리더가 멈춰 임대가 만료(settings.SCHEDULER_LEASE_TTL, 기본 30초)되면 다른 프로세스가
+넘겨받습니다. 리더가 아닌 프로세스에서 생긴 예약 변경은 임대 행의 wake_at으로 전달되어
+리더의 다음 하트비트에 반영됩니다.
+
+실행 방식
+- settings.SCHEDULER_AUTOSTART가 True이면 ReservationsConfig.ready()에서 프로세스마다
+  백그라운드 스케줄러를 시작합니다. (개발 서버 등 단일 프로세스 환경)
+  runserver 외의 관리 명령에서는 시작하지 않습니다. (reservations/apps.py)
+- 운영에서는 SCHEDULER_AUTOSTART=False(기본)로 웹 프로세스에서 스케줄러를 끄고
+  python manage.py run_scheduler 전용 프로세스가 모든 주기 작업을 실행합니다.
+  웹 프로세스의 예약 변경은 위의 wake_at으로 전달됩니다.
+
+작업 저장소 (settings.SCHEDULER_JOBSTORE)
+- 'django'(기본): DjangoJobStore. 작업 정의와 실행 이력(DjangoJobExecution)이 DB에 남습니다.
+  실행 이력 리스너는 리더 저장소의 작업에만 연결하고 물러날 때 함께 제거합니다. (reservations/jobstores.py)
+  보관 기간이 지난 실행 이력은 매일 일별 집계로 합쳐집니다. (reservations/job_history.py)
+- 'memory': 작업 정의를 메모리에만 둡니다. 작업 저장소를 DB에서 폴링하지 않고 실행 이력도
+  남기지 않습니다. 작업은 리더가 될 때마다 다시 예약되고, 상태 전환 시각은 예약 데이터에서
+  다시 계산하므로 재시작해도 놓치는 전환은 없습니다.
+"""
+import atexit
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .cron import check_reservation_status, get_reminder_lead
+from .job_history import rollup_job_executions
+from .leases import acquire_lease, pop_wakeup, publish_metrics, release_lease, request_wakeup
+from .metrics import register_listeners, registry
+from .models import Reservation
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = 'check_reservation_status'
+HEARTBEAT_JOB_ID = 'scheduler_heartbeat'
+JOB_HISTORY_JOB_ID = 'rollup_job_executions'
+LEASE_NAME = 'reservation-scheduler'
+# 리더만 연결하는 작업 저장소 이름 (하트비트는 기본 메모리 저장소 사용)
+LEADER_JOBSTORE = 'leader'
+DEFAULT_MAX_IDLE = timedelta(minutes=30)
+DEFAULT_LEASE_TTL = timedelta(seconds=30)
+# 실행 중인 작업이 끝나기 전에 다음 실행이 겹치지 않도록 두는 최소 간격
+MIN_DELAY = timedelta(seconds=1)
+
+_scheduler = None
+_is_leader = False
+_next_run_at: Optional[datetime] = None
+_lock = threading.Lock()
+_holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def get_max_idle() -> timedelta:
+    max_idle = getattr(settings, 'RESERVATION_SCHEDULER_MAX_IDLE', DEFAULT_MAX_IDLE)
+    return max_idle if isinstance(max_idle, timedelta) else timedelta(seconds=max_idle)
+
+
+def get_lease_ttl() -> timedelta:
+    ttl = getattr(settings, 'SCHEDULER_LEASE_TTL', DEFAULT_LEASE_TTL)
+    return ttl if isinstance(ttl, timedelta) else timedelta(seconds=ttl)
+
+
+def is_leader() -> bool:
+    return _is_leader
+
+
+def _first_scheduled_at(**filters) -> Optional[datetime]:
+    return Reservation.objects.filter(
+        scheduled_at__isnull=False, **filters
+    ).order_by('scheduled_at').values_list('scheduled_at', flat=True).first()
+
+
+def get_next_due_at(now: datetime = None) -> Optional[datetime]:
+    """다음 상태 전환 시각을 반환합니다. 전환할 예약이 없으면 None을 반환합니다."""
+    now = now or timezone.now()
+    duration = Reservation.DEFAULT_DURATION
+    candidates = []
+
+    next_start = _first_scheduled_at(status=Reservation.STATUS_CONFIRMED)
+    if next_start:
+        candidates.append(next_start)
+
+    next_reserve = _first_scheduled_at(
+        status=Reservation.STATUS_CONFIRMED,
+        memorial_room__isnull=False,
+        scheduled_at__gt=now + duration
+    )
+    if next_reserve:
+        candidates.append(next_reserve - duration)
+
+    next_end = _first_scheduled_at(status=Reservation.STATUS_IN_PROGRESS)
+    if next_end:
+        candidates.append(next_end + duration)
+
+    lead = get_reminder_lead()
+    if lead:
+        next_reminder = _first_scheduled_at(
+            status=Reservation.STATUS_CONFIRMED,
+            reminder_sent_at__isnull=True,
+            reminder_retry_at__isnull=True,
+            scheduled_at__gt=now
+        )
+        if next_reminder:
+            candidates.append(next_reminder - lead)
+
+        # 전송에 실패한 알림은 지금이 아니라 재시도 시각에 다시 보냅니다.
+        next_retry = Reservation.objects.filter(
+            status=Reservation.STATUS_CONFIRMED,
+            reminder_sent_at__isnull=True,
+            reminder_retry_at__isnull=False,
+            scheduled_at__gt=now
+        ).order_by('reminder_retry_at').values_list('scheduled_at', 'reminder_retry_at').first()
+        if next_retry:
+            scheduled_at, retry_at = next_retry
+            candidates.append(max(scheduled_at - lead, retry_at))
+
+    return min(candidates) if candidates else None
+
+
+def get_reservation_due_at(reservation, now: datetime = None) -> Optional[datetime]:
+    """예약 한 건의 다음 전환 시각 (쿼리 없이 계산)"""
+    if not reservation.scheduled_at:
+        return None
+    now = now or timezone.now()
+    duration = Reservation.DEFAULT_DURATION
+    if reservation.status == Reservation.STATUS_IN_PROGRESS:
+        return reservation.scheduled_at + duration
+    if reservation.status == Reservation.STATUS_CONFIRMED:
+        candidates = [reservation.scheduled_at]
+        reserve_at = reservation.scheduled_at - duration
+        if reservation.memorial_room_id and reserve_at > now:
+            candidates.append(reserve_at)
+        lead = get_reminder_lead()
+        if lead and reservation.reminder_sent_at is None and reservation.scheduled_at > now:
+            remind_at = reservation.scheduled_at - lead
+            if reservation.reminder_retry_at is not None:
+                remind_at = max(remind_at, reservation.reminder_retry_at)
+            candidates.append(remind_at)
+        return min(candidates)
+    return None
+
+
+def schedule_at(run_at: datetime) -> None:
+    """상태 체크 작업을 run_at에 한 번 실행하도록 예약합니다."""
+    global _next_run_at
+    if _scheduler is None or not _is_leader:
+        return
+    with _lock:
+        _scheduler.add_job(
+            run_due_transitions,
+            'date',
+            run_date=run_at,
+            id=JOB_ID,
+            name=JOB_ID,
+            jobstore=LEADER_JOBSTORE,
+            replace_existing=True,
+            coalesce=True,
+            max_instances=2,
+            misfire_grace_time=None,  # 서버가 멈춰 있던 동안 지난 전환도 실행
+        )
+        _next_run_at = run_at
+    logger.debug(f"Next reservation status check scheduled at {run_at}")
+
+
+def schedule_next(now: datetime = None) -> datetime:
+    """다음 전환 시각(최대 대기 시간 이내)에 작업을 예약하고 그 시각을 반환합니다."""
+    now = now or timezone.now()
+    run_at = now + get_max_idle()
+    due_at = get_next_due_at(now)
+    if due_at is not None:
+        run_at = min(run_at, max(due_at, now + MIN_DELAY))
+    schedule_at(run_at)
+    return run_at
+
+
+def affects_room_status(reservation) -> bool:
+    """
+    저장한 예약이 추모실 상태(예약중/사용중/사용가능)를 바로 바꿀 수 있는지 확인합니다.
+    추모실이 지정된 예약이 확정/진행중 상태에 들어오거나 벗어난 경우(취소 등), 또는 추모실/예약 시간이
+    바뀐 경우입니다. 불러온 값(FieldTrackerMixin)과 비교하므로 post_save 시그널에서 호출합니다.
+    """
+    active = (Reservation.STATUS_CONFIRMED, Reservation.STATUS_IN_PROGRESS)
+    if getattr(reservation, '_loaded_values', None) is None:
+        # 새로 만든 예약
+        return bool(reservation.memorial_room_id) and reservation.status in active
+    if not (reservation.memorial_room_id or reservation.get_loaded_value('memorial_room')):
+        return False
+    was_active = reservation.get_loaded_value('status') in active
+    is_active = reservation.status in active
+    if was_active != is_active:
+        return True
+    return is_active and (reservation.has_changed('memorial_room') or reservation.has_changed('scheduled_at'))
+
+
+def notify_reservation_changed(reservation, rooms_changed: bool = False) -> None:
+    """예약이 생성/변경된 후 더 이른 전환 시각이 생겼으면 작업을 앞당깁니다."""
+    notify_reservations_changed([reservation], rooms_changed=rooms_changed)
+
+
+def notify_reservations_changed(reservations, rooms_changed: bool = False) -> None:
+    """
+    여러 예약이 변경된 후(일괄 상태 변경 등) 가장 이른 전환 시각으로 작업을 앞당깁니다.
+    예약 시간/상태/추모실 값만 사용하므로 저장되지 않은 인스턴스를 넘겨도 됩니다.
+    rooms_changed=True이면(추모실이 지정된 예약의 취소 등) 추모실 상태를 갱신하도록 바로 실행합니다.
+    """
+    now = timezone.now()
+    due_ats = [get_reservation_due_at(reservation, now) for reservation in reservations]
+    due_ats = [due_at for due_at in due_ats if due_at is not None]
+    if rooms_changed:
+        due_ats.append(now + MIN_DELAY)
+    if not due_ats:
+        return
+    due_at = max(min(due_ats), now + MIN_DELAY)
+    if not _is_leader:
+        # 스케줄러가 없거나 리더가 아닌 프로세스: 리더가 다음 하트비트에 반영합니다.
+        request_wakeup(LEASE_NAME, due_at)
+    elif _next_run_at is None or due_at < _next_run_at:
+        schedule_at(due_at)
+
+
+def run_due_transitions() -> Optional[dict]:
+    """예약 상태를 전환하고 다음 실행 시각을 예약합니다. 처리 건수를 반환합니다. (작업 지표용)"""
+    if not _is_leader:
+        # 임대를 잃은 직후 남아 있던 실행은 건너뜁니다.
+        return None
+    try:
+        return check_reservation_status()
+    finally:
+        schedule_next()
+
+
+def heartbeat() -> None:
+    """임대를 갱신/획득하고 리더 상태 변화에 맞춰 작업 저장소를 연결/해제합니다."""
+    now = timezone.now()
+    try:
+        leader = acquire_lease(LEASE_NAME, _holder, get_lease_ttl(), now)
+    except DatabaseError as e:
+        # 갱신하지 못하면 임대가 만료되어 다른 프로세스가 넘겨받을 수 있으므로 물러납니다.
+        logger.warning(f"Scheduler lease heartbeat failed ({_holder}): {e}")
+        leader = False
+
+    if leader and not _is_leader:
+        become_leader()
+    elif not leader and _is_leader:
+        step_down()
+
+    if _is_leader:
+        wake_at = pop_wakeup(LEASE_NAME, _holder)
+        if wake_at is not None and (_next_run_at is None or wake_at < _next_run_at):
+            schedule_at(max(wake_at, now + MIN_DELAY))
+        publish_metrics(LEASE_NAME, _holder, registry.snapshot())
+
+
+def create_leader_jobstore():
+    if getattr(settings, 'SCHEDULER_JOBSTORE', 'django') == 'memory':
+        from apscheduler.jobstores.memory import MemoryJobStore
+        return MemoryJobStore()
+    from .jobstores import LeaderJobStore
+    return LeaderJobStore()
+
+
+def become_leader() -> None:
+    global _is_leader
+    _scheduler.add_jobstore(create_leader_jobstore(), LEADER_JOBSTORE)
+    _is_leader = True
+    logger.info(f"Scheduler lease '{LEASE_NAME}' acquired by {_holder}")
+    _scheduler.add_job(
+        rollup_job_executions,
+        'cron',
+        hour=4,
+        id=JOB_HISTORY_JOB_ID,
+        name=JOB_HISTORY_JOB_ID,
+        jobstore=LEADER_JOBSTORE,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+    )
+    schedule_at(timezone.now())
+
+
+def step_down() -> None:
+    global _is_leader, _next_run_at
+    _is_leader = False
+    _next_run_at = None
+    try:
+        # DB에 저장된 작업은 지우지 않고 이 프로세스에서만 분리합니다.
+        _scheduler.remove_jobstore(LEADER_JOBSTORE)
+    except KeyError:
+        pass
+    logger.warning(f"Scheduler lease '{LEASE_NAME}' lost by {_holder}")
+
+
+def shutdown() -> None:
+    """프로세스 종료 시 임대를 반납해 다른 프로세스가 바로 리더가 되도록 합니다."""
+    global _is_leader
+    if _scheduler is None:
+        return
+    if _is_leader:
+        _is_leader = False
+        try:
+            release_lease(LEASE_NAME, _holder)
+            logger.info(f"Scheduler lease '{LEASE_NAME}' released by {_holder}")
+        except DatabaseError:
+            pass
+    if _scheduler.running:
+        _scheduler.shutdown(wait=False)
+
+
+def create_scheduler(blocking: bool = False):
+    """리더 임대 하트비트 작업을 등록한 스케줄러를 만듭니다. (시작하지 않음)"""
+    global _scheduler
+    if blocking:
+        from apscheduler.schedulers.blocking import BlockingScheduler as scheduler_class
+    else:
+        from apscheduler.schedulers.background import BackgroundScheduler as scheduler_class
+
+    scheduler = scheduler_class(timezone=settings.TIME_ZONE)
+    register_listeners(scheduler)
+    _scheduler = scheduler
+    scheduler.add_job(
+        heartbeat,
+        'interval',
+        seconds=max(get_lease_ttl().total_seconds() / 3, 1),
+        id=HEARTBEAT_JOB_ID,
+        name=HEARTBEAT_JOB_ID,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=timezone.now(),
+    )
+    atexit.register(shutdown)
+    return scheduler
+
+
+def start_scheduler():
+    """백그라운드 스케줄러를 시작합니다. (ReservationsConfig.ready에서 호출)"""
+    scheduler = create_scheduler()
+    scheduler.start()
+    logger.info(f"Scheduler started ({_holder}), waiting for lease '{LEASE_NAME}'")
+    return scheduler
+
+
+def run_scheduler() -> None:
+    """현재 스레드에서 스케줄러를 실행합니다. 종료될 때까지 반환하지 않습니다. (run_scheduler 명령)"""
+    if _scheduler is not None and _scheduler.running:
+        # 이 프로세스에서 이미 시작된 백그라운드 스케줄러는 멈추고 전용 스케줄러만 실행합니다.
+        shutdown()
+    scheduler = create_scheduler(blocking=True)
+    logger.info(f"Scheduler worker started ({_holder}), waiting for lease '{LEASE_NAME}'")
+    try:
+        scheduler.start()
+    finally:
+        shutdown()
@@ -0,0 +1,171 @@
+"""
+암호화 필드 부분 검색용 토큰 인덱스
+
+평문을 저장하지 않고 검색할 수 있도록 필드 값을 토큰(n-gram, 전화번호 뒷자리 등)으로
+나눈 뒤 keyed-HMAC 다이제스트만 EncryptedSearchToken 테이블에 저장합니다.
+검색어도 같은 방식으로 토큰화하여 인덱스 조인으로 대상 레코드를 찾습니다.
+"""
+import hashlib
+import hmac
+import re
+from typing import Iterable, List, Optional
+
+from django.db.models import Count
+
+from .fields import EncryptedField, get_blind_index_key, normalize_email, normalize_phone
+
+
+class NgramTokenizer:
+    """이름 등 짧은 텍스트용 토크나이저 (1-gram + 2-gram)"""
+
+    def normalize(self, value: str) -> str:
+        return re.sub(r'\s+', '', value).lower()
+
+    def index_tokens(self, value: str) -> set:
+        text = self.normalize(value)
+        tokens = set(text)
+        tokens.update(text[i:i + 2] for i in range(len(text) - 1))
+        return tokens
+
+    def query_tokens(self, term: str) -> List[str]:
+        text = self.normalize(term)
+        if len(text) <= 1:
+            return [text] if text else []
+        return sorted({text[i:i + 2] for i in range(len(text) - 1)})
+
+
+class PhoneTokenizer:
+    """전화번호 토크나이저 (전체 번호, 뒤 4자리)"""
+
+    def index_tokens(self, value: str) -> set:
+        digits = normalize_phone(value)
+        if not digits:
+            return set()
+        return {f'full:{digits}', f'last4:{digits[-4:]}'}
+
+    def query_tokens(self, term: str) -> List[str]:
+        digits = normalize_phone(term)
+        if len(digits) == 4:
+            return [f'last4:{digits}']
+        if len(digits) > 4:
+            return [f'full:{digits}']
+        return []
+
+
+class EmailTokenizer:
+    """이메일 토크나이저 (정규화된 전체 주소 일치)"""
+
+    def index_tokens(self, value: str) -> set:
+        email = normalize_email(value)
+        return {email} if email else set()
+
+    def query_tokens(self, term: str) -> List[str]:
+        email = normalize_email(term)
+        return [email] if '@' in email else []
+
+
+TOKENIZERS = {
+    'ngram': NgramTokenizer(),
+    'phone': PhoneTokenizer(),
+    'email': EmailTokenizer(),
+}
+
+
+def get_search_scope(field) -> str:
+    """토큰 테이블에서 필드를 구분하는 이름 (예: reservations.customer.name)"""
+    return f'{field.model._meta.label_lower}.{field.name}'
+
+
+def token_digest(scope: str, token: str, master_key: bytes = None) -> str:
+    return hmac.new(
+        get_blind_index_key(master_key),
+        f'{scope}\x00{token}'.encode(),
+        hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def get_searchable_fields(model) -> list:
+    """search_index가 지정된 암호화 필드 목록"""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, EncryptedField) and field.search_index
+    ]
+
+
+def build_search_tokens(field, value: Optional[str], master_key: bytes = None) -> set:
+    """필드 값으로부터 저장할 토큰 다이제스트 집합을 만듭니다."""
+    if not value:
+        return set()
+    scope = get_search_scope(field)
+    tokenizer = TOKENIZERS[field.search_index]
+    return {token_digest(scope, token, master_key) for token in tokenizer.index_tokens(str(value))}
+
+
+def build_query_digests(field, term: str) -> List[str]:
+    """검색어를 토큰 다이제스트 목록으로 변환합니다. (모두 일치해야 검색됨)"""
+    scope = get_search_scope(field)
+    tokenizer = TOKENIZERS[field.search_index]
+    return [token_digest(scope, token) for token in tokenizer.query_tokens(term)]
+
+
+def search_object_ids(field, term: str):
+    """
+    검색어의 모든 토큰을 가진 레코드 ID 서브쿼리를 반환합니다.
+    검색어를 토큰화할 수 없으면 None을 반환합니다.
+    """
+    from .models import EncryptedSearchToken
+
+    digests = set(build_query_digests(field, term))
+    if not digests:
+        return None
+    return EncryptedSearchToken.objects.filter(
+        scope=get_search_scope(field),
+        token__in=digests
+    ).values('object_id').annotate(
+        matched=Count('token', distinct=True)
+    ).filter(matched=len(digests)).values('object_id')
+
+
+def update_search_tokens(instance, fields: Optional[Iterable] = None, token_model=None) -> None:
+    """인스턴스의 검색 토큰을 다시 생성합니다."""
+    if token_model is None:
+        from .models import EncryptedSearchToken as token_model
+
+    fields = list(fields) if fields is not None else get_searchable_fields(type(instance))
+    if not fields:
+        return
+
+    scopes = [get_search_scope(field) for field in fields]
+    token_model.objects.filter(scope__in=scopes, object_id=instance.pk).delete()
+    token_model.objects.bulk_create([
+        token_model(scope=scope, object_id=instance.pk, token=digest)
+        for field, scope in zip(fields, scopes)
+        for digest in build_search_tokens(field, getattr(instance, field.attname))
+    ])
+
+
+def replace_search_tokens(fields: list, values_by_pk: dict, master_key: bytes = None) -> None:
+    """
+    여러 레코드의 검색 토큰을 한 번에 교체합니다.
+    values_by_pk: {pk: [평문, ...]} (fields 순서)
+    """
+    from .models import EncryptedSearchToken
+
+    if not fields or not values_by_pk:
+        return
+    scopes = [get_search_scope(field) for field in fields]
+    EncryptedSearchToken.objects.filter(scope__in=scopes, object_id__in=list(values_by_pk)).delete()
+    EncryptedSearchToken.objects.bulk_create([
+        EncryptedSearchToken(scope=scope, object_id=pk, token=digest)
+        for pk, values in values_by_pk.items()
+        for field, scope, value in zip(fields, scopes, values)
+        for digest in build_search_tokens(field, value, master_key)
+    ], batch_size=1000)
+
+
+def delete_search_tokens(instance) -> None:
+    from .models import EncryptedSearchToken
+
+    scopes = [get_search_scope(field) for field in get_searchable_fields(type(instance))]
+    if scopes:
+        EncryptedSearchToken.objects.filter(scope__in=scopes, object_id=instance.pk).delete()
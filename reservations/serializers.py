@@ -14,6 +14,9 @@ from accounts.models import User
 from memorial_rooms.models import MemorialRoom as MemorialRoomModel
 from inventory.models import InventoryItem
 from inventory.serializers import InventoryItemSerializer
+from .availability import ACTIVE_STATUSES, RoomUnavailable, check_room_available, lock_room
+from .holds import InvalidHold, consume_hold, get_valid_hold
+from .slots import SlotFull
 
 
 class CustomerSerializer(serializers.ModelSerializer):
@@ -289,6 +292,8 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True
     )
+    # 예약 입력 전에 받은 추모실/시간 선점 토큰 (slot-holds)
+    hold_token = serializers.UUIDField(required=False, allow_null=True, write_only=True)
 
     class Meta:
         model = Reservation
@@ -299,7 +304,7 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
             'visit_route', 'referral_hospital',
             'need_death_certificate', 'memo', 'created_by',
             'inventory_items', 'weight_surcharge',
-            'discount_type', 'discount_value'
+            'discount_type', 'discount_value', 'hold_token'
         ]
 
     def validate_memorial_room_id(self, value):
@@ -317,13 +322,14 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         additional_options = validated_data.pop('additional_options', [])
         memo = validated_data.pop('memo', '')
         inventory_items_data = validated_data.pop('inventory_items', [])
+        hold_token = validated_data.pop('hold_token', None)
 
         with transaction.atomic():
-            # 고객 생성 또는 조회
-            customer, _ = Customer.objects.get_or_create(
-                phone=customer_data['phone'],
-                defaults=customer_data
-            )
+            # 고객 생성 또는 조회 (phone 조회는 블라인드 인덱스를 사용)
+            # 인덱스 도입 전에 중복 생성된 고객이 있을 수 있으므로 최근 고객을 사용합니다.
+            customer = Customer.objects.filter(phone=customer_data['phone']).first()
+            if customer is None:
+                customer = Customer.objects.create(**customer_data)
 
             # 반려동물 생성
             pet = Pet.objects.create(customer=customer, **pet_data)
@@ -337,15 +343,42 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
                 'memo': memo
             })
             
-            # 추모실이 지정된 경우에만 추가
+            # 추모실이 지정된 경우에만 추가 (같은 시간에 겹치는 예약이나 다른 직원의 선점이 없어야 함)
+            hold = None
             if memorial_room_id:
                 try:
-                    memorial_room = MemorialRoomModel.objects.get(id=memorial_room_id)
+                    memorial_room = lock_room(memorial_room_id)
                     validated_data['memorial_room'] = memorial_room
                 except MemorialRoomModel.DoesNotExist:
                     pass
+                else:
+                    # 자신이 같은 추모실/시간에 잡은 선점만 무시하고 예약 생성 후 삭제합니다.
+                    if hold_token:
+                        try:
+                            hold = get_valid_hold(
+                                hold_token, memorial_room.id, validated_data.get('scheduled_at'),
+                                self.context['request'].user
+                            )
+                        except InvalidHold as e:
+                            raise serializers.ValidationError({"hold_token": [str(e)]})
+                    try:
+                        check_room_available(
+                            memorial_room.id, validated_data.get('scheduled_at'),
+                            exclude_hold=hold.token if hold else None
+                        )
+                    except RoomUnavailable as e:
+                        raise serializers.ValidationError({"memorial_room_id": [str(e)]})
+            if hold_token and hold is None:
+                raise serializers.ValidationError({"hold_token": [str(InvalidHold(hold_token))]})
             
-            reservation = Reservation.objects.create(**validated_data)
+            # 예약 시간대 정원이 찼으면 저장하지 않습니다.
+            reservation = Reservation(**validated_data)
+            try:
+                reservation.save(check_capacity=True)
+            except SlotFull as e:
+                raise serializers.ValidationError({"scheduled_at": [str(e)]})
+            if hold is not None:
+                consume_hold(hold)
 
             # 추가 옵션 연결
             if additional_options:
@@ -486,8 +519,21 @@ class ReservationUpdateSerializer(serializers.ModelSerializer):
             # 기본 필드 업데이트
             for attr, value in validated_data.items():
                 setattr(instance, attr, value)
+
+            # 추모실이나 일정이 바뀌면 겹치는 예약이 없는지 확인
+            if instance.memorial_room_id and instance.status in ACTIVE_STATUSES and (
+                instance.has_changed('memorial_room') or instance.has_changed('scheduled_at')
+            ):
+                lock_room(instance.memorial_room_id)
+                try:
+                    check_room_available(instance.memorial_room_id, instance.scheduled_at, exclude_id=instance.id)
+                except RoomUnavailable as e:
+                    raise serializers.ValidationError({"memorial_room_id": [str(e)]})
             
-            instance.save()
+            try:
+                instance.save(check_capacity=True)
+            except SlotFull as e:
+                raise serializers.ValidationError({"scheduled_at": [str(e)]})
 
             # 상태가 변경된 경우 이력 생성
             if 'status' in validated_data:
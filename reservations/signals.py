@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .fields import Ciphertext
+from .models import Customer, Pet, Reservation
+from .search import get_searchable_fields, update_search_tokens, delete_search_tokens
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Pet)
+def refresh_search_tokens(sender, instance, update_fields=None, raw=False, **kwargs):
+    """암호화 필드가 저장되면 검색 토큰을 갱신합니다."""
+    if raw:
+        return
+    fields = get_searchable_fields(sender)
+    if update_fields is not None:
+        fields = [field for field in fields if field.name in update_fields]
+    # 복호화되지 않은 지연 필드는 값이 바뀌지 않았으므로 토큰도 그대로입니다.
+    fields = [
+        field for field in fields
+        if not isinstance(instance.__dict__.get(field.attname), Ciphertext)
+    ]
+    update_search_tokens(instance, fields)
+
+
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Pet)
+def remove_search_tokens(sender, instance, **kwargs):
+    delete_search_tokens(instance)
+
+
+@receiver(post_save, sender=Reservation)
+def rearm_status_scheduler(sender, instance, raw=False, **kwargs):
+    """예약 생성/일정 변경/취소 후 상태 전환 작업 시각을 다시 확인합니다."""
+    if raw:
+        return
+    # 스케줄러를 실행하지 않는 프로세스가 시그널 등록만으로 스케줄러 모듈을 불러오지 않도록 여기서 import합니다.
+    from .scheduler import affects_room_status, notify_reservation_changed
+
+    # 불러온 값은 save()가 끝난 뒤 갱신되므로 커밋 전에 확인합니다.
+    rooms_changed = affects_room_status(instance)
+    transaction.on_commit(lambda: notify_reservation_changed(instance, rooms_changed=rooms_changed))
@@ -0,0 +1,124 @@
+"""
+예약 시간대(30분) 장부
+
+ReservationSlot 행 하나가 (날짜, 시간대)의 예약 수(booked)와 정원(capacity)을 가집니다.
+취소되지 않은 예약은 예약 시간(KST)이 속한 시간대를 하나 차지합니다.
+
+- 예약 생성/일정 변경/취소/삭제로 시간대가 바뀌면 Reservation.save/delete가 booked를 F() 식
+  UPDATE로 증감하므로 동시에 저장해도 값이 어긋나지 않습니다.
+- check_capacity=True로 저장하면 UPDATE ... WHERE booked < capacity 조건으로 증가시키고,
+  변경된 행이 없으면(정원 초과) SlotFull을 발생시킵니다. 정원 확인과 증가가 한 문장이므로
+  동시에 같은 시간대를 예약해도 정원을 넘지 않습니다.
+- update()로 상태를 바꾸는 일괄 처리는 release_slots로 직접 반납합니다.
+
+장부가 어긋난 경우 rebuild_slot_ledger 명령으로 예약 데이터에서 다시 계산할 수 있습니다.
+"""
+from collections import Counter
+from datetime import date, datetime, time
+from typing import Iterable, Optional, Tuple
+
+import pytz
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Reservation, ReservationSlot
+
+KST = pytz.timezone('Asia/Seoul')
+SLOT_MINUTES = 30
+DEFAULT_SLOT_CAPACITY = 3
+
+SlotKey = Tuple[date, time]
+
+
+class SlotFull(ValueError):
+    """예약 시간대의 정원이 찬 경우"""
+
+    def __init__(self, key: SlotKey):
+        self.date, self.time = key
+        super().__init__(f"{self.date} {self.time:%H:%M} 시간대는 예약이 마감되었습니다.")
+
+
+def get_slot_capacity() -> int:
+    return getattr(settings, 'RESERVATION_SLOT_CAPACITY', DEFAULT_SLOT_CAPACITY)
+
+
+def slot_key(scheduled_at: Optional[datetime]) -> Optional[SlotKey]:
+    """예약 시간이 속한 (날짜, 30분 단위 시간대) (KST 기준)"""
+    if scheduled_at is None:
+        return None
+    local = timezone.localtime(scheduled_at, KST)
+    minute = local.minute - local.minute % SLOT_MINUTES
+    return local.date(), time(local.hour, minute)
+
+
+def holds_slot(status: Optional[str]) -> bool:
+    """취소되지 않은 예약만 시간대를 차지합니다."""
+    return status is not None and status != Reservation.STATUS_CANCELLED
+
+
+def take_slot(scheduled_at: Optional[datetime], check_capacity: bool = True) -> None:
+    key = slot_key(scheduled_at)
+    if key is None:
+        return
+    slot_date, slot_time = key
+    # INSERT ... ON CONFLICT DO NOTHING: 처음 예약되는 시간대의 행을 만듭니다.
+    ReservationSlot.objects.bulk_create(
+        [ReservationSlot(date=slot_date, time=slot_time, capacity=get_slot_capacity())],
+        ignore_conflicts=True
+    )
+    slots = ReservationSlot.objects.filter(date=slot_date, time=slot_time)
+    if check_capacity:
+        slots = slots.filter(booked__lt=F('capacity'))
+    if not slots.update(booked=F('booked') + 1):
+        raise SlotFull(key)
+
+
+def release_slots(scheduled_ats: Iterable[Optional[datetime]]) -> None:
+    """예약 시간 목록이 차지하던 시간대를 반납합니다. (시간대별 UPDATE 한 번)"""
+    counts = Counter(key for key in map(slot_key, scheduled_ats) if key is not None)
+    for (slot_date, slot_time), count in counts.items():
+        ReservationSlot.objects.filter(date=slot_date, time=slot_time).update(
+            booked=Greatest(F('booked') - count, Value(0))
+        )
+
+
+def get_slot_change(reservation: Reservation) -> Optional[Tuple[Optional[datetime], Optional[datetime]]]:
+    """
+    불러온 값과 비교해 예약이 차지하는 시간대가 바뀌면 (반납할 예약 시간, 차지할 예약 시간)을,
+    바뀌지 않으면 None을 반환합니다.
+    """
+    old_at = None
+    if not reservation._state.adding and holds_slot(reservation.get_loaded_value('status')):
+        old_at = reservation.get_loaded_value('scheduled_at')
+    new_at = reservation.scheduled_at if holds_slot(reservation.status) else None
+    if slot_key(old_at) == slot_key(new_at):
+        return None
+    return old_at, new_at
+
+
+def move_slot(old_at: Optional[datetime], new_at: Optional[datetime], check_capacity: bool = False) -> None:
+    """old_at의 시간대를 반납하고 new_at의 시간대를 차지합니다. (트랜잭션 안에서 호출)"""
+    take_slot(new_at, check_capacity=check_capacity)
+    release_slots([old_at])
+
+
+def rebuild_slot_ledger() -> int:
+    """예약 데이터로 장부의 예약 수를 다시 계산합니다. 갱신/생성한 시간대 수를 반환합니다."""
+    scheduled_ats = Reservation.objects.exclude(status=Reservation.STATUS_CANCELLED).filter(
+        scheduled_at__isnull=False
+    ).values_list('scheduled_at', flat=True).iterator()
+    counts = Counter(map(slot_key, scheduled_ats))
+
+    with transaction.atomic():
+        slots = list(ReservationSlot.objects.select_for_update())
+        for slot in slots:
+            slot.booked = counts.pop((slot.date, slot.time), 0)
+        ReservationSlot.objects.bulk_update(slots, ['booked'], batch_size=500)
+        ReservationSlot.objects.bulk_create([
+            ReservationSlot(date=slot_date, time=slot_time, booked=count, capacity=get_slot_capacity())
+            for (slot_date, slot_time), count in counts.items()
+        ], batch_size=500)
+    return len(slots) + len(counts)
@@ -0,0 +1,1226 @@
+import hashlib
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from cryptography.fernet import Fernet
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+from apscheduler.events import EVENT_JOB_EXECUTED, JobExecutionEvent
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.jobstores.memory import MemoryJobStore
+from django_apscheduler.models import DjangoJob, DjangoJobExecution
+from memorial_rooms.models import MemorialRoom
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .fields import (
+    AES_GCM_PREFIX, Ciphertext, DATA_KEY_PREFIX, DETERMINISTIC_PREFIX, ENVELOPE_PREFIXES, FERNET_PREFIX,
+    get_encryption_key, raw_column
+)
+from .ciphers import AESGCMCipher, FernetCipher, get_cipher
+from .decrypt_cache import decrypt_cache, get_decrypt_cache
+from . import scheduler
+from .apps import should_autostart_scheduler
+from .job_history import rollup_job_executions
+from .leases import acquire_lease, get_lease, pop_wakeup, publish_metrics, release_lease, request_wakeup
+from .metrics import MetricsRegistry
+from .availability import Booking, RoomSchedule
+from .cron import check_reservation_status, claim_in_batches, dispatch_reminders, transition_reservations
+from .holds import expire_holds
+from .models import Customer, JobExecutionSummary, Pet, Reservation, ReservationHistory, ReservationSlot, SlotHold
+from .search import search_object_ids
+from .slots import SlotFull, rebuild_slot_ledger, slot_key
+
+User = get_user_model()
+
+
+class BlindIndexTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            name='홍길동',
+            phone='010-1234-5678',
+            email='Hong@Example.com'
+        )
+
+    def test_blind_index_saved(self):
+        """저장 시 정규화된 블라인드 인덱스 생성 테스트"""
+        self.assertEqual(len(self.customer.phone_index), 64)
+        self.assertNotIn('5678', self.customer.phone_index)
+
+    def test_exact_lookup_uses_blind_index(self):
+        """전화번호/이메일 일치 검색 테스트"""
+        self.assertEqual(Customer.objects.get(phone='01012345678'), self.customer)
+        self.assertEqual(Customer.objects.get(email='hong@example.com '), self.customer)
+        self.assertFalse(Customer.objects.filter(phone='010-0000-0000').exists())
+
+    def test_get_or_create_reuses_customer(self):
+        """get_or_create가 기존 고객을 찾는지 테스트"""
+        customer, created = Customer.objects.get_or_create(
+            phone='010 1234 5678',
+            defaults={'name': '홍길동'}
+        )
+        self.assertFalse(created)
+        self.assertEqual(customer.pk, self.customer.pk)
+
+
+class LazyDecryptTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            name='홍길동',
+            phone='010-1234-5678',
+            address='서울시 강남구'
+        )
+
+    def test_decrypt_on_first_access(self):
+        """조회 시 암호문을 보관하고 접근 시 복호화하는지 테스트"""
+        customer = Customer.objects.get(pk=self.customer.pk)
+        self.assertIsInstance(customer.__dict__['address'], Ciphertext)
+        self.assertEqual(customer.address, '서울시 강남구')
+        self.assertNotIsInstance(customer.__dict__['address'], Ciphertext)
+
+    def test_save_keeps_untouched_ciphertext(self):
+        """접근하지 않은 필드는 저장 후에도 값이 유지되는지 테스트"""
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.name = '김철수'
+        customer.save()
+
+        customer = Customer.objects.get(pk=self.customer.pk)
+        self.assertEqual(customer.name, '김철수')
+        self.assertEqual(customer.address, '서울시 강남구')
+        self.assertEqual(Customer.objects.get(phone='01012345678'), customer)
+
+
+class EncryptedStorageFormatTests(TestCase):
+    def _raw_name(self, customer):
+        return Customer.objects.values_list(raw_column('name'), flat=True).get(pk=customer.pk)
+
+    def test_compact_format(self):
+        """새로 저장하는 값은 압축 형식인지 테스트"""
+        customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.assertTrue(self._raw_name(customer).startswith(ENVELOPE_PREFIXES))
+
+    def test_cipher_backends(self):
+        """Fernet/AES-GCM 값이 섞여 있어도 읽히고 AES-GCM 값이 더 작은지 테스트"""
+        with override_settings(ENCRYPTED_FIELD_CIPHER='fernet'):
+            fernet_customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        gcm_customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+
+        fernet_raw, gcm_raw = self._raw_name(fernet_customer), self._raw_name(gcm_customer)
+        self.assertTrue(fernet_raw.startswith(FernetCipher.envelope_prefix))
+        self.assertTrue(gcm_raw.startswith(AESGCMCipher.envelope_prefix))
+        self.assertLess(len(gcm_raw), len(fernet_raw))
+        self.assertEqual(Customer.objects.get(pk=fernet_customer.pk).name, '홍길동')
+        self.assertEqual(Customer.objects.get(pk=gcm_customer.pk).name, '홍길동')
+
+    def test_legacy_format_read_and_compact(self):
+        """기존 형식 읽기 및 compact_encrypted_data 변환 테스트"""
+        with override_settings(ENCRYPTED_FIELD_FORMAT='legacy'):
+            customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.assertFalse(self._raw_name(customer).startswith(FERNET_PREFIX))
+        self.assertEqual(Customer.objects.get(pk=customer.pk).name, '홍길동')
+
+        call_command('compact_encrypted_data', stdout=StringIO())
+
+        self.assertTrue(self._raw_name(customer).startswith(FERNET_PREFIX))
+        customer = Customer.objects.get(pk=customer.pk)
+        self.assertEqual(customer.name, '홍길동')
+        self.assertEqual(customer.phone, '010-1234-5678')
+
+
+class EnvelopeEncryptionTests(TestCase):
+    def _raw(self, customer, column):
+        return Customer.objects.values_list(raw_column(column), flat=True).get(pk=customer.pk)
+
+    def _rotate(self, old_key, new_key):
+        call_command(
+            'reencrypt_data', old_key=old_key, new_key=new_key, workers=1,
+            checkpoint=os.path.join(tempfile.mkdtemp(), 'checkpoint.json'), stdout=StringIO()
+        )
+
+    def test_row_data_key(self):
+        """행마다 다른 데이터 키로 암호화되는지 테스트"""
+        first = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        second = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.assertTrue(first.data_key.startswith(DATA_KEY_PREFIX))
+        self.assertNotEqual(first.data_key, second.data_key)
+        self.assertEqual(Customer.objects.get(pk=first.pk).name, '홍길동')
+
+    def test_data_key_ciphers_not_cached(self):
+        """행별 데이터 키의 백엔드가 프로세스 전역 캐시에 남지 않는지 테스트"""
+        get_cipher.cache_clear()
+        for name in ('홍길동', '김철수', '이영희'):
+            customer = Customer.objects.create(name=name, phone='010-1234-5678')
+            self.assertEqual(Customer.objects.get(pk=customer.pk).name, name)
+        # 마스터 키 백엔드만 남습니다.
+        self.assertLessEqual(get_cipher.cache_info().currsize, 1)
+
+    def test_master_key_values_still_readable(self):
+        """update()로 마스터 키 암호화된 값과 섞여 있어도 읽히는지 테스트"""
+        customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        Customer.objects.filter(pk=customer.pk).update(address='서울시 강남구')
+        self.assertTrue(self._raw(customer, 'address').startswith(AES_GCM_PREFIX))
+
+        customer = Customer.objects.get(pk=customer.pk)
+        self.assertEqual(customer.name, '홍길동')
+        self.assertEqual(customer.address, '서울시 강남구')
+
+    @override_settings(BLIND_INDEX_KEY='blind-index-test-key')
+    def test_rotation_only_rewraps_data_keys(self):
+        """키 교체 시 데이터 키만 다시 감싸는지 테스트"""
+        customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        raw_name, wrapped = self._raw(customer, 'name'), self._raw(customer, 'data_key')
+        new_key = Fernet.generate_key()
+
+        self._rotate(get_encryption_key().decode(), new_key.decode())
+
+        self.assertEqual(self._raw(customer, 'name'), raw_name)
+        self.assertNotEqual(self._raw(customer, 'data_key'), wrapped)
+        with override_settings(ENCRYPTION_KEY=new_key):
+            self.assertEqual(Customer.objects.get(phone='01012345678').name, '홍길동')
+
+    def test_convert_existing_rows(self):
+        """같은 키로 실행하면 기존 값이 봉투 암호화 형식으로 바뀌는지 테스트"""
+        with override_settings(ENCRYPTED_FIELD_FORMAT='legacy'):
+            customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.assertIsNone(customer.data_key)
+
+        key = get_encryption_key().decode()
+        self._rotate(key, key)
+
+        self.assertTrue(self._raw(customer, 'name').startswith(ENVELOPE_PREFIXES))
+        customer = Customer.objects.get(pk=customer.pk)
+        self.assertTrue(customer.data_key.startswith(DATA_KEY_PREFIX))
+        self.assertEqual(customer.name, '홍길동')
+        self.assertEqual(customer.phone, '010-1234-5678')
+
+
+class DecryptCacheTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+
+    def test_same_ciphertext_decrypted_once(self):
+        """같은 암호문은 캐시에서 반환되는지 테스트"""
+        with decrypt_cache() as cache:
+            first = Customer.objects.get(pk=self.customer.pk)
+            second = Customer.objects.get(pk=self.customer.pk)
+            self.assertEqual(first.name, '홍길동')
+            self.assertEqual(second.name, '홍길동')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+        self.assertIsNone(get_decrypt_cache())
+
+    def test_cache_is_bounded(self):
+        """최대 크기를 넘으면 오래된 항목부터 제거되는지 테스트"""
+        other = Customer.objects.create(name='김철수', phone='010-9999-0000')
+        with decrypt_cache(maxsize=1) as cache:
+            Customer.objects.get(pk=self.customer.pk).name
+            Customer.objects.get(pk=other.pk).name
+            Customer.objects.get(pk=self.customer.pk).name
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 3, 'size': 1})
+
+
+class EncryptionBenchmarkTests(TestCase):
+    def test_benchmark_command(self):
+        """벤치마크 실행 후 테스트 데이터가 롤백되는지 테스트"""
+        out = StringIO()
+        call_command(
+            'benchmark_encryption', iterations=5, sizes=[16], page_sizes=[2, 4], repeat=1, stdout=out
+        )
+        self.assertIn('EncryptedTextField', out.getvalue())
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(Customer.objects.exists())
+
+
+class DeterministicEncryptionTests(TestCase):
+    def setUp(self):
+        customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.pets = [
+            Pet.objects.create(customer=customer, name='초코', species='개', breed='푸들'),
+            Pet.objects.create(customer=customer, name='보리', species='개', breed='푸들'),
+            Pet.objects.create(customer=customer, name='나비', species='고양이', breed='코리안숏헤어'),
+        ]
+
+    def test_same_plaintext_same_ciphertext(self):
+        """같은 값은 같은 암호문으로 저장되는지 테스트"""
+        raw = list(Pet.objects.order_by('pk').values_list(raw_column('breed'), flat=True))
+        self.assertTrue(raw[0].startswith(DETERMINISTIC_PREFIX))
+        self.assertEqual(raw[0], raw[1])
+        self.assertNotEqual(raw[0], raw[2])
+        self.assertNotIn('푸들', raw[0])
+
+    def test_filter_and_group_by(self):
+        """일치 조회와 GROUP BY가 SQL에서 동작하는지 테스트"""
+        self.assertEqual(Pet.objects.filter(species='개').count(), 2)
+        self.assertEqual(Pet.objects.filter(breed__in=['코리안숏헤어']).get(), self.pets[2])
+        stats = Pet.objects.order_by().values('species').annotate(count=Count('id'))
+        species_field = Pet._meta.get_field('species')
+        self.assertEqual(
+            {species_field.decrypt(row['species']): row['count'] for row in stats}, {'개': 2, '고양이': 1}
+        )
+
+    def test_lazy_decrypt(self):
+        """lazy=True이면 조회 시 복호화하지 않고 처음 접근할 때 복호화하는지 테스트"""
+        pet = Pet.objects.get(pk=self.pets[0].pk)
+        self.assertIsInstance(pet.__dict__['species'], Ciphertext)
+        self.assertEqual(pet.species, '개')
+        self.assertEqual(pet.__dict__['species'], '개')
+
+    def test_rotation_reencrypts_deterministic_values(self):
+        """키 교체 후에도 일치 조회가 동작하는지 테스트"""
+        new_key = Fernet.generate_key()
+        call_command(
+            'reencrypt_data', old_key=get_encryption_key().decode(), new_key=new_key.decode(),
+            workers=1, checkpoint=os.path.join(tempfile.mkdtemp(), 'checkpoint.json'), stdout=StringIO()
+        )
+        with override_settings(ENCRYPTION_KEY=new_key):
+            self.assertEqual(Pet.objects.filter(breed='푸들').count(), 2)
+            self.assertEqual(Pet.objects.get(pk=self.pets[2].pk).species, '고양이')
+
+
+class ReencryptDataTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name='김철수', phone='010-1234-5678', email='kim@example.com')
+        self.pet = Pet.objects.create(customer=self.customer, name='초코', breed='푸들')
+        self.old_key = get_encryption_key().decode()
+        self.new_key = Fernet.generate_key().decode()
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+
+    def test_reencrypt_with_process_pool(self):
+        """프로세스 풀 재암호화 후 새 키로 복호화/검색되는지 테스트"""
+        call_command(
+            'reencrypt_data', old_key=self.old_key, new_key=self.new_key,
+            batch_size=1, workers=2, checkpoint=self.checkpoint, stdout=StringIO()
+        )
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        with override_settings(ENCRYPTION_KEY=self.new_key.encode()):
+            customer = Customer.objects.get(phone='010-1234-5678')
+            self.assertEqual(customer.name, '김철수')
+            self.assertEqual(Pet.objects.get(pk=self.pet.pk).breed, '푸들')
+            self.assertEqual(
+                set(Customer.objects.filter(pk__in=search_object_ids(Customer._meta.get_field('name'), '철수'))),
+                {customer}
+            )
+
+    def test_resume_from_checkpoint(self):
+        """체크포인트 이후의 레코드만 처리하는지 테스트"""
+        other = Customer.objects.create(name='이영희', phone='010-9999-0000')
+        with open(self.checkpoint, 'w') as f:
+            json.dump({
+                'key_fingerprint': hashlib.sha256(
+                    f'{self.old_key}:{self.new_key}'.encode()
+                ).hexdigest()[:16],
+                'models': {'reservations.Customer': self.customer.pk}
+            }, f)
+
+        call_command(
+            'reencrypt_data', old_key=self.old_key, new_key=self.new_key,
+            workers=1, checkpoint=self.checkpoint, stdout=StringIO()
+        )
+
+        with override_settings(ENCRYPTION_KEY=self.new_key.encode()):
+            self.assertIsNone(Customer.objects.get(pk=self.customer.pk).name)
+            self.assertEqual(Customer.objects.get(pk=other.pk).name, '이영희')
+
+
+class EncryptedSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            phone='010-1234-5678',
+            department='테스트부서',
+            position='테스트직책',
+            auth_level=1
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.customer = Customer.objects.create(name='김철수', phone='010-1234-5678')
+        self.other = Customer.objects.create(name='이영희', phone='010-9999-0000')
+        self.pet = Pet.objects.create(customer=self.customer, name='초코', breed='푸들')
+
+    def _search(self, url_name, term):
+        response = self.client.get(reverse(url_name), {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['id'] for item in response.data['results']}
+
+    def test_search_customer_by_name_and_phone(self):
+        """고객명 부분 검색 및 전화번호 뒷자리 검색 테스트"""
+        self.assertEqual(self._search('customer-list', '김'), {self.customer.id})
+        self.assertEqual(self._search('customer-list', '철수'), {self.customer.id})
+        self.assertEqual(self._search('customer-list', '5678'), {self.customer.id})
+        self.assertEqual(self._search('customer-list', '박'), set())
+
+    def test_decrypt_cache_header(self):
+        """응답에 복호화 캐시 적중/미스 횟수가 포함되는지 테스트"""
+        response = self.client.get(reverse('customer-list'))
+        self.assertEqual(response['X-Decrypt-Cache'], 'hits=0, misses=4')
+        self.assertTrue(response['X-Crypto-Time'].startswith('decrypts=4, encrypts=0, time='))
+
+    def test_search_tokens_follow_updates(self):
+        """이름 변경 시 검색 토큰 갱신 테스트"""
+        self.customer.name = '박민수'
+        self.customer.save()
+        self.assertEqual(self._search('customer-list', '김'), set())
+        self.assertEqual(self._search('customer-list', '민수'), {self.customer.id})
+
+    def test_search_pet_by_name(self):
+        """반려동물명 검색 테스트"""
+        self.assertEqual(self._search('pet-list', '초코'), {self.pet.id})
+
+    def test_filter_pet_by_breed(self):
+        """품종 필터 및 품종별 통계 테스트"""
+        response = self.client.get(reverse('pet-list'), {'breed': '푸들'})
+        self.assertEqual({item['id'] for item in response.data['results']}, {self.pet.id})
+
+        response = self.client.get(reverse('pet-breed_stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'species': None, 'breed': '푸들', 'count': 1}])
+
+
+class ReservationTestMixin:
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test User',
+            phone='010-1234-5678',
+            department='테스트부서',
+            position='테스트직책',
+            auth_level=1
+        )
+        self.customer = Customer.objects.create(name='홍길동', phone='010-1234-5678')
+        self.pet = Pet.objects.create(customer=self.customer, name='초코')
+        self.room = MemorialRoom.objects.create(name='추모실 1', operating_hours='09:00-18:00')
+        self.now = timezone.now()
+
+    def _reservation(self, status_value, scheduled_at, room=None):
+        return Reservation.objects.create(
+            customer=self.customer,
+            pet=self.pet,
+            memorial_room=room,
+            status=status_value,
+            scheduled_at=scheduled_at,
+            created_by=self.user
+        )
+
+
+@override_settings(RESERVATION_REMINDER_LEAD=0)
+class ReservationStatusCronTests(ReservationTestMixin, TestCase):
+    def _run(self):
+        with CaptureQueriesContext(connection) as queries:
+            check_reservation_status()
+        return len(queries)
+
+    def test_transitions_and_histories(self):
+        """진행중 → 완료, 확정 → 진행중 일괄 변경 및 이력 생성 테스트"""
+        finished = self._reservation('in_progress', self.now - timedelta(hours=3))
+        due = self._reservation('confirmed', self.now - timedelta(minutes=1), room=self.room)
+        upcoming = self._reservation('confirmed', self.now + timedelta(days=1))
+
+        self._run()
+
+        finished.refresh_from_db()
+        due.refresh_from_db()
+        upcoming.refresh_from_db()
+        self.assertEqual(finished.status, 'completed')
+        self.assertEqual(due.status, 'in_progress')
+        self.assertEqual(upcoming.status, 'confirmed')
+        self.assertEqual(
+            set(ReservationHistory.objects.values_list('reservation_id', 'from_status', 'to_status')),
+            {(finished.id, 'in_progress', 'completed'), (due.id, 'confirmed', 'in_progress')}
+        )
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.current_status, 'in_use')
+
+    def test_room_status_reserved_and_available(self):
+        """2시간 이내 예약이 있는 추모실은 예약중, 없으면 사용가능으로 변경되는지 테스트"""
+        other = MemorialRoom.objects.create(
+            name='추모실 2', operating_hours='09:00-18:00', current_status='in_use'
+        )
+        self._reservation('confirmed', self.now + timedelta(hours=1), room=self.room)
+
+        self._run()
+
+        self.room.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.room.current_status, 'reserved')
+        self.assertEqual(other.current_status, 'available')
+
+    def test_query_count_independent_of_backlog(self):
+        """밀린 예약 수와 관계없이 쿼리 수가 일정한지 테스트"""
+        self._reservation('confirmed', self.now - timedelta(minutes=5))
+        small = self._run()
+
+        for _ in range(10):
+            self._reservation('confirmed', self.now - timedelta(minutes=5))
+        self.assertEqual(self._run(), small)
+
+
+    def test_claim_in_batches(self):
+        """SKIP LOCKED 배치 처리로 모든 예약이 한 번씩만 변경되고 이력이 남는지 테스트"""
+        due_ids = {
+            self._reservation('confirmed', self.now - timedelta(minutes=i)).id
+            for i in range(5)
+        }
+        upcoming = self._reservation('confirmed', self.now + timedelta(hours=1))
+        due = Reservation.objects.filter(status='confirmed', scheduled_at__lte=self.now)
+
+        claimed = claim_in_batches(due, 'confirmed', 'in_progress', '테스트', self.now, batch_size=2)
+
+        self.assertEqual(sorted(claimed), sorted(due_ids))
+        self.assertFalse(due.exists())
+        upcoming.refresh_from_db()
+        self.assertEqual(upcoming.status, 'confirmed')
+        self.assertEqual(
+            sorted(ReservationHistory.objects.values_list('reservation_id', flat=True)), sorted(due_ids)
+        )
+
+    def test_fallback_skips_already_changed(self):
+        """다른 노드가 먼저 변경한 예약은 다시 변경하거나 이력을 남기지 않는지 테스트"""
+        reservation = self._reservation('confirmed', self.now - timedelta(minutes=1))
+        first = transition_reservations('confirmed', 'in_progress', self.now, '테스트', self.now)
+        second = transition_reservations(
+            'confirmed', 'in_progress', self.now, '테스트', self.now + timedelta(seconds=1)
+        )
+        self.assertEqual((first, second), ([reservation.id], []))
+        self.assertEqual(ReservationHistory.objects.count(), 1)
+
+class ReservationReminderTests(ReservationTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.messages = []
+
+    def _notifier(self, message):
+        self.messages.append(message)
+        return True
+
+    def test_dispatch_batches_and_marks_sent(self):
+        """알림 구간의 확정 예약만 한 메시지로 보내고, 다시 실행해도 중복 발송하지 않는지 테스트"""
+        soon = self._reservation('confirmed', self.now + timedelta(minutes=30), room=self.room)
+        later = self._reservation('confirmed', self.now + timedelta(minutes=50))
+        self._reservation('confirmed', self.now + timedelta(hours=3))
+        self._reservation('pending', self.now + timedelta(minutes=20))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(dispatch_reminders(self.now, notifier=self._notifier), 2)
+        # 조건부 UPDATE 1회 + 발송 대상 조회 1회 (SAVEPOINT 제외)
+        statements = [q['sql'] for q in queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(len(self.messages), 1)
+        self.assertIn(f'예약 #{soon.id}', self.messages[0])
+        self.assertIn(f'예약 #{later.id}', self.messages[0])
+        self.assertIn('추모실 1', self.messages[0])
+
+        self.assertEqual(dispatch_reminders(self.now + timedelta(minutes=5), notifier=self._notifier), 0)
+        self.assertEqual(len(self.messages), 1)
+
+    def test_failed_send_is_retried(self):
+        """전송에 실패하면 발송 표시를 되돌리고 재시도 간격이 지난 뒤 다시 보내는지 테스트"""
+        reservation = self._reservation('confirmed', self.now + timedelta(minutes=30))
+        self.assertEqual(dispatch_reminders(self.now, notifier=lambda message: False), 0)
+        reservation.refresh_from_db()
+        self.assertIsNone(reservation.reminder_sent_at)
+        self.assertEqual(reservation.reminder_attempts, 1)
+        self.assertEqual(reservation.reminder_retry_at, self.now + timedelta(minutes=1))
+
+        # 재시도 시각 전에는 보내지 않습니다.
+        self.assertEqual(dispatch_reminders(self.now + timedelta(seconds=30), notifier=self._notifier), 0)
+        self.assertEqual(dispatch_reminders(self.now + timedelta(minutes=1), notifier=self._notifier), 1)
+
+    def test_failed_send_backs_off(self):
+        """연속으로 실패하면 재시도 간격이 늘어나고 스케줄러가 재시도 시각에 깨어나는지 테스트"""
+        reservation = self._reservation('confirmed', self.now + timedelta(minutes=50))
+        run_at = self.now
+        for delay in (1, 2, 4):
+            self.assertEqual(dispatch_reminders(run_at, notifier=lambda message: False), 0)
+            reservation.refresh_from_db()
+            self.assertEqual(reservation.reminder_retry_at, run_at + timedelta(minutes=delay))
+            run_at = reservation.reminder_retry_at
+        self.assertEqual(reservation.reminder_attempts, 3)
+        # 알림 시각이 지났어도 실패한 알림은 바로 다시 실행하지 않습니다.
+        self.assertEqual(scheduler.get_next_due_at(self.now + timedelta(minutes=3)), run_at)
+        self.assertEqual(scheduler.get_reservation_due_at(reservation, self.now + timedelta(minutes=3)), run_at)
+
+    def test_reminder_escapes_html(self):
+        """HTML 모드로 보내는 메시지에 이름이 이스케이프되어 들어가는지 테스트"""
+        reservation = self._reservation('confirmed', self.now + timedelta(minutes=30), room=self.room)
+        reservation.pet.name = '<b>초코</b> & 보리'
+        reservation.pet.save()
+        dispatch_reminders(self.now, notifier=self._notifier)
+        self.assertIn('&lt;b&gt;초코&lt;/b&gt; &amp; 보리', self.messages[0])
+        self.assertNotIn('<b>', self.messages[0])
+
+    def test_reschedule_resets_reminder(self):
+        """일정이 바뀌면 사전 알림을 다시 보내도록 초기화되는지 테스트"""
+        reservation = self._reservation('confirmed', self.now + timedelta(minutes=30))
+        dispatch_reminders(self.now, notifier=self._notifier)
+        reservation = Reservation.objects.get(id=reservation.id)
+        self.assertIsNotNone(reservation.reminder_sent_at)
+
+        reservation.scheduled_at = self.now + timedelta(days=1)
+        reservation.save()
+        reservation.refresh_from_db()
+        self.assertIsNone(reservation.reminder_sent_at)
+
+    def test_scheduler_wakes_for_reminder(self):
+        """다음 실행 시각에 사전 알림 시각이 포함되는지 테스트"""
+        start = self.now + timedelta(hours=3)
+        self._reservation('confirmed', start)
+        self.assertEqual(scheduler.get_next_due_at(self.now), start - timedelta(hours=1))
+
+class ReservationSaveTests(ReservationTestMixin, TestCase):
+    def test_save_without_extra_select(self):
+        """불러온 예약을 저장할 때 기존 상태를 다시 조회하지 않고 변경된 필드만 UPDATE 하는지 테스트"""
+        reservation = Reservation.objects.get(id=self._reservation('confirmed', self.now).id)
+        reservation.memo = '메모 변경'
+        with CaptureQueriesContext(connection) as queries:
+            reservation.save()
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertTrue(sql.startswith('UPDATE'))
+        self.assertIn('"memo"', sql)
+        self.assertNotIn('"status"', sql)
+
+    def test_completed_status_processes_inventory_once(self):
+        """완료로 바뀐 저장에서만 재고 처리가 실행되는지 테스트"""
+        reservation = Reservation.objects.get(id=self._reservation('in_progress', self.now).id)
+        reservation.status = Reservation.STATUS_COMPLETED
+        with CaptureQueriesContext(connection) as queries:
+            reservation.save()
+        # UPDATE + 사용 재고 조회
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(reservation.has_changed('status'))
+
+        with CaptureQueriesContext(connection) as queries:
+            reservation.save()
+        self.assertEqual(len(queries), 1)
+
+class ReservationBulkStatusTests(ReservationTestMixin, APITestCase):
+    def _bulk_update(self, ids, new_status):
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('reservations-bulk-status-update'),
+                {'reservation_ids': ids, 'status': new_status, 'notes': '일괄 확정'},
+                format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, len(queries)
+
+    def test_bulk_update_and_rejections(self):
+        """유효한 전환만 변경되고, 잘못된 전환은 실패 목록에 포함되는지 테스트"""
+        pending = self._reservation('pending', self.now + timedelta(days=1))
+        completed = self._reservation('completed', self.now - timedelta(days=1))
+
+        data, _ = self._bulk_update([pending.id, completed.id], 'confirmed')
+
+        self.assertEqual(data['updated_count'], 1)
+        self.assertEqual([item['id'] for item in data['failed_updates']], [completed.id])
+        self.assertEqual(data['failed_updates'][0]['current_status'], 'completed')
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'confirmed')
+        history = ReservationHistory.objects.get()
+        self.assertEqual(
+            (history.reservation_id, history.from_status, history.to_status, history.changed_by_id),
+            (pending.id, 'pending', 'confirmed', self.user.id)
+        )
+
+    def test_query_count_independent_of_selection(self):
+        """선택한 예약 수와 관계없이 쿼리 수가 일정한지 테스트"""
+        ids = [self._reservation('pending', self.now + timedelta(days=1)).id]
+        _, small = self._bulk_update(ids, 'cancelled')
+
+        ids = [self._reservation('pending', self.now + timedelta(days=1)).id for _ in range(10)]
+        data, large = self._bulk_update(ids, 'cancelled')
+        self.assertEqual(data['updated_count'], 10)
+        self.assertEqual(large, small)
+
+    def test_bulk_cancel_with_room_forwards_wakeup(self):
+        """추모실이 지정된 예약을 일괄 취소하면 리더에게 바로 실행을 요청하는지 테스트"""
+        reservation = self._reservation('confirmed', self.now + timedelta(hours=1), room=self.room)
+        acquire_lease(scheduler.LEASE_NAME, 'leader', timedelta(seconds=30))
+        pop_wakeup(scheduler.LEASE_NAME, 'leader')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._bulk_update([reservation.id], 'cancelled')
+        wake_at = pop_wakeup(scheduler.LEASE_NAME, 'leader')
+        self.assertIsNotNone(wake_at)
+        self.assertLessEqual(wake_at, timezone.now() + scheduler.MIN_DELAY)
+
+
+class RoomAvailabilityTests(ReservationTestMixin, APITestCase):
+    def test_room_schedule_conflicts_and_next_free_slot(self):
+        """겹치는 예약과 다음 빈 시간을 정렬된 구간에서 찾는지 테스트"""
+        base = self.now.replace(microsecond=0)
+        hour = timedelta(hours=1)
+        schedule = RoomSchedule([
+            Booking(2, base + 3 * hour, base + 5 * hour),
+            Booking(1, base, base + 2 * hour),
+            # 긴 예약 안에 포함된 짧은 예약도 찾아야 합니다.
+            Booking(3, base + 3 * hour, base + 10 * hour),
+            Booking(4, base + 4 * hour, base + 6 * hour),
+        ])
+
+        self.assertEqual([b.reservation_id for b in schedule.conflicts(base + hour, base + 4 * hour)], [1, 2, 3])
+        self.assertEqual([b.reservation_id for b in schedule.conflicts(base + 7 * hour, base + 8 * hour)], [3])
+        self.assertEqual(schedule.conflicts(base + 2 * hour, base + 3 * hour), [])
+        self.assertEqual(schedule.conflicts(base + hour, base + 2 * hour, exclude_id=1), [])
+        self.assertEqual(schedule.next_free_slot(base, hour), base + 2 * hour)
+        self.assertEqual(schedule.next_free_slot(base, 2 * hour), base + 10 * hour)
+
+    def test_reschedule_conflict(self):
+        """같은 추모실의 겹치는 시간으로 일정 변경 시 409를 반환하는지 테스트"""
+        start = (self.now + timedelta(days=1)).replace(microsecond=0)
+        booked = self._reservation('confirmed', start, room=self.room)
+        other = self._reservation('pending', start + timedelta(hours=5), room=self.room)
+        # 취소된 예약은 겹쳐도 무시합니다.
+        self._reservation('cancelled', start + timedelta(hours=3), room=self.room)
+
+        self.client.force_authenticate(user=self.user)
+        url = reverse('reservations-reschedule', args=[other.id])
+        response = self.client.post(url, {'scheduled_at': (start + timedelta(hours=1)).isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([c['reservation_id'] for c in response.data['conflicts']], [booked.id])
+        other.refresh_from_db()
+        self.assertEqual(other.scheduled_at, start + timedelta(hours=5))
+
+        response = self.client.post(url, {'scheduled_at': (start + timedelta(hours=3)).isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_check_availability(self):
+        """추모실별 예약 가능 여부, 겹치는 예약, 다음 예약 가능 시각을 반환하는지 테스트"""
+        start = (self.now + timedelta(days=1)).replace(microsecond=0)
+        free_room = MemorialRoom.objects.create(name='추모실 2', operating_hours='09:00-18:00')
+        booked = self._reservation('confirmed', start, room=self.room)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('reservations-check_availability'),
+            {'scheduled_at': (start + timedelta(hours=1)).isoformat()},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rooms = {room['memorial_room_id']: room for room in response.data['rooms']}
+        self.assertFalse(rooms[self.room.id]['is_available'])
+        self.assertEqual([c['reservation_id'] for c in rooms[self.room.id]['conflicts']], [booked.id])
+        self.assertEqual(rooms[self.room.id]['next_available_at'], start + Reservation.DEFAULT_DURATION)
+        self.assertTrue(rooms[free_room.id]['is_available'])
+        self.assertTrue(response.data['is_available'])
+
+
+@override_settings(RESERVATION_SLOT_CAPACITY=2)
+class ReservationSlotTests(ReservationTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        # 다음 날 KST 10:00 (10:00 시간대)
+        tomorrow = timezone.localtime(self.now).date() + timedelta(days=1)
+        self.slot_at = timezone.make_aware(timezone.datetime.combine(tomorrow, timezone.datetime.min.time()))
+        self.slot_at += timedelta(hours=10)
+
+    def _booked(self, scheduled_at):
+        slot_date, slot_time = slot_key(scheduled_at)
+        slot = ReservationSlot.objects.filter(date=slot_date, time=slot_time).first()
+        return slot.booked if slot else 0
+
+    def test_ledger_follows_create_move_and_cancel(self):
+        """예약 생성/일정 변경/취소/삭제에 따라 시간대 예약 수가 바뀌는지 테스트"""
+        later = self.slot_at + timedelta(hours=1)
+        first = self._reservation('pending', self.slot_at + timedelta(minutes=10))
+        second = self._reservation('confirmed', self.slot_at)
+        self.assertEqual(self._booked(self.slot_at), 2)
+
+        second.scheduled_at = later
+        second.save()
+        self.assertEqual((self._booked(self.slot_at), self._booked(later)), (1, 1))
+
+        # 같은 시간대 안에서의 변경은 장부를 건드리지 않습니다.
+        first.scheduled_at = self.slot_at + timedelta(minutes=20)
+        with CaptureQueriesContext(connection) as queries:
+            first.save()
+        self.assertEqual(len(queries), 1)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('reservations-bulk-status-update'),
+            {'reservation_ids': [first.id], 'status': 'cancelled', 'notes': '취소'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._booked(self.slot_at), 0)
+
+        Reservation.objects.get(id=second.id).delete()
+        self.assertEqual(self._booked(later), 0)
+
+    def test_full_slot_rejected(self):
+        """정원이 찬 시간대의 예약/일정 변경이 거절되는지 테스트"""
+        self._reservation('pending', self.slot_at)
+        self._reservation('pending', self.slot_at)
+        extra = Reservation(customer=self.customer, pet=self.pet, status='pending', scheduled_at=self.slot_at)
+        with self.assertRaises(SlotFull):
+            extra.save(check_capacity=True)
+        self.assertEqual(self._booked(self.slot_at), 2)
+
+        other = self._reservation('pending', self.slot_at + timedelta(hours=2))
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('reservations-reschedule', args=[other.id]),
+            {'scheduled_at': self.slot_at.isoformat()},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self._booked(self.slot_at), 2)
+
+    def test_available_times_reads_ledger(self):
+        """예약 가능 시간 조회가 장부 조회 한 번으로 정원을 반영하는지 테스트"""
+        self._reservation('pending', self.slot_at)
+        self._reservation('confirmed', self.slot_at + timedelta(minutes=15))
+        self._reservation('cancelled', self.slot_at + timedelta(minutes=30))
+
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('reservations-available_times'), {'date': str(timezone.localtime(self.slot_at).date())}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len([q for q in queries if 'reservations_reservationslot' in q['sql']]), 1)
+        times = {slot['time']: slot for slot in response.data['data']['available_times']}
+        self.assertEqual((times['10:00']['current_bookings'], times['10:00']['is_available']), (2, False))
+        self.assertEqual((times['10:30']['current_bookings'], times['10:30']['is_available']), (0, True))
+
+    def test_rebuild_slot_ledger(self):
+        """장부를 예약 데이터로 다시 계산하는지 테스트"""
+        self._reservation('pending', self.slot_at)
+        self._reservation('pending', self.slot_at + timedelta(hours=1))
+        ReservationSlot.objects.update(booked=5)
+        Reservation.objects.filter(scheduled_at=self.slot_at).update(status='cancelled')
+
+        rebuild_slot_ledger()
+        self.assertEqual((self._booked(self.slot_at), self._booked(self.slot_at + timedelta(hours=1))), (0, 1))
+
+
+@override_settings(RESERVATION_SLOT_CAPACITY=2)
+class ReservationCalendarTests(ReservationTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.start = timezone.localtime(self.now).date() + timedelta(days=1)
+        self.client.force_authenticate(user=self.user)
+
+    def _at(self, day, hour, minute=0):
+        moment = timezone.datetime.combine(self.start + timedelta(days=day), timezone.datetime.min.time())
+        return timezone.make_aware(moment) + timedelta(hours=hour, minutes=minute)
+
+    def _calendar(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('reservations-calendar'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data'], len(queries)
+
+    def test_rooms_days_slots_matrix(self):
+        """예약과 겹치는 시간대, 정원이 찬 시간대가 예약 불가로 표시되는지 테스트"""
+        other_room = MemorialRoom.objects.create(name='추모실 2', operating_hours='09:00-18:00')
+        self._reservation('confirmed', self._at(1, 12), room=self.room)
+        self._reservation('pending', self._at(1, 15), room=other_room)
+        self._reservation('pending', self._at(1, 15, 10))
+
+        data, _ = self._calendar(start=str(self.start), end=str(self.start + timedelta(days=2)))
+        times = data['times']
+        # 추모실 운영 시간(09:00-18:00) 기준
+        self.assertEqual((times[0], times[-1]), ('09:00', '18:00'))
+        self.assertEqual([day['date'] for day in data['days']], [self.start + timedelta(days=d) for d in range(3)])
+
+        day = data['days'][1]
+        self.assertEqual(day['current_bookings'][times.index('15:00')], 2)
+        self.assertFalse(day['is_available'][times.index('15:00')])
+
+        rooms = {room['id']: room['is_available'] for room in data['rooms']}
+        room_day = rooms[self.room.id][1]
+        # 12:00 예약(2시간)과 겹치는 10:30 ~ 13:30 시작 시간대
+        busy = [t for t, available in zip(times, room_day) if not available]
+        self.assertEqual(busy, ['10:30', '11:00', '11:30', '12:00', '12:30', '13:00', '13:30', '15:00'])
+        self.assertTrue(all(rooms[self.room.id][0]))
+        self.assertFalse(rooms[other_room.id][1][times.index('14:00')])
+        self.assertTrue(rooms[other_room.id][1][times.index('12:00')])
+
+    def test_room_operating_schedule(self):
+        """추모실별 운영 시간, 휴무 요일, 예약 단위를 따르는지 테스트"""
+        closed_day = (self.start + timedelta(days=1)).weekday()
+        night_room = MemorialRoom.objects.create(
+            name='추모실 2', operating_hours='18:00-22:00', closed_weekdays=[closed_day], slot_minutes=60
+        )
+        data, _ = self._calendar(start=str(self.start), end=str(self.start + timedelta(days=1)))
+        times = data['times']
+        self.assertEqual((times[0], times[-1]), ('09:00', '22:00'))
+
+        rooms = {room['id']: room['is_available'] for room in data['rooms']}
+        night_open = [t for t, available in zip(times, rooms[night_room.id][0]) if available]
+        self.assertEqual(night_open, ['18:00', '19:00', '20:00', '21:00', '22:00'])
+        self.assertFalse(any(rooms[night_room.id][1]))
+        self.assertFalse(rooms[self.room.id][0][times.index('20:00')])
+
+        response = self.client.get(
+            reverse('reservations-available_times'),
+            {'date': str(self.start), 'memorial_room_id': night_room.id}
+        )
+        self.assertEqual(
+            [slot['time'] for slot in response.data['data']['available_times']],
+            ['18:00', '19:00', '20:00', '21:00', '22:00']
+        )
+
+    def test_schedule_cache_invalidated_on_save(self):
+        """추모실 저장 시 운영 일정 캐시가 갱신되는지 테스트"""
+        room = MemorialRoom.objects.get(id=self.room.id)
+        schedule = room.get_schedule()
+        self.assertIs(MemorialRoom.objects.get(id=room.id).get_schedule(), schedule)
+
+        room.operating_hours = '10:00-12:00'
+        room.save()
+        self.assertEqual(room.get_schedule().labels, ('10:00', '10:30', '11:00', '11:30', '12:00'))
+
+    def test_query_count_independent_of_range(self):
+        """조회 기간과 관계없이 쿼리 수가 일정한지 테스트"""
+        self._reservation('confirmed', self._at(0, 10), room=self.room)
+        self._reservation('confirmed', self._at(20, 10), room=self.room)
+        week, week_queries = self._calendar(start=str(self.start))
+        month, month_queries = self._calendar(start=str(self.start), end=str(self.start + timedelta(days=30)))
+        self.assertEqual((len(week['days']), len(month['days'])), (7, 31))
+        self.assertEqual(week_queries, month_queries)
+        self.assertFalse(month['rooms'][0]['is_available'][20][month['times'].index('10:00')])
+
+    def test_invalid_range(self):
+        """잘못된 기간은 400을 반환하는지 테스트"""
+        url = reverse('reservations-calendar')
+        for params in ({}, {'start': 'bad'}, {'start': str(self.start), 'end': str(self.start - timedelta(days=1))},
+                       {'start': str(self.start), 'end': str(self.start + timedelta(days=62))}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SlotHoldTests(ReservationTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user(
+            email='other@example.com', password='testpass123', name='Other User', phone='010-9999-0000',
+            department='테스트부서', position='테스트직책', auth_level=1
+        )
+        self.start = (self.now + timedelta(days=1)).replace(microsecond=0)
+
+    def _hold(self, user, scheduled_at, **extra):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            reverse('slot-holds-list'),
+            {'memorial_room_id': self.room.id, 'scheduled_at': scheduled_at.isoformat(), **extra},
+            format='json'
+        )
+
+    def _create(self, user, scheduled_at, hold_token=None):
+        self.client.force_authenticate(user=user)
+        data = {
+            'customer': {'name': '김철수', 'phone': '010-5555-6666'},
+            'pet': {'name': '보리'},
+            'memorial_room_id': self.room.id,
+            'scheduled_at': scheduled_at.isoformat(),
+        }
+        if hold_token:
+            data['hold_token'] = hold_token
+        return self.client.post(reverse('reservations-list'), data, format='json')
+
+    def test_hold_blocks_others_until_consumed(self):
+        """선점한 시간은 다른 직원이 선점/예약할 수 없고, 선점한 직원의 예약 생성 시 소비되는지 테스트"""
+        response = self._hold(self.user, self.start)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        token = str(response.data['token'])
+
+        response = self._hold(self.other, self.start + timedelta(hours=1))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(response.data['conflicts'][0]['is_hold'])
+        self.assertEqual(self._create(self.other, self.start).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self._create(self.user, self.start, hold_token=token).status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SlotHold.objects.exists())
+        self.assertTrue(Reservation.objects.filter(memorial_room=self.room, scheduled_at=self.start).exists())
+
+    def test_hold_token_must_match(self):
+        """다른 직원의 토큰, 다른 시간, 만료된 선점으로는 예약을 만들 수 없는지 테스트"""
+        token = str(self._hold(self.user, self.start).data['token'])
+
+        response = self._create(self.other, self.start, hold_token=token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('hold_token', response.data['errors'])
+        response = self._create(self.user, self.start + timedelta(minutes=30), hold_token=token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(SlotHold.objects.filter(token=token).exists())
+
+        SlotHold.objects.update(expires_at=self.now - timedelta(minutes=1))
+        response = self._create(self.user, self.start, hold_token=token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_move_and_release_hold(self):
+        """자신의 선점을 다른 시간으로 옮기고 취소할 수 있는지 테스트"""
+        token = self._hold(self.user, self.start).data['token']
+        later = self.start + timedelta(hours=1)
+        response = self._hold(self.user, later, token=str(token))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['token'], token)
+        self.assertEqual(SlotHold.objects.get().scheduled_at, later)
+
+        self.client.force_authenticate(user=self.other)
+        url = reverse('slot-holds-detail', args=[token])
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self._hold(self.other, self.start).status_code, status.HTTP_201_CREATED)
+
+    def test_expired_holds(self):
+        """만료된 선점은 무시되고 일괄 삭제되는지 테스트"""
+        other_room = MemorialRoom.objects.create(name='추모실 2', operating_hours='09:00-18:00')
+        self._hold(self.user, self.start)
+        SlotHold.objects.create(
+            memorial_room=other_room, scheduled_at=self.start, held_by=self.user, expires_at=self.now
+        )
+        SlotHold.objects.update(expires_at=self.now - timedelta(seconds=1))
+
+        self.assertEqual(self._create(self.other, self.start).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(expire_holds(), 2)
+        self.assertFalse(SlotHold.objects.exists())
+
+
+@override_settings(RESERVATION_REMINDER_LEAD=0)
+class ReservationSchedulerTests(ReservationTestMixin, TestCase):
+    def tearDown(self):
+        scheduler._scheduler = None
+        scheduler._is_leader = False
+        scheduler._next_run_at = None
+
+    def test_next_due_at(self):
+        """확정 예약 시작, 추모실 예약중 전환, 진행중 예약 완료 중 가장 이른 시각 테스트"""
+        self.assertIsNone(scheduler.get_next_due_at(self.now))
+
+        start = self.now + timedelta(hours=5)
+        self._reservation('confirmed', start, room=self.room)
+        self.assertEqual(scheduler.get_next_due_at(self.now), start - Reservation.DEFAULT_DURATION)
+
+        in_progress = self.now - timedelta(hours=1)
+        self._reservation('in_progress', in_progress)
+        self.assertEqual(scheduler.get_next_due_at(self.now), in_progress + Reservation.DEFAULT_DURATION)
+
+    def test_rearm_on_reservation_change(self):
+        """예약 저장 후 더 이른 전환 시각으로 작업이 다시 예약되는지 테스트"""
+        scheduler._scheduler = BackgroundScheduler()
+        scheduler._is_leader = True
+        scheduler._next_run_at = self.now + timedelta(minutes=30)
+
+        start = self.now + timedelta(minutes=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation = self._reservation('confirmed', start)
+        self.assertEqual(scheduler._next_run_at, start)
+
+        # 더 늦은 전환 시각은 기존 예약을 유지합니다.
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.scheduled_at = self.now + timedelta(days=1)
+            reservation.save()
+        self.assertEqual(scheduler._next_run_at, start)
+
+    def test_cancel_with_room_rearms_now(self):
+        """추모실이 지정된 진행중 예약을 취소하면 추모실 상태를 갱신하도록 작업이 바로 실행되는지 테스트"""
+        reservation = self._reservation('in_progress', self.now - timedelta(minutes=30), room=self.room)
+        scheduler._scheduler = BackgroundScheduler()
+        scheduler._is_leader = True
+        scheduler._next_run_at = timezone.now() + timedelta(minutes=30)
+
+        reservation = Reservation.objects.get(id=reservation.id)
+        reservation.status = Reservation.STATUS_CANCELLED
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.save()
+        self.assertLessEqual(scheduler._next_run_at, timezone.now() + scheduler.MIN_DELAY)
+
+    def test_non_leader_forwards_wakeup(self):
+        """리더가 아닌 프로세스의 예약 변경이 임대 행을 통해 리더에게 전달되는지 테스트"""
+        scheduler._scheduler = BackgroundScheduler()
+        acquire_lease(scheduler.LEASE_NAME, 'leader', timedelta(seconds=30))
+
+        start = self.now + timedelta(minutes=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._reservation('confirmed', start)
+        self.assertIsNone(scheduler._next_run_at)
+        self.assertEqual(pop_wakeup(scheduler.LEASE_NAME, 'leader'), start)
+        self.assertIsNone(pop_wakeup(scheduler.LEASE_NAME, 'leader'))
+
+    def test_worker_scheduler_owns_jobs(self):
+        """전용 스케줄러 프로세스는 하트비트만 등록하고 리더가 된 뒤 상태 체크 작업을 예약하는지 테스트"""
+        worker = scheduler.create_scheduler(blocking=True)
+        self.assertIsInstance(worker, BlockingScheduler)
+        self.assertEqual([job.id for job in worker.get_jobs()], [scheduler.HEARTBEAT_JOB_ID])
+
+        scheduler.heartbeat()
+        self.assertTrue(scheduler.is_leader())
+        self.assertEqual(get_lease(scheduler.LEASE_NAME).holder, scheduler._holder)
+        self.assertIn(scheduler.JOB_ID, [job.id for job in worker.get_jobs()])
+
+    def test_leader_jobstore_listeners(self):
+        """리더 저장소의 실행 이력 리스너가 하트비트를 기록하지 않고 물러날 때 제거되는지 테스트"""
+        worker = scheduler.create_scheduler()
+        worker.start(paused=True)
+        self.addCleanup(worker.shutdown, wait=False)
+        listeners = len(worker._listeners)
+
+        scheduler.heartbeat()
+        self.assertTrue(scheduler.is_leader())
+        self.assertEqual(len(worker._listeners), listeners + 3)
+        with self.assertNoLogs('django_apscheduler.jobstores', 'WARNING'):
+            worker._dispatch_event(JobExecutionEvent(
+                EVENT_JOB_EXECUTED, scheduler.HEARTBEAT_JOB_ID, 'default', timezone.now()
+            ))
+
+        # 저장소 분리 시 DB 연결을 닫으므로 이후에는 쿼리하지 않습니다.
+        scheduler.step_down()
+        self.assertEqual(len(worker._listeners), listeners)
+
+    @override_settings(SCHEDULER_JOBSTORE='memory')
+    def test_memory_jobstore(self):
+        """메모리 작업 저장소를 사용하면 작업 정의가 DB에 저장되지 않는지 테스트"""
+        worker = scheduler.create_scheduler(blocking=True)
+        scheduler.heartbeat()
+        self.assertIsInstance(worker._jobstores[scheduler.LEADER_JOBSTORE], MemoryJobStore)
+        self.assertEqual(
+            {job.id for job in worker.get_jobs(scheduler.LEADER_JOBSTORE)},
+            {scheduler.JOB_ID, scheduler.JOB_HISTORY_JOB_ID}
+        )
+        self.assertFalse(DjangoJob.objects.exists())
+
+
+class SchedulerAutostartTests(TestCase):
+    @override_settings(SCHEDULER_AUTOSTART=True, DEBUG=False)
+    def test_autostart_only_for_server(self):
+        """runserver/gunicorn에서만 자동 시작하고 다른 관리 명령과 run_scheduler에서는 시작하지 않는지 테스트"""
+        self.assertTrue(should_autostart_scheduler(['gunicorn', 'config.wsgi']))
+        self.assertTrue(should_autostart_scheduler(['manage.py', 'runserver']))
+        for command in ('run_scheduler', 'migrate', 'shell', 'test'):
+            self.assertFalse(should_autostart_scheduler(['manage.py', command]))
+        self.assertFalse(should_autostart_scheduler(['/usr/bin/django-admin', 'migrate']))
+
+    @override_settings(SCHEDULER_AUTOSTART=False, DEBUG=False)
+    def test_autostart_disabled(self):
+        """SCHEDULER_AUTOSTART가 꺼져 있으면 시작하지 않는지 테스트"""
+        self.assertFalse(should_autostart_scheduler(['gunicorn', 'config.wsgi']))
+
+
+class SchedulerMetricsTests(ReservationTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.registry = MetricsRegistry()
+
+    def test_lag_duration_rows_and_errors(self):
+        """예정/실제 시작 시각 차이, 소요 시간, 처리 건수, 오류, 겹침이 누적되는지 테스트"""
+        planned = self.now
+        self.registry.job_started('job', planned, started_at=planned + timedelta(seconds=3))
+        # 첫 실행이 끝나기 전에 다음 실행이 시작되면 겹침으로 기록합니다.
+        second = planned + timedelta(seconds=10)
+        self.registry.job_started('job', second, started_at=second)
+        self.registry.job_finished(
+            'job', planned, retval={'completed': 2, 'started': 1}, finished_at=planned + timedelta(seconds=5)
+        )
+        self.registry.job_finished(
+            'job', second, exception=ValueError('boom'), finished_at=second + timedelta(seconds=1)
+        )
+        self.registry.job_skipped('job')
+
+        metrics = self.registry.snapshot()['job']
+        self.assertEqual((metrics['runs'], metrics['errors'], metrics['skipped']), (2, 1, 1))
+        self.assertEqual((metrics['overlaps'], metrics['running']), (1, 0))
+        self.assertEqual((metrics['max_lag'], metrics['avg_lag']), (3.0, 1.5))
+        self.assertEqual((metrics['max_duration'], metrics['last_duration']), (2.0, 1.0))
+        self.assertEqual(metrics['rows'], {'completed': 2, 'started': 1})
+        self.assertEqual(metrics['last_error'], 'boom')
+
+    @override_settings(RESERVATION_REMINDER_LEAD=0)
+    def test_check_reservation_status_reports_rows(self):
+        """상태 체크 작업이 처리 건수를 반환하는지 테스트"""
+        self._reservation('confirmed', self.now - timedelta(minutes=1))
+        self.assertEqual(
+            check_reservation_status(),
+            {'completed': 0, 'started': 1, 'rooms': 0, 'reminders': 0, 'holds': 0}
+        )
+
+    def test_metrics_endpoint(self):
+        """리더가 기록한 지표와 밀린 전환 시간이 조회되는지 테스트"""
+        acquire_lease(scheduler.LEASE_NAME, 'leader', timedelta(seconds=30))
+        publish_metrics(scheduler.LEASE_NAME, 'leader', {'check_reservation_status': {'runs': 3}})
+        self._reservation('confirmed', self.now - timedelta(minutes=5))
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('scheduler-metrics-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['leader'], 'leader')
+        self.assertEqual(response.data['jobs'], {'check_reservation_status': {'runs': 3}})
+        self.assertGreaterEqual(response.data['behind_seconds'], 300)
+
+class JobHistoryTests(TestCase):
+    def _execution(self, job, run_time, status=DjangoJobExecution.SUCCESS, duration='0.50'):
+        return DjangoJobExecution.objects.create(
+            job=job, status=status, run_time=run_time, duration=Decimal(duration)
+        )
+
+    def test_rollup_old_executions(self):
+        """보관 기간이 지난 실행 이력이 일별 집계로 합쳐지고 삭제되는지 테스트"""
+        now = timezone.now()
+        job = DjangoJob.objects.create(id='test-job', next_run_time=now)
+        old = now - timedelta(days=10)
+        self._execution(job, old)
+        self._execution(job, old + timedelta(minutes=1), duration='1.50')
+        self._execution(job, old + timedelta(minutes=2), status=DjangoJobExecution.ERROR)
+        recent = self._execution(job, now - timedelta(days=1))
+
+        self.assertEqual(rollup_job_executions(keep_days=7, now=now), 3)
+        self.assertEqual(list(DjangoJobExecution.objects.values_list('id', flat=True)), [recent.id])
+        summary = JobExecutionSummary.objects.get(job_id='test-job')
+        self.assertEqual((summary.runs, summary.errors, summary.missed), (3, 1, 0))
+        self.assertAlmostEqual(summary.total_duration, 2.5)
+        self.assertAlmostEqual(summary.max_duration, 1.5)
+
+        # 같은 날짜의 이력이 나중에 정리되면 기존 집계에 누적합니다.
+        self._execution(job, old + timedelta(minutes=3), duration='2.00')
+        self.assertEqual(rollup_job_executions(keep_days=7, now=now), 1)
+        summary.refresh_from_db()
+        self.assertEqual(summary.runs, 4)
+        self.assertAlmostEqual(summary.total_duration, 4.5)
+        self.assertAlmostEqual(summary.max_duration, 2.0)
+
+
+class SchedulerLeaseTests(TestCase):
+    def test_single_leader_and_failover(self):
+        """한 프로세스만 임대를 가지고, 만료 또는 반납 후 다른 프로세스가 넘겨받는지 테스트"""
+        now = timezone.now()
+        ttl = timedelta(seconds=30)
+        self.assertTrue(acquire_lease('test', 'a', ttl, now))
+        self.assertFalse(acquire_lease('test', 'b', ttl, now))
+        self.assertTrue(acquire_lease('test', 'a', ttl, now + timedelta(seconds=10)))
+        self.assertFalse(acquire_lease('test', 'b', ttl, now + timedelta(seconds=30)))
+
+        # a가 갱신하지 못하고 만료되면 b가 넘겨받습니다.
+        later = now + timedelta(seconds=41)
+        self.assertTrue(acquire_lease('test', 'b', ttl, later))
+        self.assertFalse(acquire_lease('test', 'a', ttl, later))
+        self.assertEqual(get_lease('test').holder, 'b')
+
+        release_lease('test', 'b')
+        self.assertTrue(acquire_lease('test', 'a', ttl, later))
+
+    def test_wakeup_keeps_earliest(self):
+        """재예약 요청은 가장 이른 시각만 남는지 테스트"""
+        now = timezone.now()
+        acquire_lease('test', 'a', timedelta(seconds=30), now)
+        request_wakeup('test', now + timedelta(minutes=5))
+        request_wakeup('test', now + timedelta(minutes=1))
+        request_wakeup('test', now + timedelta(minutes=3))
+        self.assertIsNone(pop_wakeup('test', 'b'))
+        self.assertEqual(pop_wakeup('test', 'a'), now + timedelta(minutes=1))
@@ -2,7 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     CustomerViewSet, PetViewSet, MemorialRoomViewSet,
-    ReservationViewSet
+    ReservationViewSet, SchedulerMetricsViewSet, SlotHoldViewSet
 )
 
 router = DefaultRouter()
@@ -10,6 +10,8 @@ router.register(r'customers', CustomerViewSet)
 router.register(r'pets', PetViewSet)
 router.register(r'memorial-rooms', MemorialRoomViewSet)
 router.register(r'reservations', ReservationViewSet, basename='reservations')
+router.register(r'scheduler-metrics', SchedulerMetricsViewSet, basename='scheduler-metrics')
+router.register(r'slot-holds', SlotHoldViewSet, basename='slot-holds')
 
 urlpatterns = [
     path('available-times/', ReservationViewSet.as_view({'get': 'available_times'}), name='available-times'),
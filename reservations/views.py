@@ -1,19 +1,31 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.request import Request
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Count, QuerySet
 import logging
-from datetime import datetime, timedelta, time
+import uuid
+from datetime import datetime, timedelta
 import pytz
 from typing import Any, List, Optional
 from .models import (
-    Customer, Pet, Reservation, ReservationHistory
+    Customer, Pet, Reservation, ReservationHistory, ReservationSlot
 )
 from memorial_rooms.models import MemorialRoom
+from memorial_rooms.schedules import get_default_schedule
+from .availability import (
+    ACTIVE_STATUSES, RoomAvailability, RoomUnavailable, build_calendar, check_room_available, lock_room
+)
+from .filters import EncryptedSearchFilter
+from .holds import hold_slot, release_hold
+from .cron import process_completed_inventory
+from .leases import get_lease
+from .metrics import registry as metrics_registry
+from .slots import SLOT_MINUTES, SlotFull, get_slot_capacity, holds_slot, release_slots
 from .serializers import (
     CustomerSerializer, PetSerializer, MemorialRoomSerializer,
     ReservationListSerializer, ReservationDetailSerializer,
@@ -28,7 +40,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
     """고객 정보 관리 ViewSet"""
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [EncryptedSearchFilter]
     search_fields = ['name', 'phone', 'email']
 
 
@@ -36,10 +48,29 @@ class PetViewSet(viewsets.ModelViewSet):
     """반려동물 정보 관리 ViewSet"""
     queryset = Pet.objects.all()
     serializer_class = PetSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['customer', 'species']
+    filter_backends = [DjangoFilterBackend, EncryptedSearchFilter]
+    filterset_fields = ['customer', 'species', 'breed']
     search_fields = ['name', 'breed']
 
+    @action(detail=False, methods=['get'], url_path='breed-stats', url_name='breed_stats')
+    def breed_stats(self, request):
+        """종/품종별 반려동물 수를 반환합니다. (결정적 암호화 값 기준으로 DB에서 집계)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().values('species', 'breed').annotate(
+            count=Count('id')
+        ).order_by('-count')
+        # values()는 지연 필드의 암호문(Ciphertext)을 반환하므로 그룹별로 한 번씩 복호화합니다.
+        species_field = Pet._meta.get_field('species')
+        breed_field = Pet._meta.get_field('breed')
+        return Response([
+            {
+                'species': species_field.decrypt(row['species']) if row['species'] is not None else None,
+                'breed': breed_field.decrypt(row['breed']) if row['breed'] is not None else None,
+                'count': row['count'],
+            }
+            for row in stats
+        ])
+
 
 class MemorialRoomViewSet(viewsets.ModelViewSet):
     queryset = MemorialRoom.objects.all()
@@ -104,15 +135,32 @@ def handle_memorial_room_validation(memorial_room_id: int) -> tuple[bool, Option
         return False, error_response, None
 
 
+def serialize_conflicts(conflicts) -> List[dict]:
+    """겹치는 예약 목록을 응답 형식으로 변환"""
+    return [
+        {
+            "reservation_id": booking.reservation_id,
+            "is_hold": booking.hold_id is not None,
+            "start": booking.start,
+            "end": booking.end,
+        }
+        for booking in conflicts
+    ]
+
+
 class ReservationViewSet(viewsets.ModelViewSet):
     """예약 관리 ViewSet"""
     queryset = Reservation.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, EncryptedSearchFilter]
     filterset_fields = ['status', 'is_emergency', 'assigned_staff']
     search_fields = [
         'customer__name', 'customer__phone',
         'pet__name', 'referral_hospital'
     ]
+    # check_availability에서 다음 예약 가능 시각을 찾는 기간
+    AVAILABILITY_LOOKAHEAD = timedelta(days=7)
+    # calendar에서 한 번에 조회할 수 있는 최대 일수
+    CALENDAR_MAX_DAYS = 62
 
     def get_serializer_class(self):
         """요청 액션에 따른 시리얼라이저 클래스 반환"""
@@ -220,61 +268,79 @@ class ReservationViewSet(viewsets.ModelViewSet):
         notes: str,
         user: Any
     ) -> tuple[int, list]:
-        """일괄 상태 변경 처리"""
-        success_count = 0
+        """
+        일괄 상태 변경 처리
+
+        예약을 한 건씩 저장하지 않고 현재 상태 조회 1회, 변경 가능한 이전 상태별 조건부 UPDATE,
+        이력 bulk_create 1회로 처리하므로 선택한 예약 수와 관계없이 쿼리 수가 거의 일정합니다.
+        """
+        now = timezone.now()
+        source_statuses = [
+            current_status for current_status, _ in Reservation.STATUS_CHOICES
+            if self._is_valid_status_transition(current_status, new_status)
+        ]
         failed_updates = []
+        updated = []
 
         with transaction.atomic():
-            reservations = Reservation.objects.select_for_update().filter(id__in=reservation_ids)
-            
-            for reservation in reservations:
-                try:
-                    if not self._is_valid_status_transition(reservation.status, new_status):
-                        error_msg = f"잘못된 상태 변경입니다. (현재: {reservation.status} → 요청: {new_status})"
-                        self._add_failed_update(failed_updates, reservation, error_msg)
-                        continue
-
-                    self._update_reservation_status(reservation, new_status, notes, user)
-                    success_count += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to update reservation {reservation.id}: {str(e)}")
-                    self._add_failed_update(failed_updates, reservation, str(e))
+            reservations = list(
+                Reservation.objects.select_for_update().filter(id__in=reservation_ids)
+                .values_list('id', 'status', 'scheduled_at', 'memorial_room_id')
+            )
+            by_status = {}
+            for reservation_id, current_status, scheduled_at, memorial_room_id in reservations:
+                if current_status not in source_statuses:
+                    failed_updates.append({
+                        "id": reservation_id,
+                        "error": f"잘못된 상태 변경입니다. (현재: {current_status} → 요청: {new_status})",
+                        "current_status": current_status
+                    })
+                    continue
+                by_status.setdefault(current_status, []).append((reservation_id, scheduled_at, memorial_room_id))
+
+            histories = []
+            # 추모실이 지정된 예약이 확정/진행중 상태에 들어오거나 벗어나면 추모실 상태를 바로 갱신합니다.
+            active = (Reservation.STATUS_CONFIRMED, Reservation.STATUS_IN_PROGRESS)
+            rooms_changed = any(
+                memorial_room_id and (old_status in active) != (new_status in active)
+                for old_status, rows in by_status.items()
+                for _, _, memorial_room_id in rows
+            )
+            for old_status, rows in by_status.items():
+                ids = [row[0] for row in rows]
+                # UPDATE ... WHERE id IN (...) AND status = old_status
+                Reservation.objects.filter(id__in=ids, status=old_status).update(
+                    status=new_status, updated_at=now
+                )
+                updated.extend(rows)
+                histories.extend(
+                    ReservationHistory(
+                        reservation_id=reservation_id,
+                        from_status=old_status,
+                        to_status=new_status,
+                        changed_by=user,
+                        notes=notes
+                    )
+                    for reservation_id in ids
+                )
+            ReservationHistory.objects.bulk_create(histories)
+            # update()는 Reservation.save를 거치지 않으므로 취소된 예약의 시간대를 직접 반납합니다.
+            if not holds_slot(new_status):
+                release_slots(scheduled_at for _, scheduled_at, _ in updated)
 
-        return success_count, failed_updates
+        if updated and new_status == Reservation.STATUS_COMPLETED:
+            process_completed_inventory([row[0] for row in updated])
+        if updated:
+            # update()는 post_save 시그널이 없으므로 상태 전환 작업 시각을 직접 확인합니다.
+            from .scheduler import notify_reservations_changed
 
-    def _add_failed_update(
-        self, 
-        failed_updates: list, 
-        reservation: Reservation, 
-        error: str
-    ) -> None:
-        """실패한 업데이트 정보 추가"""
-        failed_updates.append({
-            "id": reservation.id,
-            "error": error,
-            "current_status": reservation.status
-        })
+            changed = [
+                Reservation(status=new_status, scheduled_at=scheduled_at, memorial_room_id=memorial_room_id)
+                for _, scheduled_at, memorial_room_id in updated
+            ]
+            transaction.on_commit(lambda: notify_reservations_changed(changed, rooms_changed=rooms_changed))
 
-    def _update_reservation_status(
-        self, 
-        reservation: Reservation, 
-        new_status: str, 
-        notes: str,
-        user: Any
-    ) -> None:
-        """예약 상태 업데이트 및 이력 생성"""
-        old_status = reservation.status
-        reservation.status = new_status
-        reservation.save()
-
-        ReservationHistory.objects.create(
-            reservation=reservation,
-            from_status=old_status,
-            to_status=new_status,
-            changed_by=user,
-            notes=notes
-        )
+        return len(updated), failed_updates
 
     def _is_valid_status_transition(self, current_status: str, new_status: str) -> bool:
         """상태 변경이 유효한지 검사"""
@@ -363,14 +429,28 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        scheduled_at = parse_datetime(new_datetime) if isinstance(new_datetime, str) else None
+        if scheduled_at is None:
+            return Response(
+                {"error": "날짜/시간 형식이 올바르지 않습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(scheduled_at):
+            scheduled_at = timezone.make_aware(scheduled_at)
+
         try:
             with transaction.atomic():
                 if new_room_id:
-                    memorial_room = MemorialRoom.objects.get(id=new_room_id)
+                    memorial_room = lock_room(new_room_id)
                     reservation.memorial_room = memorial_room
+                elif reservation.memorial_room_id:
+                    lock_room(reservation.memorial_room_id)
 
-                reservation.scheduled_at = new_datetime
-                reservation.save()
+                if reservation.status in ACTIVE_STATUSES:
+                    check_room_available(reservation.memorial_room_id, scheduled_at, exclude_id=reservation.id)
+
+                reservation.scheduled_at = scheduled_at
+                reservation.save(check_capacity=True)
 
                 ReservationHistory.objects.create(
                     reservation=reservation,
@@ -387,6 +467,13 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 {"error": "존재하지 않는 추모실입니다."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        except RoomUnavailable as e:
+            return Response(
+                {"error": str(e), "conflicts": serialize_conflicts(e.conflicts)},
+                status=status.HTTP_409_CONFLICT
+            )
+        except SlotFull as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
         except Exception as e:
             logger.error(f"Failed to reschedule reservation: {str(e)}")
             return Response(
@@ -420,7 +507,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='available-times', url_name='available_times')
     def available_times(self, request):
-        """예약 가능한 시간 목록을 반환합니다."""
+        """예약 가능한 시간 목록을 반환합니다. (memorial_room_id를 주면 해당 추모실의 운영 일정과 예약을 반영)"""
         try:
             # 날짜 파라미터 검증
             date_str = request.query_params.get('date')
@@ -449,46 +536,41 @@ class ReservationViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # 기본 운영 시간 설정
-            start_time = datetime.strptime('09:00', '%H:%M').time()
-            end_time = datetime.strptime('22:30', '%H:%M').time()
-
-            # 해당 날짜의 예약 목록 조회 (KST 기준)
-            target_start = timezone.make_aware(datetime.combine(target_date, time.min), KST)
-            target_end = timezone.make_aware(datetime.combine(target_date, time.max), KST)
-            
-            reservations = Reservation.objects.filter(
-                scheduled_at__range=(target_start, target_end),
-                status__in=['pending', 'confirmed', 'in_progress']
-            ).order_by('scheduled_at')
+            # 운영 시간: 추모실을 지정하면 추모실 운영 일정, 아니면 기본 운영 시간 (memorial_rooms.schedules)
+            memorial_room_id = request.query_params.get('memorial_room_id')
+            room_availability = None
+            if memorial_room_id:
+                is_valid, error_response, room = handle_memorial_room_validation(memorial_room_id)
+                if not is_valid:
+                    return error_response
+                schedule = room.get_schedule()
+            else:
+                schedule = get_default_schedule()
+            slot_starts = schedule.slots(target_date, KST)
+            if memorial_room_id and slot_starts:
+                room_availability = RoomAvailability.load(
+                    slot_starts[0], slot_starts[-1] + Reservation.DEFAULT_DURATION, room_ids=[room.id]
+                )
 
-            # 시간대별 예약 수 계산 (30분 단위)
-            booking_counts = {}
-            for reservation in reservations:
-                # KST로 변환하여 시간 추출
-                kst_time = timezone.localtime(reservation.scheduled_at, KST)
-                time_str = kst_time.strftime('%H:%M')
-                booking_counts[time_str] = booking_counts.get(time_str, 0) + 1
+            # 해당 날짜의 시간대별 예약 수 조회 (예약 시간대 장부, KST 기준)
+            slots = {
+                slot_time.hour * 60 + slot_time.minute: (booked, capacity)
+                for slot_time, booked, capacity in ReservationSlot.objects.filter(date=target_date)
+                .values_list('time', 'booked', 'capacity')
+            }
+            default_capacity = get_slot_capacity()
 
-            # 시간 슬롯 생성 (30분 단위)
             available_times = []
-            current_datetime = timezone.make_aware(datetime.combine(target_date, start_time), KST)
-            end_datetime = timezone.make_aware(datetime.combine(target_date, end_time), KST)
+            for offset, time_str, slot_start in zip(schedule.slot_offsets, schedule.labels, slot_starts):
+                current_bookings, capacity = slots.get(
+                    offset - offset % SLOT_MINUTES, (0, default_capacity)
+                )
 
-            while current_datetime <= end_datetime:
-                time_str = current_datetime.strftime('%H:%M')
-                current_bookings = booking_counts.get(time_str, 0)
-                
-                # 예약 가능 여부 확인
-                is_available = True
-                
-                # 현재 시간과 같거나 이전의 시간은 예약 불가
-                if target_date == now.date():
-                    current_time = now.strftime('%H:%M')
-                    if time_str <= current_time:
-                        is_available = False
-                # 3개 이상 예약된 시간은 예약 불가
-                elif current_bookings >= 3:
+                # 현재 시간과 같거나 이전의 시간, 정원이 찬 시간, 추모실이 사용 중인 시간은 예약 불가
+                is_available = current_bookings < capacity
+                if target_date == now.date() and time_str <= now.strftime('%H:%M'):
+                    is_available = False
+                elif room_availability is not None and not room_availability.is_available(room.id, slot_start):
                     is_available = False
 
                 available_times.append({
@@ -497,14 +579,14 @@ class ReservationViewSet(viewsets.ModelViewSet):
                     "is_available": is_available
                 })
 
-                current_datetime += timedelta(minutes=30)
-
             response_data = {
                 "date": date_str,
                 "operating_hours": {
-                    "start": "09:00",
-                    "end": "22:30"
+                    "start": f"{schedule.opens:%H:%M}",
+                    "end": f"{schedule.closes:%H:%M}"
                 },
+                "slot_minutes": schedule.slot_minutes,
+                "is_closed": not schedule.is_open(target_date),
                 "available_times": available_times
             }
 
@@ -517,11 +599,55 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'], url_path='calendar', url_name='calendar')
+    def calendar(self, request):
+        """
+        기간(start~end, 포함) 동안의 날짜별 시간대 예약 수와 추모실 × 날짜 × 시간대 예약 가능 여부를 반환합니다.
+        주/월 단위 화면을 날짜마다 available-times, memorial-rooms/available를 호출하지 않고 한 번에 그립니다.
+        memorial_room_id를 주면 해당 추모실만 포함합니다.
+        """
+        start_str = request.query_params.get('start')
+        if not start_str:
+            return Response(
+                {"error": "시작 날짜는 필수 파라미터입니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+            end_str = request.query_params.get('end')
+            end_date = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else start_date + timedelta(days=6)
+        except ValueError:
+            return Response(
+                {"error": "올바른 날짜 형식이 아닙니다. (YYYY-MM-DD)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 0 <= (end_date - start_date).days < self.CALENDAR_MAX_DAYS:
+            return Response(
+                {"error": f"조회 기간은 시작 날짜부터 최대 {self.CALENDAR_MAX_DAYS}일입니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        memorial_room_id = request.query_params.get('memorial_room_id')
+        if memorial_room_id:
+            is_valid, error_response, room = handle_memorial_room_validation(memorial_room_id)
+            if not is_valid:
+                return error_response
+            rooms = [room]
+        else:
+            rooms = MemorialRoom.objects.filter(is_active=True).order_by('id')
+
+        return Response({"data": build_calendar(start_date, end_date, rooms)})
+
     @action(detail=False, methods=['post'], url_path='check-availability', url_name='check_availability')
     def check_availability(self, request):
-        """예약 시간 형식을 검증합니다."""
+        """예약 시간 형식을 검증하고 추모실별 예약 가능 여부를 반환합니다.
+
+        memorial_room_id를 주면 해당 추모실만, 없으면 전체 추모실을 확인합니다.
+        겹치는 예약(conflicts)과 그 이후 가장 이른 예약 가능 시각(next_available_at)을 함께 반환합니다.
+        """
         scheduled_at = request.data.get('scheduled_at')
         duration_hours = request.data.get('duration_hours', 2)
+        memorial_room_id = request.data.get('memorial_room_id')
 
         if not scheduled_at:
             return Response(
@@ -531,21 +657,47 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
         try:
             scheduled_dt = timezone.datetime.fromisoformat(scheduled_at.replace('Z', '+00:00'))
-            end_dt = scheduled_dt + timedelta(hours=duration_hours)
-
-            return Response({
-                "is_valid": True,
-                "scheduled_at": scheduled_dt,
-                "end_at": end_dt
-            })
-
-        except ValueError as e:
+            if timezone.is_naive(scheduled_dt):
+                scheduled_dt = timezone.make_aware(scheduled_dt)
+            duration = timedelta(hours=float(duration_hours))
+            end_dt = scheduled_dt + duration
+        except (TypeError, ValueError) as e:
             logger.error(f"Invalid datetime format: {scheduled_at}, error: {str(e)}")
             return Response(
                 {"error": "날짜/시간 형식이 올바르지 않습니다."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if memorial_room_id:
+            is_valid, error_response, room = handle_memorial_room_validation(memorial_room_id)
+            if not is_valid:
+                return error_response
+            room_ids = [room.id]
+        else:
+            room_ids = list(MemorialRoom.objects.order_by('id').values_list('id', flat=True))
+
+        # 다음 예약 가능 시각을 찾을 수 있도록 이후 기간까지 한 번에 불러옵니다.
+        availability = RoomAvailability.load(
+            scheduled_dt, end_dt + self.AVAILABILITY_LOOKAHEAD, room_ids=room_ids
+        )
+        rooms = []
+        for room_id in room_ids:
+            conflicts = availability.conflicts(room_id, scheduled_dt, end_dt)
+            rooms.append({
+                "memorial_room_id": room_id,
+                "is_available": not conflicts,
+                "conflicts": serialize_conflicts(conflicts),
+                "next_available_at": availability.next_free_slot(room_id, scheduled_dt, duration),
+            })
+
+        return Response({
+            "is_valid": True,
+            "scheduled_at": scheduled_dt,
+            "end_at": end_dt,
+            "is_available": any(room["is_available"] for room in rooms),
+            "rooms": rooms,
+        })
+
     @action(detail=True, methods=['patch'], url_path='update-payment-info')
     def update_payment_info(self, request, pk=None):
         """예약의 결제 관련 정보(할증료, 할인)를 업데이트합니다."""
@@ -596,3 +748,99 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 {"error": "결제 정보 업데이트 중 오류가 발생했습니다."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class SchedulerMetricsViewSet(viewsets.ViewSet):
+    """
+    스케줄러 작업 지표 조회 ViewSet
+
+    작업별 지연/소요 시간/처리 건수/오류는 리더 프로세스가 임대 행에 기록한 스냅샷(이 프로세스가
+    리더이면 메모리의 최신 값)을 반환합니다. behind_seconds는 예정 시각이 지났는데 아직 처리되지
+    않은 상태 전환이 얼마나 밀렸는지를 DB에서 직접 계산하므로 알림 기준으로 사용할 수 있습니다.
+    """
+
+    def list(self, request):
+        from . import scheduler
+
+        now = timezone.now()
+        lease = get_lease(scheduler.LEASE_NAME)
+        leader = lease.holder if lease and lease.expires_at and lease.expires_at >= now else None
+        if scheduler.is_leader():
+            jobs = metrics_registry.snapshot()
+        else:
+            jobs = lease.metrics if lease else {}
+
+        next_due_at = scheduler.get_next_due_at(now)
+        behind = (now - next_due_at).total_seconds() if next_due_at and next_due_at < now else 0
+        return Response({
+            'leader': leader,
+            'lease_expires_at': lease.expires_at if lease else None,
+            'next_due_at': next_due_at,
+            'behind_seconds': round(behind, 3),
+            'jobs': jobs,
+        })
+
+
+class SlotHoldViewSet(viewsets.ViewSet):
+    """
+    예약 입력 중 추모실/시간 선점 ViewSet
+
+    POST로 memorial_room_id, scheduled_at(, minutes)을 선점하고 받은 token을 예약 생성 요청의
+    hold_token으로 보내면 선점이 소비됩니다. 선점 중 시간을 바꾸려면 token을 함께 보냅니다.
+    겹치는 예약이나 다른 직원의 선점이 있으면 409를 반환합니다. (reservations.holds 참고)
+    """
+    lookup_field = 'token'
+
+    def create(self, request):
+        memorial_room_id = request.data.get('memorial_room_id')
+        scheduled_at = request.data.get('scheduled_at')
+        if not memorial_room_id or not scheduled_at:
+            return Response(
+                {"error": "추모실과 예약 일시를 지정해주세요."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        is_valid, error_response, room = handle_memorial_room_validation(memorial_room_id)
+        if not is_valid:
+            return error_response
+
+        scheduled_dt = parse_datetime(scheduled_at) if isinstance(scheduled_at, str) else None
+        if scheduled_dt is None:
+            return Response(
+                {"error": "날짜/시간 형식이 올바르지 않습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(scheduled_dt):
+            scheduled_dt = timezone.make_aware(scheduled_dt)
+        try:
+            token = uuid.UUID(str(request.data['token'])) if request.data.get('token') else None
+            minutes = int(request.data['minutes']) if request.data.get('minutes') else None
+        except ValueError:
+            return Response(
+                {"error": "선점 토큰 또는 선점 시간이 올바르지 않습니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            hold = hold_slot(room.id, scheduled_dt, request.user, minutes=minutes, token=token)
+        except RoomUnavailable as e:
+            return Response(
+                {"error": str(e), "conflicts": serialize_conflicts(e.conflicts)},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response({
+            "token": hold.token,
+            "memorial_room_id": hold.memorial_room_id,
+            "scheduled_at": hold.scheduled_at,
+            "expires_at": hold.expires_at,
+        }, status=status.HTTP_201_CREATED)
+
+    def destroy(self, request, token=None):
+        """자신의 선점을 취소합니다."""
+        try:
+            released = release_hold(uuid.UUID(str(token)), request.user)
+        except ValueError:
+            released = False
+        if not released:
+            return Response({"error": "선점을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,86 @@
+"""
+모델 필드 변경 추적
+
+DB에서 불러온 인스턴스(from_db)의 필드 값을 스냅샷으로 보관해 두고 현재 값과 비교합니다.
+변경 여부를 확인하려고 저장 전에 같은 행을 다시 조회할 필요가 없고,
+save()에서 변경된 필드만 UPDATE 하도록 update_fields를 자동으로 채웁니다.
+
+    class Reservation(FieldTrackerMixin, models.Model):
+        ...
+
+    reservation.has_changed('status')
+    reservation.get_loaded_value('status')  # DB에서 불러온 값
+    reservation.get_dirty_fields()           # ['status', 'updated_at'] 처럼 저장될 필드
+
+주의: pre_save에서 값을 채우는 필드는 auto_now 필드만 자동으로 포함합니다.
+다른 pre_save 필드(암호화 필드 등)를 가진 모델에는 사용하지 마세요.
+"""
+
+
+class FieldTrackerMixin:
+    """from_db 시점의 필드 값을 기억해 변경된 필드를 계산하는 모델 믹스인"""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _snapshot(self, fields=None) -> None:
+        """현재 값을 기준 값으로 기록합니다. (fields를 주면 해당 필드만 갱신)"""
+        loaded = self.__dict__
+        values = {
+            field.attname: loaded[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in loaded and (fields is None or field.name in fields or field.attname in fields)
+        }
+        if fields is None or not hasattr(self, '_loaded_values'):
+            self._loaded_values = values
+        else:
+            self._loaded_values.update(values)
+
+    def get_loaded_value(self, field_name: str, default=None):
+        """DB에서 불러온(마지막으로 저장한) 값"""
+        field = self._meta.get_field(field_name)
+        return getattr(self, '_loaded_values', {}).get(field.attname, default)
+
+    def has_changed(self, field_name: str) -> bool:
+        return field_name in self.get_changed_fields()
+
+    def get_changed_fields(self) -> list:
+        """불러온 뒤 값이 바뀐 필드 이름 목록 (불러오지 않은 지연 필드는 제외)"""
+        loaded_values = getattr(self, '_loaded_values', None)
+        if loaded_values is None:
+            return [field.name for field in self._meta.concrete_fields]
+        changed = []
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            if field.attname not in loaded_values or loaded_values[field.attname] != self.__dict__[field.attname]:
+                changed.append(field.name)
+        return changed
+
+    def get_dirty_fields(self) -> list:
+        """save()가 UPDATE 할 필드 목록 (변경된 필드 + auto_now 필드)"""
+        fields = set(self.get_changed_fields())
+        fields.update(
+            field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)
+        )
+        fields.discard(self._meta.pk.name)
+        return [field.name for field in self._meta.concrete_fields if field.name in fields]
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and hasattr(self, '_loaded_values')
+            and not args
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = self.get_dirty_fields()
+        super().save(*args, **kwargs)
+        self._snapshot(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(fields)
@@ -1,6 +1,8 @@
+import html
 import logging
 import requests
 from django.conf import settings
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -93,3 +95,19 @@ def format_purchase_order_message(instance, action):
         logger.error(f"Instance data: order_number={instance.order_number}, action={action}")
         logger.exception("Full traceback:")
         raise
+
+
+def format_reservation_reminder_message(reservations):
+    """장례 시작 전 사전 알림 메시지를 포맷팅합니다. (여러 예약을 한 메시지로)"""
+    message = f"⏰ 장례 시작 예정 알림 ({len(reservations)}건)\n"
+    for reservation in reservations:
+        scheduled_at = timezone.localtime(reservation.scheduled_at).strftime('%m/%d %H:%M')
+        room = reservation.memorial_room.name if reservation.memorial_room else '미배정'
+        staff = reservation.assigned_staff.name if reservation.assigned_staff else '미배정'
+        # parse_mode='HTML'로 보내므로 이름에 들어간 <, &는 이스케이프합니다.
+        message += "\n"
+        message += f"📅 {scheduled_at} (예약 #{reservation.id})\n"
+        message += f"- 반려동물: {html.escape(str(reservation.pet.name))}\n"
+        message += f"- 추모실: {html.escape(str(room))}\n"
+        message += f"- 담당 직원: {html.escape(str(staff))}\n"
+    return message